@@ -1,7 +1,9 @@
 import os
 import sys
+import json
+import math
+import time
 import traceback
-import pandas as pd
 from flask import Flask, jsonify, request, send_from_directory
 from flask_cors import CORS
 import numpy as np
@@ -10,7 +12,7 @@ import numpy as np
 BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
 sys.path.append(BASE_DIR)
 
-from src.app.scripts.predict_service import PredictService
+from src.app.scripts.model_registry import ModelRegistry
 
 # --------------------------------------------------
 # IMAGE SERVING ENDPOINT
@@ -29,9 +31,45 @@ CORS(
     allow_headers=["Content-Type", "Authorization"],
 )
 
-# Service instance (tek sefer yüklenir)
-price_service = PredictService(task="price")
-point_service = PredictService(task="point")
+# Katalog tek sefer yüklenir, task servisleri aynı kataloğu paylaşır
+registry = ModelRegistry()
+price_service = registry.get_service("price")
+point_service = registry.get_service("point")
+
+# /predict/batch tek istekte kabul edilen maksimum kayıt sayısı
+MAX_BATCH_SIZE = 5000
+
+# /similar için maksimum komşu sayısı
+MAX_SIMILAR_K = 100
+
+# Yeni model versiyonu kontrol aralığı (saniye); 0 ise hot-reload kapalı
+MODEL_WATCH_INTERVAL = float(os.environ.get("MODEL_WATCH_INTERVAL", 10))
+
+def raw_json_response(fields: dict, raw_lists: dict[str, list[str]]):
+    """
+    fields normal şekilde serialize edilir; raw_lists önceden serialize
+    edilmiş JSON kayıtlarıdır ve olduğu gibi birleştirilir.
+    """
+    parts = {key: app.json.dumps(value) for key, value in fields.items()}
+    parts.update({
+        key: "[" + ",".join(payloads) + "]"
+        for key, payloads in raw_lists.items()
+    })
+
+    body = "{" + ",".join(
+        f"{json.dumps(key)}:{parts[key]}" for key in sorted(parts)
+    ) + "}"
+
+    return app.response_class(body, mimetype="application/json")
+
+def is_finite_number(value) -> bool:
+    # JSON tam sayıları sınırsızdır; float'a sığmayanlar da reddedilir
+    if not isinstance(value, (int, float)) or isinstance(value, bool):
+        return False
+    try:
+        return math.isfinite(float(value))
+    except OverflowError:
+        return False
 
 @app.route("/")
 def home():
@@ -52,28 +90,83 @@ def predict():
         if not data:
             return jsonify({"error": "No JSON body provided"}), 400
 
-        input_df = pd.DataFrame([data])
+        predicted_price = price_service.predict_record(data)
+        predicted_point = point_service.predict_record(data)
 
-        predicted_price = price_service.predict(input_df)
-        predicted_point = point_service.predict(input_df)
-
-        closest_by_price = price_service.get_closest_products(
+        closest_by_price = price_service.get_closest_payloads(
             "urun_fiyat",
             predicted_price,
             top_n=10
         )
 
-        closest_by_point = point_service.get_closest_products(
+        closest_by_point = point_service.get_closest_payloads(
             "urun_puan",
             predicted_point,
             top_n=10
         )
 
+        return raw_json_response(
+            {
+                "predicted_price": round(predicted_price, 2),
+                "predicted_point": round(predicted_point, 2)
+            },
+            {
+                "closest_by_price": closest_by_price,
+                "closest_by_point": closest_by_point
+            }
+        )
+
+    except Exception as e:
         return jsonify({
-            "predicted_price": round(predicted_price, 2),
-            "predicted_point": round(predicted_point, 2),
-            "closest_by_price": closest_by_price,
-            "closest_by_point": closest_by_point
+            "error": str(e),
+            "trace": traceback.format_exc()
+        }), 500
+
+
+# --------------------------------------------------
+# BATCH PREDICT ENDPOINT
+# --------------------------------------------------
+# Body: {"records": [{...}, {...}]} veya doğrudan [{...}, {...}]
+# En fazla MAX_BATCH_SIZE kayıt kabul edilir; sonuçlar giriş sırasıyla döner.
+# latency_ms: tüm batch için preprocess + iki model çağrısının süresi.
+@app.route("/predict/batch", methods=["POST"])
+def predict_batch():
+    try:
+        data = request.get_json()
+
+        records = data.get("records") if isinstance(data, dict) else data
+
+        if not records or not isinstance(records, list):
+            return jsonify({"error": "No records provided"}), 400
+
+        if len(records) > MAX_BATCH_SIZE:
+            return jsonify({
+                "error": f"Batch size exceeds limit ({MAX_BATCH_SIZE})"
+            }), 413
+
+        if not all(isinstance(record, dict) for record in records):
+            return jsonify({"error": "Each record must be a JSON object"}), 400
+
+        start = time.perf_counter()
+
+        predicted_prices = price_service.predict_many(records)
+        predicted_points = point_service.predict_many(records)
+
+        latency_ms = (time.perf_counter() - start) * 1000
+
+        results = [
+            {
+                "predicted_price": round(price, 2),
+                "predicted_point": round(point, 2)
+            }
+            for price, point in zip(predicted_prices, predicted_points)
+        ]
+
+        return jsonify({
+            "count": len(results),
+            "max_batch_size": MAX_BATCH_SIZE,
+            "latency_ms": round(latency_ms, 2),
+            "results": results
         })
 
     except Exception as e:
@@ -83,18 +176,85 @@ def predict():
         }), 500
 
 
+# --------------------------------------------------
+# SIMILAR PRODUCTS ENDPOINT
+# --------------------------------------------------
+# Body: {"input": {...}, "k": 10, "weights": {"kamera_kamera_çözünürlüğü": 3}}
+@app.route("/similar", methods=["POST"])
+def similar():
+    try:
+        data = request.get_json()
+
+        if not data or not isinstance(data.get("input"), dict):
+            return jsonify({"error": "No input provided"}), 400
+
+        k = data.get("k", 10)
+        if not isinstance(k, int) or not 1 <= k <= MAX_SIMILAR_K:
+            return jsonify({
+                "error": f"k must be an integer between 1 and {MAX_SIMILAR_K}"
+            }), 400
+
+        weights = data.get("weights")
+        if weights is not None and not (
+            isinstance(weights, dict)
+            and all(is_finite_number(w) for w in weights.values())
+        ):
+            return jsonify({
+                "error": "weights must be an object of finite numbers"
+            }), 400
+
+        try:
+            products = price_service.find_similar(
+                data["input"],
+                k=k,
+                weights=weights
+            )
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+        return jsonify({"similar_products": products})
+
+    except Exception as e:
+        return jsonify({
+            "error": str(e),
+            "trace": traceback.format_exc()
+        }), 500
+
+
 # --------------------------------------------------
 # FEATURE LIST ENDPOINT
 # --------------------------------------------------
 @app.route("/get_features", methods=["GET"])
 def get_features():
     try:
-        categories = price_service.get_features()
-        print(f"Available categories: {categories}")
-        return jsonify({"categories": categories})
+        body, etag = price_service.get_features_payload()
+
+        response = app.response_class(body, mimetype="application/json")
+        response.set_etag(etag)
+        # Her istekte ETag ile doğrulanır; değişmemişse 304 döner
+        response.headers["Cache-Control"] = "public, no-cache"
+
+        return response.make_conditional(request)
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+# --------------------------------------------------
+# MODEL VERSIONS ENDPOINT
+# --------------------------------------------------
+# Aktif model versiyonları; trainer yeni bundle yayınladığında watcher
+# tarafından istekler kesilmeden değiştirilir.
+@app.route("/models", methods=["GET"])
+def models():
+    try:
+        return jsonify({"versions": registry.versions()})
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 
 if __name__ == "__main__":
+    # Geliştirme sunucusu (tek süreç). Production için:
+    #   gunicorn -c src/api/gunicorn.conf.py --chdir src/api api:app
+    if MODEL_WATCH_INTERVAL > 0:
+        registry.watch(MODEL_WATCH_INTERVAL)
     app.run(host="0.0.0.0", debug=True)
@@ -0,0 +1,54 @@
+# --------------------------------------------------
+# PRODUCTION SERVER (gunicorn, pre-fork)
+# --------------------------------------------------
+# Çalıştırma (repo kökünden):
+#   gunicorn -c src/api/gunicorn.conf.py --chdir src/api api:app
+#
+# Ortam değişkenleri:
+#   API_BIND      dinlenecek adres            (varsayılan 0.0.0.0:5000)
+#   XGB_NTHREAD   worker başına XGBoost thread (varsayılan 1)
+#   API_WORKERS   worker sayısı               (varsayılan çekirdek / XGB_NTHREAD)
+#   MODEL_WATCH_INTERVAL  yeni model versiyonu kontrolü, saniye (varsayılan 10, 0 = kapalı)
+#
+# Modeller ve katalog master süreçte bir kez yüklenir (preload_app), sonra
+# worker'lar fork edilir; büyük read-only diziler copy-on-write paylaşılır.
+
+import gc
+import os
+
+xgb_nthread = int(os.environ.get("XGB_NTHREAD", 1))
+
+bind = os.environ.get("API_BIND", "0.0.0.0:5000")
+workers = int(
+    os.environ.get("API_WORKERS", max(1, (os.cpu_count() or 1) // xgb_nthread))
+)
+worker_class = "sync"
+preload_app = True
+timeout = 60
+
+
+def when_ready(server):
+    # preload_app ile api modülü master'da import edildi
+    from api import registry
+
+    registry.warmup()
+    registry.set_nthread(xgb_nthread)
+
+    # Yüklü nesneleri GC takibinden çıkar: worker'larda GC taraması
+    # refcount/gc header yazıp sayfaları kopyalamasın
+    gc.freeze()
+
+    server.log.info(
+        f"Models preloaded: tasks={registry.tasks}, "
+        f"workers={workers}, xgb_nthread={xgb_nthread}"
+    )
+
+
+def post_fork(server, worker):
+    from api import MODEL_WATCH_INTERVAL, registry
+
+    registry.set_nthread(xgb_nthread)
+
+    # Watcher thread fork'a taşınmaz; her worker kendi kopyasını hot-swap eder
+    if MODEL_WATCH_INTERVAL > 0:
+        registry.watch(MODEL_WATCH_INTERVAL)
@@ -0,0 +1,80 @@
+import argparse
+import time
+import numpy as np
+import requests
+from concurrent.futures import ThreadPoolExecutor
+
+# Örnek istek (test_api.py ile aynı format)
+sample_data = {
+    "ekran_ekran_boyutu": 6.9,
+    "ekran_ekran_teknolojisi": "OLED",
+    "ekran_ekran_çözünürlüğü_standardı": "FHD+",
+    "ekran_ekran_yenileme_hızı": 120.0,
+    "batarya_batarya_kapasitesi_tipik": 4832.0,
+    "batarya_hızlı_şarj": "Var",
+    "batarya_hızlı_şarj_gücü_maks.": 40.0,
+    "batarya_kablosuz_şarj": "Var",
+    "kamera_kamera_çözünürlüğü": 48.0,
+    "kamera_optik_görüntü_sabitleyici_ois": "Var",
+    "kamera_video_kayıt_çözünürlüğü": "2160p (Ultra HD) 4K",
+    "kamera_video_fps_değeri": 60.0,
+    "kamera_ön_kamera_çözünürlüğü": 18.0,
+    "temel_donanim_cpu_çekirdeği": 6.0,
+    "temel_donanim_cpu_üretim_teknolojisi": 3.0,
+    "temel_donanim_antutu_puanı_v10": 2697900.0,
+    "temel_donanim_bellek_ram": 12.0,
+    "temel_donanim_dahili_depolama": 256.0,
+    "tasarim_kalınlık": 8.75,
+    "tasarim_ağırlık": 231.0,
+    "tasarim_gövde_malzemesi_kapak": "Cam",
+    "ağ_bağlantilari_5g": "Var",
+    "kablosuz_bağlantilar_bluetooth_versiyonu": 6.0,
+    "kablosuz_bağlantilar_nfc": "Var",
+    "i̇şleti̇m_si̇stemi̇_i̇şletim_sistemi": "iOS",
+    "özelli̇kler_suya_dayanıklılık": "Var"
+}
+
+
+def run_load_test(url: str, concurrency: int, total_requests: int) -> dict:
+    session_pool = [requests.Session() for _ in range(concurrency)]
+
+    def send(i: int) -> tuple[float, int]:
+        session = session_pool[i % concurrency]
+        start = time.perf_counter()
+        response = session.post(url, json=sample_data, timeout=30)
+        return time.perf_counter() - start, response.status_code
+
+    # Isınma
+    for i in range(concurrency):
+        send(i)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(send, range(total_requests)))
+    elapsed = time.perf_counter() - start
+
+    latencies = np.array([latency for latency, _ in results]) * 1000
+    errors = sum(1 for _, status in results if status != 200)
+
+    return {
+        "rps": total_requests / elapsed,
+        "p50_ms": np.percentile(latencies, 50),
+        "p99_ms": np.percentile(latencies, 99),
+        "errors": errors,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="/predict load test")
+    parser.add_argument("--url", default="http://127.0.0.1:5000/predict")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=500)
+    args = parser.parse_args()
+
+    stats = run_load_test(args.url, args.concurrency, args.requests)
+
+    print(f"URL: {args.url}")
+    print(f"Concurrency: {args.concurrency}, Requests: {args.requests}")
+    print(f"Requests/sec: {stats['rps']:.1f}")
+    print(f"p50: {stats['p50_ms']:.2f} ms, p99: {stats['p99_ms']:.2f} ms")
+    print(f"Errors: {stats['errors']}")
@@ -0,0 +1,220 @@
+import multiprocessing
+import os
+import shutil
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from scipy import sparse, stats
+
+from sklearn.metrics import mean_squared_error, mean_absolute_error, r2_score
+from sklearn.model_selection import RepeatedKFold, train_test_split
+
+import xgboost as xgb
+
+
+METRICS = ("rmse", "mae", "r2")
+
+# Worker başına bir kez açılan memmap'ler
+_DATA = {}
+
+
+def _init_worker(data_dir: str, is_sparse: bool):
+    data_dir = Path(data_dir)
+
+    def load(name):
+        return np.load(data_dir / f"{name}.npy", mmap_mode="r")
+
+    if is_sparse:
+        X = sparse.csr_matrix((load("data"), load("indices"), load("indptr")), shape=tuple(load("shape")))
+    else:
+        X = load("X")
+
+    _DATA.update(X=X, y=load("y"))
+
+
+def _run_fold(
+    repeat: int,
+    fold: int,
+    train_idx: np.ndarray,
+    val_idx: np.ndarray,
+    params: dict,
+    n_estimators: int,
+    early_stopping_rounds: int,
+    nthread: int,
+    random_state: int,
+) -> dict:
+    start = time.perf_counter()
+    X, y = _DATA["X"], _DATA["y"]
+
+    # Early stopping fold'un kendi train kısmından ayrılan setle; dışarıda
+    # bırakılan fold yalnızca OOF tahmini için kullanılır
+    fit_idx, stop_idx = train_test_split(train_idx, test_size=0.15, random_state=random_state)
+
+    model = xgb.XGBRegressor(
+        n_estimators=n_estimators,
+        random_state=random_state,
+        tree_method="hist",
+        early_stopping_rounds=early_stopping_rounds,
+        eval_metric="rmse",
+        n_jobs=nthread,
+        **params
+    )
+    model.fit(
+        X[fit_idx],
+        y[fit_idx],
+        eval_set=[(X[stop_idx], y[stop_idx])],
+        verbose=False
+    )
+
+    y_true = np.asarray(y[val_idx])
+    preds = model.predict(X[val_idx])
+
+    return {
+        "repeat": repeat,
+        "fold": fold,
+        "val_idx": val_idx,
+        "predictions": preds,
+        "best_iteration": int(model.best_iteration),
+        "rmse": float(np.sqrt(mean_squared_error(y_true, preds))),
+        "mae": float(mean_absolute_error(y_true, preds)),
+        "r2": float(r2_score(y_true, preds)),
+        "seconds": time.perf_counter() - start,
+    }
+
+
+class CrossValidator:
+    """
+    (Repeated) K-fold cross-validation, fold'lar process havuzunda paralel:
+    - X ve y geçici klasöre .npy olarak bir kez yazılır; worker'lar memmap ile
+      açar, görevlere yalnızca fold indeksleri gider (matris pickle edilmez)
+    - Fold metriklerinin ortalaması, std'si ve t dağılımıyla güven aralığı
+    - Out-of-fold tahminler: her satır her tekrarda bir kez tahmin edilir,
+      tekrarların ortalaması alınır
+    Her fold nthread = çekirdek / workers thread kullanır.
+    """
+
+    def __init__(
+        self,
+        n_splits: int = 5,
+        n_repeats: int = 1,
+        workers: int | None = None,
+        params: dict | None = None,
+        n_estimators: int = 2000,
+        early_stopping_rounds: int = 50,
+        confidence: float = 0.95,
+        random_state: int = 42,
+    ):
+        cores = os.cpu_count() or 1
+
+        self.n_splits = n_splits
+        self.n_repeats = n_repeats
+        self.workers = max(1, min(workers or cores, n_splits * n_repeats))
+        self.nthread = max(1, cores // self.workers)
+        self.params = params or {}
+        self.n_estimators = n_estimators
+        self.early_stopping_rounds = early_stopping_rounds
+        self.confidence = confidence
+        self.random_state = random_state
+
+        self.folds = []
+
+    @staticmethod
+    def _write_arrays(data_dir: Path, X, y) -> bool:
+        if sparse.issparse(X):
+            X = X.tocsr()
+            arrays = {
+                "data": X.data,
+                "indices": X.indices,
+                "indptr": X.indptr,
+                "shape": np.asarray(X.shape),
+            }
+        else:
+            arrays = {"X": np.ascontiguousarray(np.asarray(X, dtype=np.float32))}
+
+        arrays["y"] = np.asarray(y, dtype=np.float64)
+
+        for name, values in arrays.items():
+            np.save(data_dir / f"{name}.npy", values)
+
+        return sparse.issparse(X)
+
+    def _interval(self, values: np.ndarray) -> dict:
+        mean = float(values.mean())
+        std = float(values.std(ddof=1)) if len(values) > 1 else 0.0
+        half = (
+            float(stats.t.ppf((1 + self.confidence) / 2, len(values) - 1) * std / np.sqrt(len(values)))
+            if len(values) > 1 else 0.0
+        )
+        return {"mean": mean, "std": std, "ci_low": mean - half, "ci_high": mean + half}
+
+    def run(self, X, y) -> tuple[dict, pd.DataFrame]:
+        """
+        Özet metrikler ve OOF tahmin tablosu (row, y_true, y_pred) döner
+        """
+        start = time.perf_counter()
+        n_rows = X.shape[0]
+
+        splitter = RepeatedKFold(
+            n_splits=self.n_splits,
+            n_repeats=self.n_repeats,
+            random_state=self.random_state
+        )
+        tasks = [
+            (i // self.n_splits, i % self.n_splits, train_idx, val_idx)
+            for i, (train_idx, val_idx) in enumerate(splitter.split(np.arange(n_rows)))
+        ]
+
+        data_dir = Path(tempfile.mkdtemp())
+        try:
+            is_sparse = self._write_arrays(data_dir, X, y)
+
+            # spawn: XGBoost'un OpenMP thread'leri fork sonrası güvenli değil
+            with ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(str(data_dir), is_sparse)
+            ) as pool:
+                self.folds = list(pool.map(
+                    _run_fold,
+                    *zip(*[
+                        (
+                            repeat, fold, train_idx, val_idx, self.params,
+                            self.n_estimators, self.early_stopping_rounds,
+                            self.nthread, self.random_state
+                        )
+                        for repeat, fold, train_idx, val_idx in tasks
+                    ])
+                ))
+        finally:
+            shutil.rmtree(data_dir, ignore_errors=True)
+
+        predictions = np.zeros((self.n_repeats, n_rows))
+        for result in self.folds:
+            predictions[result["repeat"], result["val_idx"]] = result["predictions"]
+
+        oof = pd.DataFrame({
+            "row": np.arange(n_rows),
+            "y_true": np.asarray(y, dtype=np.float64),
+            "y_pred": predictions.mean(axis=0),
+        })
+
+        summary = {
+            "n_splits": self.n_splits,
+            "n_repeats": self.n_repeats,
+            "confidence": self.confidence,
+            "metrics": {
+                metric: self._interval(np.array([r[metric] for r in self.folds]))
+                for metric in METRICS
+            },
+            "best_iteration": self._interval(np.array([r["best_iteration"] for r in self.folds])),
+            "workers": self.workers,
+            "nthread": self.nthread,
+            "wall_seconds": round(time.perf_counter() - start, 3),
+            "fold_seconds": round(sum(r["seconds"] for r in self.folds), 3),
+        }
+
+        return summary, oof
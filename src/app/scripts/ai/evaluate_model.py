@@ -1,31 +1,43 @@
+import argparse
+import sys
 import pandas as pd
 import numpy as np
-import joblib
 from pathlib import Path
 from sklearn.metrics import mean_squared_error, mean_absolute_error, r2_score
 import matplotlib.pyplot as plt
 from datetime import datetime
 
+BASE_DIR = Path(__file__).resolve().parents[4]
+sys.path.append(str(BASE_DIR))
+
+from src.app.scripts.dataset.dataset_io import compact_dtypes, dense_to_csr, read_dataset
+from src.app.scripts.model_bundle import ModelBundle
+
 
 class ModelEvaluator:
     """
     Generic model evaluation class
     Supports both log-transformed and normal targets
+    Model, API ile aynı şekilde model_dir'deki CURRENT bundle'dan (checksum
+    doğrulanarak) yüklenir; bundle yoksa legacy native JSON kullanılır.
+    oof_path verilirse (trainer'ın oof_predictions.csv'si) model yüklenmez;
+    out-of-fold tahminler yeniden tahmin yapılmadan değerlendirilir.
     """
 
     def __init__(
         self,
         data_path: Path,
-        model_path: Path,
+        model_dir: Path,
         output_dir: Path,
         target_column: str,
         task_name: str,
         unit: str = "",
         segment_type: str = None,
-        ignore_columns: list | None = None
+        ignore_columns: list | None = None,
+        oof_path: Path | None = None
     ):
         self.data_path = data_path
-        self.model_path = model_path
+        self.model_dir = model_dir
         self.output_dir = output_dir
         self.target_column = target_column
         self.task_name = task_name
@@ -33,11 +45,12 @@ class ModelEvaluator:
         self.segment_type = segment_type
 
         self.ignore_columns = ignore_columns if ignore_columns else []
+        self.oof_path = oof_path
 
         self.output_dir.mkdir(parents=True, exist_ok=True)
 
         self.df = None
-        self.model = None
+        self.bundle = None
         self.results = None
 
     # =====================================
@@ -45,15 +58,24 @@ class ModelEvaluator:
     # =====================================
 
     def load(self):
-        self.df = pd.read_csv(self.data_path)
-        self.model = joblib.load(self.model_path)
-        print(f"{self.task_name} veri ve model yüklendi.")
+        if self.oof_path is not None:
+            self.df = pd.read_csv(self.oof_path)
+            print(f"{self.task_name} out-of-fold tahminleri yüklendi.")
+            return
+
+        # Trainer ile aynı feature dtype'ları
+        self.df = compact_dtypes(read_dataset(self.data_path), exclude=[self.target_column])
+        self.bundle = ModelBundle.load_latest(self.model_dir, self.target_column)
+        print(f"{self.task_name} veri ve model ({self.bundle.version}) yüklendi.")
 
     # =====================================
     # PREDICT
     # =====================================
 
-    def predict(self):
+    def _predict_raw(self) -> tuple[pd.Series, np.ndarray]:
+        if self.oof_path is not None:
+            return self.df[self.target_column], self.df["y_pred"].to_numpy()
+
         df_copy = self.df.copy()
 
         # 🔥 Ignore columns güvenli şekilde düşürülür
@@ -64,10 +86,24 @@ class ModelEvaluator:
 
         df_copy = df_copy.drop(columns=cols_to_drop)
 
-        X = df_copy.drop(columns=[self.target_column])
+        # Kolonlar modelin feature sırasına göre dizilir
+        X = df_copy[self.bundle.features]
         y_true_raw = df_copy[self.target_column]
 
-        y_pred_raw = self.model.predict(X)
+        # Sparse eğitilmiş modelde one-hot sıfırları eksik değer olarak verilir
+        if self.bundle.sparse_features is not None:
+            X = dense_to_csr(
+                X.to_numpy(dtype=np.float32),
+                X.columns.isin(set(self.bundle.sparse_features))
+            )
+
+        return y_true_raw, self.bundle.booster.inplace_predict(
+            X,
+            iteration_range=self.bundle.iteration_range
+        )
+
+    def predict(self):
+        y_true_raw, y_pred_raw = self._predict_raw()
 
         y_true = np.expm1(y_true_raw)
         y_pred = np.expm1(y_pred_raw)
@@ -272,28 +308,37 @@ class ModelEvaluator:
 if __name__ == "__main__":
     BASE_DIR = Path(__file__).resolve().parents[4]
 
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--oof", action="store_true")
+    args = parser.parse_args()
+
+    MODEL_DIR = BASE_DIR / "src/app/output/model"
+    evaluation_dir = "evaluation/oof" if args.oof else "evaluation"
+
     price_evaluator = ModelEvaluator(
         data_path=BASE_DIR / "src/app/output/dataset/final/final_dataset.csv",
-        model_path=BASE_DIR / "src/app/output/model/price/xgboost_urun_fiyat_model.pkl",
-        output_dir=BASE_DIR / "src/app/output/model/price/evaluation",
+        model_dir=MODEL_DIR / "price",
+        output_dir=MODEL_DIR / "price" / evaluation_dir,
         target_column="urun_fiyat",
         task_name="price",
         unit="TL",
         segment_type="price",
-        ignore_columns=["urun_puan", "urun_id", "urun_ad"]
+        ignore_columns=["urun_puan", "urun_id", "urun_ad"],
+        oof_path=MODEL_DIR / "price/oof_predictions.csv" if args.oof else None
     )
 
     price_evaluator.run()
 
     point_evaluator = ModelEvaluator(
         data_path=BASE_DIR / "src/app/output/dataset/final/final_dataset.csv",
-        model_path=BASE_DIR / "src/app/output/model/point/xgboost_urun_puan_model.pkl",
-        output_dir=BASE_DIR / "src/app/output/model/point/evaluation",
+        model_dir=MODEL_DIR / "point",
+        output_dir=MODEL_DIR / "point" / evaluation_dir,
         target_column="urun_puan",
         task_name="point",
         unit="Puan",
         segment_type="point",
-        ignore_columns=["urun_fiyat", "urun_id", "urun_ad"]
+        ignore_columns=["urun_fiyat", "urun_id", "urun_ad"],
+        oof_path=MODEL_DIR / "point/oof_predictions.csv" if args.oof else None
     )
 
     point_evaluator.run()
@@ -0,0 +1,280 @@
+import math
+import multiprocessing
+import os
+import time
+import numpy as np
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import xgboost as xgb
+
+
+# Örnekleme uzayı: (dağılım, alt, üst)
+SEARCH_SPACE = {
+    "learning_rate": ("log", 0.01, 0.3),
+    "max_depth": ("int", 3, 10),
+    "min_child_weight": ("log", 1.0, 20.0),
+    "subsample": ("uniform", 0.5, 1.0),
+    "colsample_bytree": ("uniform", 0.5, 1.0),
+    "reg_lambda": ("log", 0.1, 10.0),
+}
+
+SEARCH_STRATEGIES = ("random", "halving")
+
+
+def sample_params(rng: np.random.Generator, space: dict = SEARCH_SPACE) -> dict:
+    params = {}
+
+    for name, (kind, low, high) in space.items():
+        if kind == "int":
+            params[name] = int(rng.integers(low, high + 1))
+        elif kind == "log":
+            params[name] = float(np.exp(rng.uniform(np.log(low), np.log(high))))
+        else:
+            params[name] = float(rng.uniform(low, high))
+
+    return params
+
+
+class MedianPruningCallback(xgb.callback.TrainingCallback):
+    """
+    Median stopping: warmup'tan sonra her interval turda, trial'ın o ana kadarki
+    en iyi validation RMSE'si tamamlanmış trial'ların aynı turdaki medyanından
+    kötüyse eğitim durdurulur. Referans eğriler trial başlarken verilir.
+    """
+
+    def __init__(self, reference_curves: list[np.ndarray], warmup: int = 50, interval: int = 25):
+        self.reference_curves = reference_curves
+        self.warmup = warmup
+        self.interval = interval
+        self.pruned = False
+
+    @staticmethod
+    def best_so_far(curve: np.ndarray, epoch: int) -> float:
+        # Early stopping ile erken biten eğri son değerinde kalır
+        return float(np.min(curve[:epoch + 1]))
+
+    def after_iteration(self, model, epoch: int, evals_log: dict) -> bool:
+        if epoch < self.warmup or epoch % self.interval or len(self.reference_curves) < 3:
+            return False
+
+        curve = np.asarray(evals_log["validation_0"]["rmse"])
+        median = np.median([
+            self.best_so_far(reference, epoch)
+            for reference in self.reference_curves
+        ])
+
+        self.pruned = self.best_so_far(curve, epoch) > median
+        return self.pruned
+
+
+# Worker başına bir kez yüklenen eğitim / validation verisi
+_DATA = {}
+
+
+def _init_worker(X_train, y_train, X_val, y_val):
+    _DATA.update(X_train=X_train, y_train=y_train, X_val=X_val, y_val=y_val)
+
+
+def _run_trial(
+    trial: int,
+    params: dict,
+    n_estimators: int,
+    early_stopping_rounds: int,
+    nthread: int,
+    random_state: int,
+    reference_curves: list[np.ndarray] | None = None,
+) -> dict:
+    start = time.perf_counter()
+
+    callbacks = []
+    pruning = None
+    if reference_curves is not None:
+        pruning = MedianPruningCallback(reference_curves)
+        callbacks.append(pruning)
+
+    model = xgb.XGBRegressor(
+        n_estimators=n_estimators,
+        random_state=random_state,
+        tree_method="hist",
+        early_stopping_rounds=early_stopping_rounds,
+        eval_metric="rmse",
+        n_jobs=nthread,
+        callbacks=callbacks,
+        **params
+    )
+    model.fit(
+        _DATA["X_train"],
+        _DATA["y_train"],
+        eval_set=[(_DATA["X_val"], _DATA["y_val"])],
+        verbose=False
+    )
+
+    curve = np.asarray(model.evals_result()["validation_0"]["rmse"])
+
+    return {
+        "trial": trial,
+        "params": params,
+        "n_estimators": n_estimators,
+        "best_iteration": int(model.best_iteration),
+        "val_rmse": float(curve.min()),
+        "rounds": len(curve),
+        "pruned": bool(pruning and pruning.pruned),
+        "curve": curve,
+        "seconds": time.perf_counter() - start,
+    }
+
+
+class HyperparameterSearch:
+    """
+    XGBoost hiperparametre araması, trial'lar process havuzunda paralel:
+    - "random": n_trials rastgele config, tam bütçe + early stopping +
+      MedianPruningCallback (trial i'ye 0..i-workers trial'larının eğrilerine
+      göre; aynı random_state ve workers ile sonuç tekrarlanabilir)
+    - "halving": successive halving; tüm config'ler min_budget turla başlar,
+      her basamakta en iyi 1/eta kalır ve bütçe eta katına çıkar
+    Her trial nthread = çekirdek / workers thread kullanır (oversubscription yok).
+    """
+
+    def __init__(
+        self,
+        strategy: str = "random",
+        n_trials: int = 20,
+        workers: int | None = None,
+        n_estimators: int = 2000,
+        early_stopping_rounds: int = 50,
+        min_budget: int = 100,
+        eta: int = 3,
+        prune: bool = True,
+        space: dict = SEARCH_SPACE,
+        random_state: int = 42,
+    ):
+        if strategy not in SEARCH_STRATEGIES:
+            raise ValueError(f"Unknown search strategy: {strategy}")
+
+        cores = os.cpu_count() or 1
+
+        self.strategy = strategy
+        self.n_trials = n_trials
+        self.workers = max(1, min(workers or cores, n_trials))
+        self.nthread = max(1, cores // self.workers)
+        self.n_estimators = n_estimators
+        self.early_stopping_rounds = early_stopping_rounds
+        self.min_budget = min_budget
+        self.eta = eta
+        self.prune = prune
+        self.space = space
+        self.random_state = random_state
+
+        self.trials = []
+
+    def _pool(self, X_train, y_train, X_val, y_val) -> ProcessPoolExecutor:
+        # spawn: XGBoost'un OpenMP thread'leri fork sonrası güvenli değil
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(X_train, y_train, X_val, y_val)
+        )
+
+    def _configs(self) -> list[dict]:
+        rng = np.random.default_rng(self.random_state)
+        return [sample_params(rng, self.space) for _ in range(self.n_trials)]
+
+    def _random(self, pool: ProcessPoolExecutor) -> tuple[list[dict], list[dict]]:
+        configs = self._configs()
+        results = {}
+        running = {}
+        next_trial = 0
+
+        # Trial i, 0..i-workers trial'larının (prune edilmemiş) eğrilerini
+        # referans alır ve bunlar bitmeden başlamaz: referanslar tamamlanma
+        # sırasına bağlı değildir. En fazla workers trial aynı anda çalışır;
+        # workers=1 her trial'ın öncekilerin hepsini gördüğü sıralı aramadır.
+        while next_trial < len(configs) or running:
+            while next_trial < len(configs) and len(running) < self.workers:
+                references = range(next_trial - self.workers + 1)
+                if any(trial not in results for trial in references):
+                    break
+
+                future = pool.submit(
+                    _run_trial,
+                    next_trial,
+                    configs[next_trial],
+                    self.n_estimators,
+                    self.early_stopping_rounds,
+                    self.nthread,
+                    self.random_state,
+                    [
+                        results[trial]["curve"] for trial in references
+                        if not results[trial]["pruned"]
+                    ] if self.prune else None
+                )
+                running[future] = next_trial
+                next_trial += 1
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                results[running.pop(future)] = future.result()
+
+        completed = [results[trial] for trial in range(len(configs))]
+        finalists = [t for t in completed if not t["pruned"]]
+        return completed, finalists or completed
+
+    def _halving(self, pool: ProcessPoolExecutor) -> tuple[list[dict], list[dict]]:
+        survivors = list(enumerate(self._configs()))
+        budget = self.min_budget
+        completed = []
+
+        while True:
+            budget = min(budget, self.n_estimators)
+
+            results = list(pool.map(
+                _run_trial,
+                *zip(*[
+                    (trial, params, budget, self.early_stopping_rounds, self.nthread, self.random_state)
+                    for trial, params in survivors
+                ])
+            ))
+
+            results.sort(key=lambda r: r["val_rmse"])
+            keep = max(1, math.ceil(len(results) / self.eta))
+
+            for rank, result in enumerate(results):
+                result["pruned"] = budget < self.n_estimators and rank >= keep
+            completed.extend(results)
+
+            # Son basamaktaki trial'lar en büyük bütçeyle eğitilmiş finalistler
+            if budget >= self.n_estimators or len(results) == 1:
+                return completed, results
+
+            survivors = [(r["trial"], r["params"]) for r in results[:keep]]
+            budget *= self.eta
+
+    def run(self, X_train, y_train, X_val, y_val) -> dict:
+        """
+        En iyi trial'ı döner: params, val_rmse, best_iteration ve özet
+        """
+        start = time.perf_counter()
+
+        with self._pool(X_train, y_train, X_val, y_val) as pool:
+            if self.strategy == "random":
+                self.trials, finalists = self._random(pool)
+            else:
+                self.trials, finalists = self._halving(pool)
+
+        best = min(finalists, key=lambda t: t["val_rmse"])
+
+        return {
+            "params": best["params"],
+            "val_rmse": best["val_rmse"],
+            "best_iteration": best["best_iteration"],
+            "strategy": self.strategy,
+            "n_trials": self.n_trials,
+            "trainings": len(self.trials),
+            "rounds": sum(t["rounds"] for t in self.trials),
+            "pruned": sum(t["pruned"] for t in self.trials),
+            "workers": self.workers,
+            "nthread": self.nthread,
+            "wall_seconds": round(time.perf_counter() - start, 3),
+            "trial_seconds": round(sum(t["seconds"] for t in self.trials), 3),
+        }
@@ -0,0 +1,246 @@
+import os
+import sys
+import time
+import numpy as np
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from sklearn.model_selection import train_test_split
+
+import xgboost as xgb
+
+BASE_DIR = Path(__file__).resolve().parents[4]
+sys.path.append(str(BASE_DIR))
+
+from src.app.scripts.ai.xgboost_model_trainer import XGBoostModelTrainer
+from src.app.scripts.dataset.dataset_io import compact_dtypes, memory_mb, read_dataset
+
+
+class MultiTargetTrainer:
+    """
+    Aynı final dataset'ten birden fazla hedefi (fiyat, puan) ortak hazırlıkla eğitir:
+    - Veri bir kez okunur / kompaktlanır, feature matrisi ve split bir kez kurulur
+      (her hedef diğer hedefleri feature'dan düşürdüğü için X ortak)
+    - İlk hedefin train QuantileDMatrix'i sketch'i bir kez hesaplar; diğer
+      hedeflerin matrisleri ref= ile aynı bin sınırlarını kullanır (sketch yok)
+    - Booster'lar thread'lerde eşzamanlı eğitilir, her biri nthread = çekirdek / hedef
+    Her hedef için XGBoostModelTrainer ile aynı artifact'ler kendi klasörüne yazılır;
+    modeller sıralı eğitimle birebir aynıdır.
+    """
+
+    def __init__(
+        self,
+        data_path: Path,
+        targets: dict[str, Path],
+        exclude_from_model: list[str] | None = None,
+        random_state: int = 42,
+        params: dict[str, dict] | None = None,
+        nthread: int | None = None,
+    ):
+        self.data_path = data_path
+        self.targets = list(targets)
+        self.random_state = random_state
+        self.nthread = nthread or max(1, (os.cpu_count() or 1) // len(self.targets))
+
+        exclude = exclude_from_model or []
+        params = params or {}
+
+        self.trainers = {
+            target: XGBoostModelTrainer(
+                data_path=data_path,
+                output_dir=output_dir,
+                target=target,
+                exclude_from_model=[t for t in self.targets if t != target] + exclude,
+                random_state=random_state,
+                params=params.get(target),
+            )
+            for target, output_dir in targets.items()
+        }
+        self.lead = self.trainers[self.targets[0]]
+
+        self.timings = {}
+
+    # =====================================
+    # DATA LOADING
+    # =====================================
+
+    def load_data(self) -> None:
+        lead = self.lead
+
+        if lead.sparse:
+            lead.load_data()
+            columns = lead.dataset["labels"]
+        else:
+            df = read_dataset(self.data_path)
+            # Tüm hedefler tam hassasiyette kalır
+            lead.df = compact_dtypes(df, exclude=self.targets)
+            columns = lead.df.columns
+            print(f"Veri yüklendi. Bellek: {memory_mb(df):.2f} MB → {memory_mb(lead.df):.2f} MB")
+
+        for target in self.targets:
+            if target not in columns:
+                raise ValueError(f"{target} bulunamadı.")
+
+    # =====================================
+    # FEATURE PREPARATION
+    # =====================================
+
+    def prepare_features(self) -> None:
+        self.lead.prepare_features()
+
+        for target, trainer in self.trainers.items():
+            if trainer is self.lead:
+                continue
+
+            trainer.df = self.lead.df
+            trainer.dataset = self.lead.dataset
+            trainer.X = self.lead.X
+            trainer.feature_names = self.lead.feature_names
+
+            if trainer.sparse:
+                trainer.y = pd.Series(trainer.dataset["labels"][target], name=target)
+            else:
+                trainer.y = trainer.df[target]
+
+            trainer._save_feature_order()
+
+    # =====================================
+    # DATA SPLIT
+    # =====================================
+
+    @staticmethod
+    def _take(X, positions: np.ndarray):
+        return X.iloc[positions] if isinstance(X, pd.DataFrame) else X[positions]
+
+    def split_data(self) -> None:
+        # XGBoostModelTrainer.split_data ile aynı iki aşamalı bölme; karışım
+        # yalnızca satır sayısı ve random_state'e bağlı, konumlar tüm hedeflerde ortak
+        positions = np.arange(self.lead.X.shape[0])
+        train, temp = train_test_split(positions, test_size=0.30, random_state=self.random_state)
+        val, test = train_test_split(temp, test_size=0.50, random_state=self.random_state)
+
+        X_train, X_val, X_test = (self._take(self.lead.X, p) for p in (train, val, test))
+
+        for trainer in self.trainers.values():
+            trainer.X_train, trainer.X_val, trainer.X_test = X_train, X_val, X_test
+            trainer.y_train, trainer.y_val, trainer.y_test = (
+                trainer.y.iloc[p] for p in (train, val, test)
+            )
+
+        print(f"Train size: {X_train.shape[0]}")
+        print(f"Validation size: {X_val.shape[0]}")
+        print(f"Test size: {X_test.shape[0]}")
+
+    # =====================================
+    # QUANTIZATION
+    # =====================================
+
+    def build_matrices(self) -> dict[str, tuple[xgb.QuantileDMatrix, xgb.QuantileDMatrix]]:
+        lead = self.lead
+        cores = os.cpu_count() or 1
+
+        reference = xgb.QuantileDMatrix(lead.X_train, label=lead.y_train, nthread=cores)
+
+        matrices = {}
+        for target, trainer in self.trainers.items():
+            dtrain = reference if trainer is lead else xgb.QuantileDMatrix(
+                trainer.X_train, label=trainer.y_train, ref=reference, nthread=cores
+            )
+            # xgb.train validation'ın ref'inin kendi train matrisi olmasını ister;
+            # bin sınırları zincir boyunca referansınkilerdir
+            dval = xgb.QuantileDMatrix(
+                trainer.X_val, label=trainer.y_val, ref=dtrain, nthread=cores
+            )
+            matrices[target] = (dtrain, dval)
+
+        return matrices
+
+    # =====================================
+    # TRAINING
+    # =====================================
+
+    def _train_target(
+        self,
+        trainer: XGBoostModelTrainer,
+        dtrain: xgb.QuantileDMatrix,
+        dval: xgb.QuantileDMatrix,
+    ) -> float:
+        start = time.perf_counter()
+
+        # Parametreler ve bütçe tek yerden: XGBoostModelTrainer._build_model
+        model = trainer._build_model()
+        params = {k: v for k, v in model.get_xgb_params().items() if v is not None}
+        params["nthread"] = self.nthread
+
+        booster = xgb.train(
+            params,
+            dtrain,
+            num_boost_round=model.n_estimators,
+            evals=[(dval, "validation_0")],
+            early_stopping_rounds=model.early_stopping_rounds,
+            verbose_eval=False
+        )
+
+        # PredictService / evaluator XGBRegressor pickle'ı bekler
+        model.load_model(bytearray(booster.save_raw("ubj")))
+        trainer.model = model
+
+        return time.perf_counter() - start
+
+    def train(self, matrices: dict) -> None:
+        with ThreadPoolExecutor(max_workers=len(self.targets)) as pool:
+            futures = {
+                target: pool.submit(self._train_target, self.trainers[target], *matrices[target])
+                for target in self.targets
+            }
+            self.timings["per_target"] = {
+                target: round(future.result(), 3) for target, future in futures.items()
+            }
+
+        print("Modeller eğitildi.")
+
+    # =====================================
+    # FULL PIPELINE
+    # =====================================
+
+    def run(self) -> dict:
+        start = time.perf_counter()
+
+        self.load_data()
+        self.prepare_features()
+        self.split_data()
+        self.timings["prepare"] = round(time.perf_counter() - start, 3)
+
+        step = time.perf_counter()
+        matrices = self.build_matrices()
+        self.timings["quantize"] = round(time.perf_counter() - step, 3)
+
+        step = time.perf_counter()
+        self.train(matrices)
+        self.timings["train"] = round(time.perf_counter() - step, 3)
+
+        for trainer in self.trainers.values():
+            trainer.save_artifacts(trainer.evaluate())
+
+        self.timings["total"] = round(time.perf_counter() - start, 3)
+
+        print(
+            f"Multi-target pipeline tamamlandı: hazırlık {self.timings['prepare']:.2f} s, "
+            f"quantize {self.timings['quantize']:.2f} s, eğitim {self.timings['train']:.2f} s "
+            f"(hedef başına {self.timings['per_target']}), toplam {self.timings['total']:.2f} s"
+        )
+        return self.timings
+
+
+if __name__ == "__main__":
+    BASE_DIR = Path(__file__).resolve().parents[4]
+
+    MultiTargetTrainer(
+        data_path=BASE_DIR / "src/app/output/dataset/final/final_dataset.csv",
+        targets={
+            "urun_fiyat": BASE_DIR / "src/app/output/model/price",
+            "urun_puan": BASE_DIR / "src/app/output/model/point",
+        },
+        exclude_from_model=["urun_id", "urun_ad"],
+    ).run()
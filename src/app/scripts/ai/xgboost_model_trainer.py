@@ -1,4 +1,6 @@
+import argparse
 import json
+import sys
 import joblib
 import numpy as np
 import pandas as pd
@@ -10,11 +12,45 @@ from sklearn.metrics import mean_squared_error, mean_absolute_error, r2_score
 
 import xgboost as xgb
 
+BASE_DIR = Path(__file__).resolve().parents[4]
+sys.path.append(str(BASE_DIR))
+
+from src.app.scripts.ai.cross_validation import CrossValidator
+from src.app.scripts.ai.hyperparameter_search import HyperparameterSearch
+from src.app.scripts.dataset.dataset_io import (
+    SPARSE_SUFFIX,
+    compact_dtypes,
+    memory_mb,
+    read_dataset,
+    read_sparse_dataset,
+)
+from src.app.scripts.dataset.dataset_processor import ProductDataPreprocessor
+from src.app.scripts.model_bundle import write_bundle
+
 class XGBoostModelTrainer:
     """
     Production-ready XGBoost training pipeline
+    data_path .npz ise (encoding="sparse" final matrisi) X CSR olarak kalır ve
+    XGBoost'a sparse DMatrix olarak verilir; one-hot sıfırları saklanmaz.
+    search="random"|"halving" ise final modelden önce paralel hiperparametre
+    araması yapılır, en iyi config best_params.json'a yazılır.
+    cv_folds verilirse tüm veri üzerinde (repeated) K-fold çalışır; metrik güven
+    aralıkları cv_metrics.json'a, out-of-fold tahminler oof_predictions.csv'ye yazılır.
+    update() yeni eklenen ürünlerle kayıtlı modelden boosting'e devam eder
+    (warm-start); validation RMSE drift'ine göre tam eğitime döner.
+    Her kayıt versions/ altına checksum'lı bir bundle (UBJSON booster, feature
+    listesi, preprocessing state, metrikler) yayınlar; API bunu hot-swap eder.
     """
 
+    STATE_FILE = "training_state.json"
+
+    DEFAULT_PARAMS = {
+        "learning_rate": 0.03,
+        "max_depth": 6,
+        "subsample": 0.8,
+        "colsample_bytree": 0.8,
+    }
+
     def __init__(
         self,
         data_path: Path,
@@ -22,6 +58,13 @@ class XGBoostModelTrainer:
         target: str = "urun_fiyat",
         exclude_from_model: list[str] | None = None,
         random_state: int = 42,
+        params: dict | None = None,
+        search: str | None = None,
+        n_trials: int = 20,
+        search_workers: int | None = None,
+        cv_folds: int | None = None,
+        cv_repeats: int = 1,
+        cv_workers: int | None = None,
     ):
         self.data_path = data_path
         self.output_dir = output_dir
@@ -29,6 +72,16 @@ class XGBoostModelTrainer:
         self.exclude_from_model = exclude_from_model or []
         self.random_state = random_state
 
+        self.params = {**self.DEFAULT_PARAMS, **(params or {})}
+        self.search = search
+        self.n_trials = n_trials
+        self.search_workers = search_workers
+
+        self.cv_folds = cv_folds
+        self.cv_repeats = cv_repeats
+        self.cv_workers = cv_workers
+        self.cv_summary = None
+
         self.output_dir.mkdir(parents=True, exist_ok=True)
 
         self.df = None
@@ -36,6 +89,10 @@ class XGBoostModelTrainer:
         self.y = None
         self.model = None
 
+        self.sparse = Path(data_path).suffix == SPARSE_SUFFIX
+        self.dataset = None
+        self.feature_names = None
+
         self.X_train = None
         self.X_val = None
         self.X_test = None
@@ -48,32 +105,77 @@ class XGBoostModelTrainer:
     # =====================================
 
     def load_data(self) -> None:
-        self.df = pd.read_csv(self.data_path)
+        if self.sparse:
+            self.dataset = read_sparse_dataset(self.data_path)
+
+            if self.target not in self.dataset["labels"]:
+                raise ValueError(f"{self.target} bulunamadı.")
+
+            matrix = self.dataset["matrix"]
+            print(f"Veri yüklendi. {matrix.shape}, nnz={matrix.nnz}")
+            return
+
+        df = read_dataset(self.data_path)
 
-        if self.target not in self.df.columns:
+        if self.target not in df.columns:
             raise ValueError(f"{self.target} bulunamadı.")
 
-        print("Veri yüklendi.")
+        # Feature'lar float32 / uint8 / bool; XGBoost bunları float64'e
+        # çevirmeden alır. Hedef hassasiyeti korunur.
+        self.df = compact_dtypes(df, exclude=[self.target])
+
+        print(f"Veri yüklendi. Bellek: {memory_mb(df):.2f} MB → {memory_mb(self.df):.2f} MB")
 
     # =====================================
     # FEATURE PREPARATION
     # =====================================
 
     def prepare_features(self) -> None:
-        self.X = self.df.drop(
-            columns=[self.target] + self.exclude_from_model,
-            errors="ignore"
-        )
-        self.y = self.df[self.target]
+        if self.sparse:
+            self._prepare_sparse_features()
+        else:
+            self.X = self.df.drop(
+                columns=[self.target] + self.exclude_from_model,
+                errors="ignore"
+            )
+            self.y = self.df[self.target]
+            self.feature_names = list(self.X.columns)
 
         self._save_feature_order()
 
         print("Feature hazırlığı tamamlandı.")
 
+    def _prepare_sparse_features(self) -> None:
+        # Hedef ve id'ler labels'ta; matristen yalnızca hariç tutulanlar düşer
+        columns = self.dataset["columns"]
+        keep = [
+            i for i, col in enumerate(columns)
+            if col != self.target and col not in self.exclude_from_model
+        ]
+
+        self.X = self.dataset["matrix"][:, keep]
+        self.y = pd.Series(self.dataset["labels"][self.target], name=self.target)
+        self.feature_names = [columns[i] for i in keep]
+
     def _save_feature_order(self) -> None:
         feature_path = self.output_dir / "model_features.json"
         with open(feature_path, "w", encoding="utf-8") as f:
-            json.dump(list(self.X.columns), f)
+            json.dump(self.feature_names, f)
+
+        # PredictService bu listedeki feature'ların sıfırlarını eksik (sparse)
+        # olarak verir; dense eğitimde eski liste silinir
+        sparse_path = self.output_dir / "sparse_features.json"
+        if self.sparse:
+            with open(sparse_path, "w", encoding="utf-8") as f:
+                json.dump(self._sparse_features(), f)
+        else:
+            sparse_path.unlink(missing_ok=True)
+
+    def _sparse_features(self) -> list[str] | None:
+        if not self.sparse:
+            return None
+        implicit = set(self.dataset["sparse_columns"])
+        return [col for col in self.feature_names if col in implicit]
 
     # =====================================
     # DATA SPLIT
@@ -97,9 +199,78 @@ class XGBoostModelTrainer:
         self.X_train, self.X_val, self.X_test = X_train, X_val, X_test
         self.y_train, self.y_val, self.y_test = y_train, y_val, y_test
 
-        print(f"Train size: {len(self.X_train)}")
-        print(f"Validation size: {len(self.X_val)}")
-        print(f"Test size: {len(self.X_test)}")
+        print(f"Train size: {self.X_train.shape[0]}")
+        print(f"Validation size: {self.X_val.shape[0]}")
+        print(f"Test size: {self.X_test.shape[0]}")
+
+    # =====================================
+    # HYPERPARAMETER SEARCH
+    # =====================================
+
+    def search_params(self) -> dict:
+        """
+        Train / validation split üzerinde arama; en iyi config self.params'a
+        alınır ve model_features.json'ın yanına best_params.json olarak yazılır
+        """
+        searcher = HyperparameterSearch(
+            strategy=self.search,
+            n_trials=self.n_trials,
+            workers=self.search_workers,
+            random_state=self.random_state,
+        )
+        best = searcher.run(self.X_train, self.y_train, self.X_val, self.y_val)
+
+        self.params = {**self.DEFAULT_PARAMS, **best["params"]}
+
+        with open(self.output_dir / "best_params.json", "w", encoding="utf-8") as f:
+            json.dump(best, f, indent=2)
+
+        print(
+            f"Arama tamamlandı: {best['trainings']} eğitim, {best['pruned']} prune, "
+            f"val RMSE {best['val_rmse']:.6f}, {best['wall_seconds']:.1f} s"
+        )
+        return best
+
+    @staticmethod
+    def load_best_params(output_dir: Path) -> dict:
+        with open(Path(output_dir) / "best_params.json", "r", encoding="utf-8") as f:
+            return json.load(f)["params"]
+
+    # =====================================
+    # CROSS-VALIDATION
+    # =====================================
+
+    def cross_validate(self) -> dict:
+        """
+        Tüm satırlar üzerinde K-fold; OOF tahminleri ModelEvaluator'ın yeniden
+        tahmin yapmadan okuyabileceği biçimde (log ölçekte) yazılır
+        """
+        validator = CrossValidator(
+            n_splits=self.cv_folds,
+            n_repeats=self.cv_repeats,
+            workers=self.cv_workers,
+            params=self.params,
+            random_state=self.random_state,
+        )
+        summary, oof = validator.run(self.X, self.y)
+
+        oof = oof.rename(columns={"y_true": self.target})
+        ids = self._row_ids()
+        if ids is not None:
+            oof.insert(1, "urun_id", ids)
+        oof.to_csv(self.output_dir / "oof_predictions.csv", index=False)
+
+        with open(self.output_dir / "cv_metrics.json", "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+
+        self.cv_summary = summary
+
+        rmse = summary["metrics"]["rmse"]
+        print(
+            f"CV tamamlandı: {self.cv_repeats}x{self.cv_folds} fold, RMSE {rmse['mean']:.6f} "
+            f"[{rmse['ci_low']:.6f}, {rmse['ci_high']:.6f}], {summary['wall_seconds']:.1f} s"
+        )
+        return summary
 
     # =====================================
     # MODEL INITIALIZATION
@@ -108,10 +279,7 @@ class XGBoostModelTrainer:
     def _build_model(self) -> xgb.XGBRegressor:
         return xgb.XGBRegressor(
             n_estimators=2000,
-            learning_rate=0.03,
-            max_depth=6,
-            subsample=0.8,
-            colsample_bytree=0.8,
+            **self.params,
             random_state=self.random_state,
             tree_method="hist",
             early_stopping_rounds=50,
@@ -166,18 +334,33 @@ class XGBoostModelTrainer:
     # SAVE ARTIFACTS
     # =====================================
 
-    def save_artifacts(self, metrics: dict) -> None:
+    def save_artifacts(self, metrics: dict, mode: str = "full") -> None:
         self._save_model()
         self._save_feature_importance()
         self._save_report(metrics)
+        self._save_training_state(metrics, mode)
+        self._save_bundle(metrics, mode)
 
     def _save_model(self) -> None:
         self.model.save_model(self.output_dir / f"xgboost_{self.target}_model.json")
         joblib.dump(self.model, self.output_dir / f"xgboost_{self.target}_model.pkl")
 
+    def _save_bundle(self, metrics: dict, mode: str) -> None:
+        version = write_bundle(
+            self.output_dir,
+            self.model.get_booster(),
+            self.feature_names,
+            {"mode": mode, "best_iteration": int(self.model.best_iteration), **metrics},
+            self.target,
+            sparse_features=self._sparse_features(),
+            # Final dataset'i üreten preprocessor'ın state'i yanında durur
+            state_path=Path(self.data_path).parent / ProductDataPreprocessor.STATE_FILENAME,
+        )
+        print(f"Model bundle yayınlandı: {version}")
+
     def _save_feature_importance(self) -> None:
         importance_df = pd.DataFrame({
-            "feature": self.X.columns,
+            "feature": self.feature_names,
             "importance": self.model.feature_importances_
         }).sort_values(by="importance", ascending=False)
 
@@ -197,10 +380,10 @@ class XGBoostModelTrainer:
 
             f.write("VERİ SETİ BOYUTLARI\n")
             f.write("-" * 30 + "\n")
-            f.write(f"Toplam kayıt: {len(self.df)}\n")
-            f.write(f"Eğitim: {len(self.X_train)}\n")
-            f.write(f"Validation: {len(self.X_val)}\n")
-            f.write(f"Test: {len(self.X_test)}\n\n")
+            f.write(f"Toplam kayıt: {len(self.y)}\n")
+            f.write(f"Eğitim: {self.X_train.shape[0]}\n")
+            f.write(f"Validation: {self.X_val.shape[0]}\n")
+            f.write(f"Test: {self.X_test.shape[0]}\n\n")
 
             for dataset in metrics.values():
                 f.write(f"{dataset['dataset'].upper()} METRİKLERİ\n")
@@ -209,6 +392,205 @@ class XGBoostModelTrainer:
                 f.write(f"MAE:  {dataset['mae']:.6f}\n")
                 f.write(f"R2:   {dataset['r2']:.6f}\n\n")
 
+            if self.cv_summary:
+                cv = self.cv_summary
+                f.write(
+                    f"CROSS-VALIDATION ({cv['n_repeats']}x{cv['n_splits']} fold, "
+                    f"%{cv['confidence'] * 100:.0f} güven aralığı)\n"
+                )
+                f.write("-" * 30 + "\n")
+                for name, m in cv["metrics"].items():
+                    f.write(
+                        f"{name.upper() + ':':<5} {m['mean']:.6f} ± {m['std']:.6f} "
+                        f"[{m['ci_low']:.6f}, {m['ci_high']:.6f}]\n"
+                    )
+                f.write("\n")
+
+    # =====================================
+    # TRAINING STATE
+    # =====================================
+
+    def _row_ids(self) -> np.ndarray | None:
+        source = self.dataset["labels"] if self.sparse else self.df
+        return np.asarray(source["urun_id"]) if "urun_id" in source else None
+
+    def _rows(self, positions) -> tuple:
+        positions = np.asarray(positions, dtype=np.int64)
+        X = self.X.iloc[positions] if isinstance(self.X, pd.DataFrame) else self.X[positions]
+        return X, self.y.iloc[positions]
+
+    def _save_training_state(self, metrics: dict, mode: str) -> None:
+        """
+        Modelin hangi ürünlerle eğitildiğini ve drift referansını saklar.
+        Referans RMSE yalnızca tam eğitimde yenilenir; warm-start'lar son tam
+        eğitime göre ölçülür.
+        """
+        ids = self._row_ids()
+        if ids is None:
+            return
+
+        previous = self.load_training_state(self.output_dir) or {}
+        val_rmse = float(metrics["validation"]["rmse"])
+        split_ids = {
+            name: ids[np.asarray(y.index)].tolist()
+            for name, y in (("train_ids", self.y_train), ("val_ids", self.y_val), ("test_ids", self.y_test))
+        }
+
+        state = {
+            "mode": mode,
+            "updated_at": datetime.now().isoformat(),
+            "target": self.target,
+            **split_ids,
+            "reference_val_rmse": val_rmse if mode == "full" else previous["reference_val_rmse"],
+            "val_rmse": val_rmse,
+            "n_trees": self.model.get_booster().num_boosted_rounds(),
+            "best_iteration": int(self.model.best_iteration),
+            "history": previous.get("history", []) + [{
+                "mode": mode,
+                "updated_at": datetime.now().isoformat(),
+                "rows": len(ids),
+                "val_rmse": val_rmse,
+            }],
+        }
+
+        with open(self.output_dir / self.STATE_FILE, "w", encoding="utf-8") as f:
+            json.dump(state, f, indent=2)
+
+    @classmethod
+    def load_training_state(cls, output_dir: Path) -> dict | None:
+        path = Path(output_dir) / cls.STATE_FILE
+        if not path.exists():
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    # =====================================
+    # INCREMENTAL UPDATE
+    # =====================================
+
+    def _full_retrain(self, reason: str, **details) -> dict:
+        print(f"Tam eğitim: {reason}")
+        self.run()
+        return {"decision": "full", "reason": reason, **details}
+
+    def _rmse(self, model: xgb.XGBRegressor, positions) -> float:
+        X, y = self._rows(positions)
+        return float(np.sqrt(mean_squared_error(y, model.predict(X))))
+
+    def update(self, update_rounds: int = 500, drift_tolerance: float = 0.10) -> dict:
+        """
+        training_state.json'da olmayan (yeni) ürünlerle warm-start:
+        - Held-out set: önceki validation ürünleri + yeni ürünlerin %15'i
+        - Kayıtlı model held-out'ta referans RMSE'den drift_tolerance'tan fazla
+          kötüleşmişse veri kaymıştır → tam eğitim
+        - Aksi halde model best_iteration'a kırpılır ve yalnızca yeni train
+          satırlarıyla en fazla update_rounds tur boosting'e devam edilir
+          (xgb_model); maliyet yeni veriyle orantılı
+        - Warm-start modeli held-out'ta eski modelden kötüyse ya da toleransı
+          aşıyorsa tam eğitim, değilse kabul edilir
+        Feature listesi değiştiyse (yeni one-hot kategorileri) tam eğitim yapılır.
+        """
+        state = self.load_training_state(self.output_dir)
+        model_path = self.output_dir / f"xgboost_{self.target}_model.json"
+        feature_path = self.output_dir / "model_features.json"
+
+        if state is None or not model_path.exists() or not feature_path.exists():
+            return self._full_retrain("kayıtlı model / eğitim durumu yok")
+
+        with open(feature_path, "r", encoding="utf-8") as f:
+            trained_features = json.load(f)
+
+        self.load_data()
+        self.prepare_features()
+
+        if self.feature_names != trained_features:
+            return self._full_retrain("feature listesi değişti")
+
+        ids = self._row_ids()
+        if ids is None:
+            return self._full_retrain("urun_id yok, yeni ürünler ayırt edilemiyor")
+
+        position = {urun_id: pos for pos, urun_id in enumerate(ids.tolist())}
+        known = set(state["train_ids"]) | set(state["val_ids"]) | set(state["test_ids"])
+        new_positions = np.array([pos for urun_id, pos in position.items() if urun_id not in known])
+
+        if len(new_positions) == 0:
+            print("Yeni ürün yok, model değişmedi.")
+            return {"decision": "unchanged", "new_rows": 0}
+
+        # Çok az yeni ürün varsa hepsi eğitime girer, held-out eski validation'dır
+        if len(new_positions) >= 10:
+            new_train, new_val = train_test_split(
+                new_positions, test_size=0.15, random_state=self.random_state
+            )
+        else:
+            new_train, new_val = new_positions, np.array([], dtype=np.int64)
+
+        holdout = np.concatenate([
+            [position[urun_id] for urun_id in state["val_ids"] if urun_id in position],
+            new_val
+        ]).astype(np.int64)
+
+        if len(holdout) == 0:
+            return self._full_retrain("held-out set boş")
+
+        previous = xgb.XGBRegressor()
+        previous.load_model(model_path)
+
+        reference = state["reference_val_rmse"]
+        baseline = self._rmse(previous, holdout)
+        details = {
+            "new_rows": len(new_positions),
+            "reference_rmse": reference,
+            "baseline_rmse": baseline,
+        }
+
+        if baseline > reference * (1 + drift_tolerance):
+            return self._full_retrain("validation RMSE drift", **details)
+
+        X_new, y_new = self._rows(new_train)
+        X_holdout, y_holdout = self._rows(holdout)
+
+        # XGBRegressor.fit hist'te yeni satırlardan yeni bin sınırlarıyla
+        # QuantileDMatrix kurar; eski ağaçlar bu binlerde yanlış dallanır ve
+        # gradyanlar bozulur. Ham değerli DMatrix ile devam edilir.
+        model = self._build_model()
+        params = {k: v for k, v in model.get_xgb_params().items() if v is not None}
+
+        booster = xgb.train(
+            params,
+            xgb.DMatrix(X_new, label=y_new),
+            num_boost_round=update_rounds,
+            evals=[(xgb.DMatrix(X_holdout, label=y_holdout), "validation_0")],
+            early_stopping_rounds=model.early_stopping_rounds,
+            xgb_model=previous.get_booster()[: previous.best_iteration + 1],
+            verbose_eval=False
+        )
+        model.load_model(bytearray(booster.save_raw("ubj")))
+
+        details["warm_rmse"] = self._rmse(model, holdout)
+        details["added_trees"] = model.get_booster().num_boosted_rounds() - (previous.best_iteration + 1)
+
+        if details["warm_rmse"] > baseline or details["warm_rmse"] > reference * (1 + drift_tolerance):
+            return self._full_retrain("warm-start held-out'ta kötüleşti", **details)
+
+        self.model = model
+
+        test = [position[urun_id] for urun_id in state["test_ids"] if urun_id in position]
+        train = [position[urun_id] for urun_id in state["train_ids"] if urun_id in position]
+
+        self.X_train, self.y_train = self._rows(np.concatenate([train, new_train]))
+        self.X_val, self.y_val = X_holdout, y_holdout
+        self.X_test, self.y_test = self._rows(test)
+
+        self.save_artifacts(self.evaluate(), mode="warm_start")
+
+        print(
+            f"Warm-start kabul edildi: {details['new_rows']} yeni ürün, +{details['added_trees']} ağaç, "
+            f"held-out RMSE {baseline:.6f} → {details['warm_rmse']:.6f}"
+        )
+        return {"decision": "warm_start", **details}
+
     # =====================================
     # FULL PIPELINE
     # =====================================
@@ -217,6 +599,10 @@ class XGBoostModelTrainer:
         self.load_data()
         self.prepare_features()
         self.split_data()
+        if self.search:
+            self.search_params()
+        if self.cv_folds:
+            self.cross_validate()
         self.train()
         metrics = self.evaluate()
         self.save_artifacts(metrics)
@@ -226,20 +612,50 @@ class XGBoostModelTrainer:
 if __name__ == "__main__":
     BASE_DIR = Path(__file__).resolve().parents[4]
 
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--search", choices=["random", "halving"], default=None)
+    parser.add_argument("--trials", type=int, default=20)
+    parser.add_argument(
+        "--workers", type=int, default=None,
+        help="Paralel trial sayısı; aynı --workers ile arama sonucu tekrarlanabilir"
+    )
+    parser.add_argument("--folds", type=int, default=None)
+    parser.add_argument("--repeats", type=int, default=1)
+    parser.add_argument("--cv-workers", type=int, default=None)
+    parser.add_argument("--update", action="store_true")
+    args = parser.parse_args()
+
+    options = {
+        "search": args.search,
+        "n_trials": args.trials,
+        "search_workers": args.workers,
+        "cv_folds": args.folds,
+        "cv_repeats": args.repeats,
+        "cv_workers": args.cv_workers,
+    }
+
     price_trainer = XGBoostModelTrainer(
         data_path=BASE_DIR / "src/app/output/dataset/final/final_dataset.csv",
         output_dir=BASE_DIR / "src/app/output/model/price",
         target="urun_fiyat",
-        exclude_from_model=["urun_puan", "urun_id", "urun_ad"]
+        exclude_from_model=["urun_puan", "urun_id", "urun_ad"],
+        **options
     )
 
-    price_trainer.run()
+    if args.update:
+        price_trainer.update()
+    else:
+        price_trainer.run()
 
     point_trainer = XGBoostModelTrainer(
         data_path=BASE_DIR / "src/app/output/dataset/final/final_dataset.csv",
         output_dir=BASE_DIR / "src/app/output/model/point",
         target="urun_puan",
-        exclude_from_model=["urun_fiyat", "urun_id", "urun_ad"]
+        exclude_from_model=["urun_fiyat", "urun_id", "urun_ad"],
+        **options
     )
 
-    point_trainer.run()
\ No newline at end of file
+    if args.update:
+        point_trainer.update()
+    else:
+        point_trainer.run()
\ No newline at end of file
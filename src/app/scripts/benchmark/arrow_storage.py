@@ -0,0 +1,137 @@
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+import pandas as pd
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[4]
+sys.path.append(str(BASE_DIR))
+
+from src.app.scripts.dataset import dataset_io
+from src.app.scripts.dataset.dataset_io import arrow_path, memory_mb, read_dataset, resolve_dataset_path
+from src.app.scripts.dataset.dataset_processor import ProductDataPreprocessor
+
+RAW_PATH = BASE_DIR / "src/app/output/dataset/raw/raw_dataset.csv"
+
+# Arrow'a compact_final ile yazılan dosyalar
+FINAL_FILES = {"step8_final_dataset.csv", "final_dataset.csv"}
+
+
+class ArrowStorageCheck:
+    """
+    storage="arrow" yolunun kontrolü (pyarrow yoksa atlanır, başarısız sayılmaz):
+    1) pipeline csv ve arrow ile ayrı ayrı çalıştırılır; her adımın ve final
+       dataset'in frame'i aynıdır, dtype'lar birebir (float'lar read_csv'nin
+       ulp sapması kadar toleranslı; final dosyalar compact_final dtype'larıyla)
+    2) read_dataset .arrow'u CSV'den eski değilse tercih eder, columns ile
+       yalnızca istenen kolonları okur
+    3) okuma süresi ve frame belleği: to_pandas kolonları heap'e kopyalar,
+       bellek kazancı yalnızca columns ile okunan alt kümeden gelir
+    """
+
+    def __init__(self, repeat: int = 20):
+        self.repeat = repeat
+        self.tmp_dir = Path(tempfile.mkdtemp())
+
+    def _pipeline(self, storage: str) -> ProductDataPreprocessor:
+        output_dir = self.tmp_dir / storage
+        processor = ProductDataPreprocessor(
+            input_path=RAW_PATH,
+            processed_dir=output_dir / "processed",
+            output_dir=output_dir / "final",
+            state_path=output_dir / "final" / "preprocessor_state.json",
+            storage=storage,
+        )
+        with contextlib.redirect_stdout(io.StringIO()):
+            processor.run()
+        return processor
+
+    def _timed(self, fn) -> float:
+        start = time.perf_counter()
+        for _ in range(self.repeat):
+            fn()
+        return (time.perf_counter() - start) / self.repeat * 1000
+
+    def frames(self) -> bool:
+        csv, arrow = self._pipeline("csv"), self._pipeline("arrow")
+        pairs = [
+            (csv.processed_dir / path.name, arrow.processed_dir / path.name)
+            for path in sorted(csv.processed_dir.glob("*.csv"))
+        ]
+        pairs.append((csv.output_dir / "final_dataset.csv", arrow.output_dir / "final_dataset.csv"))
+
+        ok = True
+        print(f"{'dosya':<34} {'aynı':>5} {'csv (ms)':>9} {'arrow (ms)':>11}")
+        for csv_path, arrow_csv_path in pairs:
+            same = arrow_path(arrow_csv_path).exists()
+            if same:
+                expected = read_dataset(csv_path)
+                if csv_path.name in FINAL_FILES:
+                    expected = arrow.compact_final(expected)
+                try:
+                    pd.testing.assert_frame_equal(
+                        expected, read_dataset(arrow_csv_path), check_exact=False
+                    )
+                except AssertionError as e:
+                    print(e)
+                    same = False
+            ok = ok and same
+
+            print(
+                f"{csv_path.name:<34} {str(same):>5} "
+                f"{self._timed(lambda: read_dataset(csv_path)):>9.2f} "
+                f"{self._timed(lambda: read_dataset(arrow_csv_path)):>11.2f}"
+            )
+
+        same_state = (
+            (csv.output_dir / "preprocessor_state.json").read_bytes()
+            == (arrow.output_dir / "preprocessor_state.json").read_bytes()
+        )
+        print(f"preprocessor_state.json aynı: {same_state}")
+
+        self.final_path = arrow.output_dir / "final_dataset.csv"
+        return ok and same_state
+
+    def resolution(self) -> bool:
+        path = self.final_path
+        columnar = arrow_path(path)
+
+        # CSV yoksa / eskiyse arrow, arrow'dan yeniyse CSV okunur
+        prefers_arrow = resolve_dataset_path(path) == columnar
+        read_dataset(path).to_csv(path, index=False)
+        newer = columnar.stat().st_mtime + 1
+        os.utime(path, (newer, newer))
+        prefers_fresh_csv = resolve_dataset_path(path) == path
+        path.unlink()
+
+        columns = list(read_dataset(path).columns[:3])
+        subset = read_dataset(path, columns=columns)
+        same_subset = list(subset.columns) == columns
+
+        full = memory_mb(read_dataset(path))
+        print(
+            f"arrow tercih: {prefers_arrow}, yeni CSV tercih: {prefers_fresh_csv}, "
+            f"columns alt kümesi: {same_subset} ({memory_mb(subset):.3f} / {full:.3f} MB)"
+        )
+        return prefers_arrow and prefers_fresh_csv and same_subset
+
+    def run(self) -> bool:
+        if dataset_io.feather is None:
+            print("pyarrow yüklü değil: arrow yolu doğrulanmadı (atlandı)")
+            return True
+
+        ok = self.frames() and self.resolution()
+        print("OK" if ok else "HATA")
+        return ok
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    sys.exit(0 if ArrowStorageCheck(repeat=args.repeat).run() else 1)
@@ -0,0 +1,240 @@
+import argparse
+import contextlib
+import hashlib
+import io
+import multiprocessing
+import sys
+import tempfile
+import threading
+import time
+import pandas as pd
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[4]
+sys.path.append(str(BASE_DIR))
+
+from src.app.scripts.dataset.dataset_extractor import EpeyPhoneScraper
+from src.app.scripts.dataset.fixture_server import EpeyFixtureServer
+
+FIXTURE_DIR = BASE_DIR / "src/app/scripts/benchmark/fixtures/epey"
+
+
+class CountingScraper(EpeyPhoneScraper):
+    # Checkpoint'ten gelmeyip gerçekten parse edilen detay sayfaları
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.parsed = 0
+        self._parsed_lock = threading.Lock()
+
+    def parse_product_detail(self, html, encoding=None):
+        with self._parsed_lock:
+            self.parsed += 1
+        return super().parse_product_detail(html, encoding)
+
+
+class SleepCountingScraper(EpeyPhoneScraper):
+    # Sıralı moddaki sleep çağrıları (liste sayfaları + indirilen ürünler)
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.sleeps = 0
+
+    def _sleep(self):
+        self.sleeps += 1
+        super()._sleep()
+
+
+def _scrape_until_killed(base_url: str, output_dir: str, workers: int, rps: float, limit: int):
+    # Ayrı process: parent checkpoint dolarken SIGKILL gönderir
+    scraper = ConcurrentScrapeCheck.scraper(base_url, Path(output_dir), workers, rps, cache=True)
+    with contextlib.redirect_stdout(io.StringIO()):
+        scraper.scrape(limit=limit)
+
+
+class ConcurrentScrapeCheck:
+    """
+    EpeyFixtureServer üzerinde scraper koşuları (ağa çıkılmaz):
+    1) sıralı (workers=1) vs eşzamanlı (_iter_concurrent): satırlar aynı
+       içerikte ve aynı sırada, indirilen resimler aynı
+    2) rate limit: eşzamanlı koşuda sunucuya gelen isteklerin herhangi bir
+       1 s penceresindeki sayısı requests_per_second + burst'ü aşmaz
+    3) resume: checkpoint'li eşzamanlı koşu yazarken öldürülür, son satırı
+       yarım bırakılır; ikinci koşu yalnızca checkpoint'te olmayan ürünleri
+       parse eder ve sonuç sıralı koşuyla aynıdır
+    4) cache: cache'li sıralı koşu (gerçek ürün başı sleep ile) tekrarlanır;
+       304 ve taze cache koşularında yalnızca liste sayfalarından sonra
+       beklenir, sonuç sıralı koşuyla aynıdır
+    Sunucu her cevabı rastgele geciktirir; sayfalar ürün sırasıyla bitmez.
+    """
+
+    def __init__(
+        self,
+        workers: int = 4,
+        rps: float = 10.0,
+        delay: tuple[float, float] = (0.0, 0.5),
+        sleep: float = 0.5,
+    ):
+        self.workers = workers
+        self.rps = rps
+        self.delay = delay
+        self.sleep = sleep
+        self.tmp_dir = Path(tempfile.mkdtemp())
+        self.limit = len(list((FIXTURE_DIR / "akilli-telefonlar").glob("*.html")))
+        self.list_pages = len(list((FIXTURE_DIR / "akilli-telefonlar" / "e").rglob("index.html")))
+
+    @staticmethod
+    def scraper(
+        base_url: str,
+        output_dir: Path,
+        workers: int,
+        rps: float,
+        cache: bool = False,
+        cls=EpeyPhoneScraper,
+        sleep: float = 0.0,
+        cache_max_age: float | None = None,
+    ):
+        return cls(
+            base_url=base_url,
+            list_base=f"{base_url}/akilli-telefonlar",
+            output_csv=output_dir / "raw.csv",
+            min_delay=sleep,
+            max_delay=sleep,
+            image_dir=output_dir / "image",
+            workers=workers,
+            requests_per_second=rps,
+            cache_dir=output_dir / "cache" if cache else None,
+            cache_max_age=cache_max_age,
+            parser="lxml",
+        )
+
+    @staticmethod
+    def _images(output_dir: Path) -> dict:
+        return {
+            path.name: hashlib.sha256(path.read_bytes()).hexdigest()
+            for path in (output_dir / "image").glob("*.jpg")
+        }
+
+    def _scrape(self, server: EpeyFixtureServer, name: str, workers: int, **kwargs) -> tuple[pd.DataFrame, float, EpeyPhoneScraper]:
+        scraper = self.scraper(server.base_url, self.tmp_dir / name, workers, self.rps, **kwargs)
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            df = scraper.scrape(limit=self.limit)
+        return df, time.perf_counter() - start, scraper
+
+    def _rate(self, requests: list) -> tuple[int, int, int]:
+        """
+        (1 s penceresindeki en fazla istek, en fazla eşzamanlı istek,
+        ürün sırasıyla bitmeyen detay sayfası sayısı)
+        """
+        starts = sorted(start for start, _, _ in requests)
+        window = max(
+            sum(1 for t in starts[i:] if t - start < 1.0)
+            for i, start in enumerate(starts)
+        )
+        in_flight = max(
+            sum(1 for s, e, _ in requests if s <= start < e)
+            for start, _, _ in requests
+        )
+        details = [
+            path for _, _, path in sorted(requests, key=lambda r: r[1])
+            if path.endswith(".html")
+        ]
+        submitted = [path for _, _, path in sorted(requests) if path.endswith(".html")]
+        out_of_order = sum(a != b for a, b in zip(details, submitted))
+        return window, in_flight, out_of_order
+
+    def _interrupted_resume(self, server: EpeyFixtureServer, expected: pd.DataFrame) -> bool:
+        output_dir = self.tmp_dir / "resume"
+        checkpoint = output_dir / "cache" / "checkpoint.jsonl"
+
+        process = multiprocessing.get_context("spawn").Process(
+            target=_scrape_until_killed,
+            args=(server.base_url, str(output_dir), self.workers, self.rps, self.limit),
+        )
+        process.start()
+
+        # Ürünlerin yaklaşık yarısı checkpoint'e yazılınca öldürülür
+        while process.is_alive():
+            if checkpoint.exists() and checkpoint.read_bytes().count(b"\n") >= self.limit // 2:
+                break
+            time.sleep(0.01)
+        process.kill()
+        process.join()
+
+        # Yazım sırasında kesilmiş gibi son satır yarım bırakılır
+        lines = checkpoint.read_bytes().splitlines(keepends=True)
+        checkpoint.write_bytes(b"".join(lines[:-1]) + lines[-1][: len(lines[-1]) // 2])
+        complete = len(lines) - 1
+
+        scraper = self.scraper(server.base_url, output_dir, self.workers, self.rps, cache=True, cls=CountingScraper)
+        with contextlib.redirect_stdout(io.StringIO()):
+            df = scraper.scrape(limit=self.limit)
+
+        same = df.equals(expected)
+        print(
+            f"resume: {complete} ürün checkpoint'te (+1 yarım satır), "
+            f"ikinci koşu {scraper.parsed} sayfa parse etti "
+            f"(beklenen {self.limit - complete}), sonuç sıralı koşuyla aynı: {same}"
+        )
+        return same and scraper.parsed == self.limit - complete
+
+    def _cached_sequential(self, server: EpeyFixtureServer, expected: pd.DataFrame) -> bool:
+        ok = True
+        runs = [("ilk", None), ("304", None), ("taze cache", 3600.0)]
+
+        for name, max_age in runs:
+            server.requests.clear()
+            df, elapsed, scraper = self._scrape(
+                server, "cached", 1, cache=True, cls=SleepCountingScraper,
+                sleep=self.sleep, cache_max_age=max_age
+            )
+            details = sum(1 for _, _, path in server.requests if path.endswith(".html"))
+
+            # İlk koşu her ürünü indirir; sonrakiler yalnızca liste sayfalarında bekler
+            expected_sleeps = self.list_pages + (self.limit if name == "ilk" else 0)
+            run_ok = df.equals(expected) and scraper.sleeps == expected_sleeps
+            ok = ok and run_ok
+
+            print(
+                f"cache ({name}): {elapsed:.2f} s, {scraper.sleeps} sleep "
+                f"(beklenen {expected_sleeps}, {self.sleep:g} s), "
+                f"{details} detay isteği, sonuç sıralı koşuyla aynı: {df.equals(expected)}"
+            )
+
+        return ok
+
+    def run(self) -> bool:
+        server = EpeyFixtureServer(FIXTURE_DIR, delay=self.delay)
+        with server as base_url:
+            sequential, sequential_time, _ = self._scrape(server, "sequential", 1)
+
+            server.requests.clear()
+            concurrent, concurrent_time, _ = self._scrape(server, "concurrent", self.workers)
+            window, in_flight, out_of_order = self._rate(server.requests)
+
+            same_rows = concurrent.equals(sequential)
+            same_images = self._images(self.tmp_dir / "sequential") == self._images(self.tmp_dir / "concurrent")
+            polite = window <= self.rps + 1
+
+            print(f"{len(sequential)} ürün, {len(server.requests)} istek ({base_url})")
+            print(f"sıralı {sequential_time:.2f} s, eşzamanlı ({self.workers} worker, {self.rps:g} rps) {concurrent_time:.2f} s")
+            print(
+                f"satırlar aynı ve aynı sırada: {same_rows}, resimler aynı: {same_images}, "
+                f"sırasız biten detay sayfası: {out_of_order}, en fazla eşzamanlı istek: {in_flight}"
+            )
+            print(f"1 s penceresinde en fazla {window} istek (sınır {self.rps:g} + 1 burst): {polite}")
+
+            resumed = self._interrupted_resume(server, sequential)
+            cached = self._cached_sequential(server, sequential)
+
+        ok = same_rows and same_images and polite and resumed and cached
+        print("OK" if ok else "HATA")
+        return ok
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--rps", type=float, default=10.0)
+    args = parser.parse_args()
+
+    sys.exit(0 if ConcurrentScrapeCheck(workers=args.workers, rps=args.rps).run() else 1)
@@ -0,0 +1,81 @@
+import argparse
+import os
+import pickle
+import sys
+import numpy as np
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[4]
+sys.path.append(str(BASE_DIR))
+
+from src.app.scripts.ai.cross_validation import CrossValidator
+from src.app.scripts.ai.xgboost_model_trainer import XGBoostModelTrainer
+from src.app.scripts.dataset.dataset_io import compact_dtypes, read_dataset
+
+FINAL_PATH = BASE_DIR / "src/app/output/dataset/final/final_dataset.csv"
+
+
+class CrossValidationBenchmark:
+    """
+    Repeated K-fold: worker sayısına göre süre ve fold görevlerinin taşıdığı
+    veri. Görevlere yalnızca indeksler gider; X'in pickle boyutu, her göreve
+    matris gönderilseydi taşınacak veridir. OOF tahminleri worker sayısından
+    bağımsız olmalıdır.
+    """
+
+    def __init__(self, n_rows: int | None = None, n_splits: int = 5, n_repeats: int = 2):
+        df = read_dataset(FINAL_PATH)
+        if n_rows:
+            df = df.sample(n=n_rows, replace=True, random_state=42).reset_index(drop=True)
+
+        df = compact_dtypes(df, exclude=["urun_fiyat"])
+        self.X = df.drop(columns=["urun_fiyat", "urun_puan", "urun_id", "urun_ad"])
+        self.y = df["urun_fiyat"]
+
+        self.n_splits = n_splits
+        self.n_repeats = n_repeats
+
+    def run(self, worker_counts=(1, 2, 4)):
+        n_folds = self.n_splits * self.n_repeats
+        X_bytes = len(pickle.dumps(self.X.to_numpy(dtype=np.float32)))
+        # train + val indeksleri birlikte tüm satırları kapsar
+        task_bytes = len(pickle.dumps(np.arange(len(self.X))))
+
+        print(f"{os.cpu_count()} çekirdek, {len(self.X)} satır, {self.n_repeats}x{self.n_splits} fold")
+        print(f"{'workers':>7} {'nthread':>7} {'wall (s)':>9} {'fold sum (s)':>13} {'RMSE':>9} {'CI':>21} {'same OOF':>9}")
+
+        baseline = None
+        for workers in worker_counts:
+            validator = CrossValidator(
+                n_splits=self.n_splits,
+                n_repeats=self.n_repeats,
+                workers=workers,
+                params=XGBoostModelTrainer.DEFAULT_PARAMS,
+            )
+            summary, oof = validator.run(self.X, self.y)
+
+            if baseline is None:
+                baseline = oof["y_pred"].to_numpy()
+
+            rmse = summary["metrics"]["rmse"]
+            print(
+                f"{validator.workers:>7} {validator.nthread:>7} {summary['wall_seconds']:>9.2f} "
+                f"{summary['fold_seconds']:>13.2f} {rmse['mean']:>9.5f} "
+                f"[{rmse['ci_low']:.5f}, {rmse['ci_high']:.5f}] "
+                f"{str(np.array_equal(baseline, oof['y_pred'].to_numpy())):>9}"
+            )
+
+        print(
+            f"Görev başına veri: indeksler {task_bytes / 1024:.1f} KB, "
+            f"pickle edilmiş X {X_bytes / 1024:.1f} KB (x{n_folds} görev)"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=None)
+    parser.add_argument("--folds", type=int, default=5)
+    parser.add_argument("--repeats", type=int, default=2)
+    args = parser.parse_args()
+
+    CrossValidationBenchmark(n_rows=args.rows, n_splits=args.folds, n_repeats=args.repeats).run()
@@ -0,0 +1,129 @@
+import argparse
+import json
+import sys
+import time
+import numpy as np
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[4]
+sys.path.append(str(BASE_DIR))
+
+from src.app.scripts.dataset.dataset_extractor import EpeyPhoneScraper, HttpCache
+
+# Commit'li fixture sayfaları (epey_fixtures.py); HttpCache dizini de verilebilir
+CORPUS_DIR = BASE_DIR / "src/app/scripts/benchmark/fixtures/epey/akilli-telefonlar"
+
+
+class DetailParserBenchmark:
+    """
+    Kaydedilmiş detay sayfaları üzerinde parser backend karşılaştırması:
+    - her sayfada bs4 ve lxml çıktılarının (özellik dict'i + resim url'i)
+      birebir aynı olduğu doğrulanır
+    - sayfa başı parse süresi ölçülür
+    corpus: HttpCache dizini (*.json + *.body) ya da *.html dosyaları.
+    Sayfalar scraper'daki gibi ham byte + encoding olarak parse edilir.
+    """
+
+    def __init__(self, corpus_dir: str | Path = CORPUS_DIR, rounds: int = 3):
+        self.corpus_dir = Path(corpus_dir)
+        self.rounds = rounds
+        self.pages = self._load_corpus()
+
+        if not self.pages:
+            raise FileNotFoundError(f"Corpus boş: {self.corpus_dir}")
+
+        self.parsers = {
+            name: EpeyPhoneScraper(
+                image_dir=BASE_DIR / "src/app/output/image",
+                cache_dir=None,
+                parser=name
+            )
+            for name in EpeyPhoneScraper.PARSERS
+        }
+
+    def _load_corpus(self) -> list[tuple[str, bytes, str | None]]:
+        pages = []
+
+        cache = HttpCache(self.corpus_dir)
+        for meta_path in sorted(self.corpus_dir.glob("*.json")):
+            with open(meta_path, "r", encoding="utf-8") as f:
+                url = json.load(f)["url"]
+            meta = cache.meta(url)
+            if meta:
+                pages.append((url, cache.body(url), meta["encoding"]))
+
+        for html_path in sorted(self.corpus_dir.glob("*.html")):
+            pages.append((html_path.name, html_path.read_bytes(), "utf-8"))
+
+        return pages
+
+    def check_parity(self) -> int:
+        mismatches = 0
+
+        for name, body, encoding in self.pages:
+            (expected, expected_image), (actual, actual_image) = [
+                scraper.parse_product_detail(body, encoding)
+                for scraper in self.parsers.values()
+            ]
+            if expected != actual or expected_image != actual_image:
+                mismatches += 1
+                keys = sorted(
+                    key for key in expected.keys() | actual.keys()
+                    if expected.get(key) != actual.get(key)
+                )
+                print(f"❌ Farklı çıktı: {name} {len(expected)}/{len(actual)} alan, farklı: {keys[:5]}")
+
+        return mismatches
+
+    def _measure(self, scraper: EpeyPhoneScraper) -> dict:
+        latencies = []
+
+        for _ in range(self.rounds):
+            for _, body, encoding in self.pages:
+                start = time.perf_counter()
+                scraper.parse_product_detail(body, encoding)
+                latencies.append(time.perf_counter() - start)
+
+        arr = np.array(latencies) * 1000
+        return {
+            "p50": np.percentile(arr, 50),
+            "p99": np.percentile(arr, 99),
+            "total": arr.sum() / self.rounds
+        }
+
+    def run(self):
+        mismatches = self.check_parity()
+        print(f"{len(self.pages)} sayfa, {mismatches} farklı çıktı")
+
+        results = {
+            name: self._measure(scraper)
+            for name, scraper in self.parsers.items()
+        }
+
+        print(f"{'parser':<8} {'p50 (ms)':>10} {'p99 (ms)':>10} {'corpus (ms)':>12}")
+        for name, stats in results.items():
+            print(
+                f"{name:<8} {stats['p50']:>10.3f} "
+                f"{stats['p99']:>10.3f} {stats['total']:>12.1f}"
+            )
+
+        speedup = results["bs4"]["p50"] / results["lxml"]["p50"]
+        print(f"p50 speedup: {speedup:.1f}x")
+
+        return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--corpus", default=str(CORPUS_DIR))
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--check", action="store_true", help="Yalnızca bs4 / lxml parity kontrolü")
+    args = parser.parse_args()
+
+    benchmark = DetailParserBenchmark(args.corpus, rounds=args.rounds)
+    if args.check:
+        mismatches = benchmark.check_parity()
+        print(f"{len(benchmark.pages)} sayfa, {mismatches} farklı çıktı")
+        sys.exit(1 if mismatches else 0)
+
+    benchmark.run()
@@ -0,0 +1,87 @@
+import argparse
+import sys
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[4]
+sys.path.append(str(BASE_DIR))
+
+from src.app.scripts.dataset.dataset_io import compact_dtypes, memory_mb, read_dataset
+from src.app.scripts.dataset.dataset_processor import ProductDataPreprocessor
+from src.app.scripts.product_index import ProductCatalog
+
+DATA_DIR = BASE_DIR / "src/app/output/dataset"
+CATALOG_PATH = DATA_DIR / "processed/step4_numeric_cleaned.csv"
+FINAL_PATH = DATA_DIR / "final/final_dataset.csv"
+
+
+class DtypeMemoryBenchmark:
+    """
+    Artifact başına bellek: okunduğu haliyle vs compact_dtypes sonrası.
+    Eğitim matrisinde float64 ve kompakt X ile eğitilen modellerin aynı
+    tahminleri ürettiği doğrulanır (XGBoost feature'ları float32 tutar).
+    """
+
+    def __init__(self, n_rows: int | None = None):
+        self.n_rows = n_rows
+
+    def _read(self, path: Path) -> pd.DataFrame:
+        df = read_dataset(path)
+        if self.n_rows:
+            df = df.sample(n=self.n_rows, replace=True, random_state=42).reset_index(drop=True)
+        return df
+
+    def artifacts(self) -> dict[str, tuple[pd.DataFrame, pd.DataFrame]]:
+        catalog = self._read(CATALOG_PATH)
+        final = self._read(FINAL_PATH)
+
+        X = final.drop(columns=ProductDataPreprocessor.TARGET_COLUMNS)
+
+        return {
+            "catalog (step4)": (
+                catalog,
+                compact_dtypes(catalog, exclude=ProductCatalog.LOG_COLUMNS)
+            ),
+            "final dataset": (
+                final,
+                compact_dtypes(final, exclude=["urun_fiyat", "urun_puan"])
+            ),
+            "training X": (X, compact_dtypes(X)),
+        }
+
+    @staticmethod
+    def check_training(X: pd.DataFrame, X_compact: pd.DataFrame, y: pd.Series) -> bool:
+        predictions = []
+
+        for features in (X, X_compact):
+            model = xgb.XGBRegressor(n_estimators=200, max_depth=6, tree_method="hist", random_state=42)
+            model.fit(features, y)
+            predictions.append(model.predict(features))
+
+        return np.array_equal(*predictions)
+
+    def run(self):
+        results = self.artifacts()
+
+        print(f"{'artifact':<18} {'before (MB)':>12} {'after (MB)':>11} {'ratio':>7}")
+        for name, (before, after) in results.items():
+            b, a = memory_mb(before), memory_mb(after)
+            print(f"{name:<18} {b:>12.3f} {a:>11.3f} {b / a:>6.1f}x")
+
+        final, _ = results["final dataset"]
+        X, X_compact = results["training X"]
+        identical = self.check_training(X, X_compact, final["urun_fiyat"])
+        print(f"float64 vs kompakt X ile aynı tahminler: {identical}")
+
+        print("\nKompakt dtype dağılımı (final dataset):")
+        print(results["final dataset"][1].dtypes.astype(str).value_counts().to_string())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=None)
+    args = parser.parse_args()
+
+    DtypeMemoryBenchmark(n_rows=args.rows).run()
@@ -0,0 +1,184 @@
+import argparse
+import base64
+import html
+import shutil
+import sys
+import pandas as pd
+from pathlib import Path
+from PIL import Image
+from urllib.parse import urlparse
+
+BASE_DIR = Path(__file__).resolve().parents[4]
+sys.path.append(str(BASE_DIR))
+
+from src.app.scripts.dataset.dataset_extractor import EpeyPhoneScraper
+
+RAW_PATH = BASE_DIR / "src/app/output/dataset/raw/raw_dataset.csv"
+FIXTURE_DIR = BASE_DIR / "src/app/scripts/benchmark/fixtures/epey"
+
+
+class EpeyFixtureBuilder:
+    """
+    EpeyFixtureServer'ın sunduğu epey fixture'ları. Site bu ortamdan
+    çekilemediğinden sayfalar raw_dataset.csv satırlarından epey'in
+    işaretlemesiyle yeniden kurulur:
+    - detay sayfaları (div#ozellikler > div#grup > h3 span + ul.grup li >
+      strong, span.cell); hücreler düz metin, link, tekrar eden link, yorum,
+      &nbsp; ve ikon gibi varyasyonlarla yazılır, parse edilen sayfa satırın
+      kendisini verir
+    - popülerlik sıralı liste sayfaları (ul.metin.row), PAGE_SIZE ürün/sayfa
+    - küçük JPEG ürün resimleri (cdn.epey.com/img/...)
+    """
+
+    PAGE_SIZE = 8
+
+    # Başlık .lower() ile kolon önekini verir (I → i, İ → i̇)
+    GROUPS = [
+        "EKRAN", "BATARYA", "KAMERA", "TEMEL DONANIM", "TASARIM",
+        "AĞ BAĞLANTILARI", "İŞLETİM SİSTEMİ", "KABLOSUZ BAĞLANTILAR",
+        "ÇOKLU ORTAM", "ÖZELLİKLER", "DİĞER BAĞLANTILAR",
+        "AB ÜRÜN KAYIT VE ENERJİ ETİKETİ", "TEMEL BİLGİLER",
+    ]
+
+    def __init__(self, raw_path: Path = RAW_PATH, fixture_dir: Path = FIXTURE_DIR, n_products: int = 12):
+        self.df = pd.read_csv(raw_path, dtype=str).head(n_products)
+        self.fixture_dir = Path(fixture_dir)
+
+        # Uzun önek önce: "temel_bi̇lgi̇ler" "temel_donanim"dan ayrılsın
+        self.prefixes = sorted(
+            ((EpeyPhoneScraper._column_name(title.lower(), ""), title) for title in self.GROUPS),
+            key=lambda item: -len(item[0])
+        )
+
+    def _group(self, column: str) -> tuple[str, str]:
+        for prefix, title in self.prefixes:
+            if column.startswith(prefix):
+                return title, column[len(prefix):].replace("_", " ")
+        raise ValueError(f"Grubu bilinmeyen kolon: {column}")
+
+    @staticmethod
+    def _cell(value: str, variant: int) -> str:
+        parts = value.split(" | ")
+        link = '<a href="https://www.epey.com/akilli-telefonlar/e/{}/">{}</a>'
+
+        if len(parts) > 1:
+            links = [link.format(i, html.escape(part)) for i, part in enumerate(parts)]
+            if variant % 2:
+                # Aynı özellik iki kez listelenir; parser tekrarı atar
+                links.append(link.format(0, html.escape(parts[0])))
+            return '<span class="cell cs1">' + ", ".join(links) + "</span>"
+
+        text = html.escape(value)
+        return [
+            f'<span class="cell cs1">{text}</span>',
+            f'<span class="cell cs1">\n      {link.format(0, text)}\n    </span>',
+            f'<span class="cell cs1"><!-- kaynak: üretici -->{text}&nbsp;</span>',
+            f'<span class="cell cs1"><span class="ikon"><i class="fa"></i></span> {text} </span>',
+        ][variant % 4]
+
+    def detail_page(self, row: pd.Series) -> str:
+        groups = {}
+        for j, (column, value) in enumerate(row.items()):
+            if column.startswith("urun_") or pd.isna(value):
+                continue
+            title, key = self._group(column)
+            groups.setdefault(title, []).append(
+                f'<li><strong class="ozellik">{html.escape(key)}</strong>'
+                f"{self._cell(value, j + int(row['urun_id']))}</li>"
+            )
+
+        slug = Path(urlparse(row["urun_url"]).path).stem
+        sections = "\n".join(
+            f'<div id="grup" class="{i}">\n  <h3><span>{html.escape(title)}</span></h3>\n'
+            f'  <ul class="grup">\n    <li class="baslik">Özellik</li>\n    '
+            + "\n    ".join(rows)
+            + "\n  </ul>\n</div>"
+            for i, (title, rows) in enumerate(groups.items())
+        )
+
+        return f"""<!DOCTYPE html>
+<html lang="tr">
+<head>
+<meta charset="utf-8">
+<title>{html.escape(row['urun_ad'])} Fiyatları ve Özellikleri - epey</title>
+<style>.cell {{ display: inline-block; }}</style>
+<script>window.dataLayer = window.dataLayer || [];</script>
+</head>
+<body>
+<div class="ust"><a href="https://www.epey.com/">epey</a> &rsaquo; <a href="https://www.epey.com/akilli-telefonlar/">Akıllı Telefonlar</a></div>
+<h1>{html.escape(row['urun_ad'])}</h1>
+<div class="buyuk"><a href="#"><img src="https://cdn.epey.com/img/{slug}.jpg" alt="{html.escape(row['urun_ad'])}"></a></div>
+<div id="ozellikler">
+{sections}
+</div>
+<script>document.querySelectorAll('.cell').forEach(function (el) {{ el.title = ''; }});</script>
+</body>
+</html>
+"""
+
+    @staticmethod
+    def _list_item(row: pd.Series) -> str:
+        cells = [
+            f'<li class="adi cell"><a class="urunadi" href="{html.escape(row["urun_url"])}">'
+            f'{html.escape(row["urun_ad"])}</a></li>'
+        ]
+        if not pd.isna(row["urun_fiyat"]):
+            # 106999.00 → 106.999,00 TL
+            price = f"{float(row['urun_fiyat']):,.2f}".translate(str.maketrans(",.", ".,"))
+            cells.append(f'<li class="fiyat cell"><a href="{html.escape(row["urun_url"])}">{price} TL</a></li>')
+        if not pd.isna(row["urun_puan"]):
+            cells.append(f'<li class="puan cell"><div class="puan" data-text="{row["urun_puan"]}"></div></li>')
+
+        return '<ul class="metin row">\n  ' + "\n  ".join(cells) + "\n</ul>"
+
+    def list_page(self, rows: pd.DataFrame, page: int) -> str:
+        items = "\n".join(self._list_item(row) for _, row in rows.iterrows())
+        return f"""<!DOCTYPE html>
+<html lang="tr">
+<head>
+<meta charset="utf-8">
+<title>Akıllı Telefonlar - Sayfa {page} - epey</title>
+</head>
+<body>
+<div id="listele">
+{items}
+</div>
+</body>
+</html>
+"""
+
+    def build(self):
+        shutil.rmtree(self.fixture_dir, ignore_errors=True)
+
+        detail_dir = self.fixture_dir / "akilli-telefonlar"
+        image_dir = self.fixture_dir / "img"
+        detail_dir.mkdir(parents=True)
+        image_dir.mkdir(parents=True)
+
+        for i, (_, row) in enumerate(self.df.iterrows()):
+            path = Path(urlparse(row["urun_url"]).path)
+            (detail_dir / path.name).write_text(self.detail_page(row), encoding="utf-8")
+            Image.new("RGB", (8, 8), (i * 20 % 256, 80, 160)).save(image_dir / f"{path.stem}.jpg", "JPEG")
+
+        # EpeyPhoneScraper._build_sort_url adresleri: <sıralama>/ ve <sıralama>/<sayfa>/
+        sort_value = "tiklama:DESC"
+        payload = f'N;_s:{len(sort_value)}:"{sort_value}";'
+        sort_path = f"akilli-telefonlar/e/{base64.b64encode(payload.encode('utf-8')).decode('utf-8')}"
+        for start in range(0, len(self.df), self.PAGE_SIZE):
+            page = start // self.PAGE_SIZE + 1
+            page_dir = self.fixture_dir / sort_path / (str(page) if page > 1 else "")
+            page_dir.mkdir(parents=True, exist_ok=True)
+            (page_dir / "index.html").write_text(
+                self.list_page(self.df.iloc[start:start + self.PAGE_SIZE], page),
+                encoding="utf-8"
+            )
+
+        print(f"{len(self.df)} ürün, {page} liste sayfası: {self.fixture_dir}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--products", type=int, default=12)
+    args = parser.parse_args()
+
+    EpeyFixtureBuilder(n_products=args.products).build()
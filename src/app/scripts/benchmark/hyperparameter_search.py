@@ -0,0 +1,79 @@
+import argparse
+import os
+import sys
+import tempfile
+import pandas as pd
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[4]
+sys.path.append(str(BASE_DIR))
+
+from src.app.scripts.ai.hyperparameter_search import HyperparameterSearch
+from src.app.scripts.ai.xgboost_model_trainer import XGBoostModelTrainer
+
+FINAL_PATH = BASE_DIR / "src/app/output/dataset/final/final_dataset.csv"
+
+
+class HyperparameterSearchBenchmark:
+    """
+    Aynı trial seti için worker sayısına göre arama süresi ve pruning'in
+    kazandırdığı tur sayısı. Veri n_rows satıra örneklenir ki trial'lar
+    process açılışından belirgin şekilde uzun sürsün.
+    """
+
+    def __init__(self, n_rows: int = 50_000, n_trials: int = 16, workers=(1, 2, 4)):
+        self.n_trials = n_trials
+        self.workers = workers
+
+        trainer = XGBoostModelTrainer(
+            data_path=FINAL_PATH,
+            output_dir=Path(tempfile.mkdtemp()),
+            exclude_from_model=["urun_puan", "urun_id", "urun_ad"]
+        )
+        trainer.load_data()
+        trainer.df = trainer.df.sample(n=n_rows, replace=True, random_state=42).reset_index(drop=True)
+        trainer.prepare_features()
+        trainer.split_data()
+
+        self.data = (trainer.X_train, trainer.y_train, trainer.X_val, trainer.y_val)
+
+    def _search(self, strategy: str, workers: int, prune: bool = True) -> dict:
+        searcher = HyperparameterSearch(
+            strategy=strategy,
+            n_trials=self.n_trials,
+            workers=workers,
+            prune=prune
+        )
+        return searcher.run(*self.data)
+
+    def run(self):
+        print(f"{os.cpu_count()} çekirdek, {self.n_trials} trial")
+        print(
+            f"{'strategy':<9} {'workers':>7} {'nthread':>7} {'prune':>6} {'rounds':>7} "
+            f"{'pruned':>6} {'wall (s)':>9} {'speedup':>8} {'val RMSE':>9}"
+        )
+
+        rows = []
+        for strategy, prune in (("random", False), ("random", True), ("halving", True)):
+            baseline = None
+            for workers in self.workers:
+                result = self._search(strategy, workers, prune)
+                baseline = baseline or result["wall_seconds"]
+                rows.append(result)
+
+                print(
+                    f"{strategy:<9} {result['workers']:>7} {result['nthread']:>7} {str(prune):>6} "
+                    f"{result['rounds']:>7} {result['pruned']:>6} {result['wall_seconds']:>9.2f} "
+                    f"{baseline / result['wall_seconds']:>7.2f}x {result['val_rmse']:>9.5f}"
+                )
+
+        return pd.DataFrame(rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--trials", type=int, default=16)
+    args = parser.parse_args()
+
+    HyperparameterSearchBenchmark(n_rows=args.rows, n_trials=args.trials).run()
@@ -0,0 +1,85 @@
+import argparse
+import contextlib
+import io
+import shutil
+import sys
+import tempfile
+import time
+import numpy as np
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[4]
+sys.path.append(str(BASE_DIR))
+
+from src.app.scripts.ai.xgboost_model_trainer import XGBoostModelTrainer
+from src.app.scripts.dataset.dataset_io import read_dataset, write_dataset
+
+FINAL_PATH = BASE_DIR / "src/app/output/dataset/final/final_dataset.csv"
+
+
+class IncrementalUpdateBenchmark:
+    """
+    Gece yenilemesi: n_rows ürünle tam eğitilmiş modele new_rows yeni ürün
+    eklenir; XGBoostModelTrainer.update (warm-start) vs sıfırdan run.
+    Yeni ürünler veri setinden tekrar örneklenir (drift yok), urun_id'ler
+    benzersizdir.
+    """
+
+    def __init__(self, n_rows: int = 20_000, new_rows=(500, 1000, 4000)):
+        self.tmp_dir = Path(tempfile.mkdtemp())
+        self.new_rows = new_rows
+
+        df = read_dataset(FINAL_PATH)
+        df = df.sample(n=n_rows + max(new_rows), replace=True, random_state=42).reset_index(drop=True)
+        df["urun_id"] = np.arange(len(df)) + 1
+
+        self.n_rows = n_rows
+        self.df = df
+
+    def _trainer(self, data_path: Path, output_dir: Path) -> XGBoostModelTrainer:
+        return XGBoostModelTrainer(
+            data_path=data_path,
+            output_dir=output_dir,
+            target="urun_fiyat",
+            exclude_from_model=["urun_puan", "urun_id", "urun_ad"],
+        )
+
+    def _timed(self, fn):
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = fn()
+        return time.perf_counter() - start, result
+
+    def run(self):
+        base_path = self.tmp_dir / "base.csv"
+        write_dataset(self.df.iloc[:self.n_rows], base_path)
+
+        base_dir = self.tmp_dir / "base_model"
+        base_time, _ = self._timed(self._trainer(base_path, base_dir).run)
+        print(f"{self.n_rows} ürün, ilk tam eğitim {base_time:.2f} s")
+
+        print(f"{'new rows':>8} {'update (s)':>11} {'full (s)':>9} {'decision':>11} {'+trees':>7} {'held-out RMSE':>24}")
+        for n_new in self.new_rows:
+            data_path = self.tmp_dir / f"refresh_{n_new}.csv"
+            write_dataset(self.df.iloc[:self.n_rows + n_new], data_path)
+
+            # Her senaryo aynı başlangıç modelinden
+            model_dir = self.tmp_dir / f"update_{n_new}"
+            shutil.copytree(base_dir, model_dir)
+
+            update_time, result = self._timed(self._trainer(data_path, model_dir).update)
+            full_time, _ = self._timed(self._trainer(data_path, self.tmp_dir / f"full_{n_new}").run)
+
+            rmse = f"{result['baseline_rmse']:.6f} → {result.get('warm_rmse', float('nan')):.6f}"
+            print(
+                f"{n_new:>8} {update_time:>11.2f} {full_time:>9.2f} {result['decision']:>11} "
+                f"{result.get('added_trees', 0):>7} {rmse:>24}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=20_000)
+    args = parser.parse_args()
+
+    IncrementalUpdateBenchmark(n_rows=args.rows).run()
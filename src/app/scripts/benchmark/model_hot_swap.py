@@ -0,0 +1,160 @@
+import argparse
+import json
+import sys
+import tempfile
+import threading
+import time
+import joblib
+import numpy as np
+import xgboost as xgb
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[4]
+sys.path.append(str(BASE_DIR))
+
+from src.app.scripts.catalog_store import STATE_PATH, CatalogStore
+from src.app.scripts.dataset.dataset_io import read_dataset
+from src.app.scripts.model_bundle import ModelBundle, write_bundle
+from src.app.scripts.predict_service import TASKS, PredictService
+
+DATA_DIR = BASE_DIR / "src/app/output/dataset"
+SAMPLE_PATH = DATA_DIR / "processed/step4_numeric_cleaned.csv"
+
+
+class ModelHotSwapBenchmark:
+    """
+    1) Yükleme süresi: joblib pickle vs native JSON vs checksum'lı UBJSON bundle
+    2) Hot-swap: thread'ler sürekli predict_many çağırırken versiyonlar
+       yayınlanır, ModelRegistry.watch gibi bir thread refresh ile
+       değiştirir. Hata sayısı, gecikme ve her cevabın yayınlanmış
+       versiyonlardan birinin tahminine eşit olduğu ölçülür.
+    """
+
+    def __init__(self, task: str = "price", threads: int = 4, swaps: int = 10, repeat: int = 20):
+        self.task = task
+        self.target = TASKS[task]["target"]
+        self.source_dir = TASKS[task]["model_dir"]
+        self.threads = threads
+        self.swaps = swaps
+        self.repeat = repeat
+        self.tmp_dir = Path(tempfile.mkdtemp())
+
+        self.booster = xgb.Booster()
+        self.booster.load_model(self.source_dir / f"xgboost_{self.target}_model.json")
+
+        with open(self.source_dir / "model_features.json", "r", encoding="utf-8") as f:
+            self.features = json.load(f)
+
+    def _timed(self, fn) -> float:
+        start = time.perf_counter()
+        for _ in range(self.repeat):
+            fn()
+        return (time.perf_counter() - start) / self.repeat * 1000
+
+    def loading(self):
+        bundle_dir = self.tmp_dir / "load"
+        version = write_bundle(bundle_dir, self.booster, self.features, {}, self.target, state_path=STATE_PATH)
+
+        pickle_path = self.source_dir / f"xgboost_{self.target}_model.pkl"
+        json_path = self.source_dir / f"xgboost_{self.target}_model.json"
+        ubj_path = bundle_dir / "versions" / version / "model.ubj"
+
+        def load_json():
+            xgb.Booster().load_model(json_path)
+
+        rows = [
+            ("joblib pickle", pickle_path, self._timed(lambda: joblib.load(pickle_path))),
+            ("native JSON", json_path, self._timed(load_json)),
+            ("UBJSON bundle", ubj_path, self._timed(lambda: ModelBundle.load(bundle_dir))),
+        ]
+
+        print(f"{'format':<14} {'size (KB)':>10} {'load (ms)':>10}")
+        for name, path, ms in rows:
+            print(f"{name:<14} {path.stat().st_size / 1024:>10.1f} {ms:>10.2f}")
+
+    def hot_swap(self):
+        model_dir = self.tmp_dir / "swap"
+        # Versiyonlar farklı ağaç sayılı kopyalar; tahminleri birbirinden ayrılır
+        rounds = self.booster.num_boosted_rounds()
+        boosters = [self.booster[: max(1, rounds * (i + 1) // self.swaps)] for i in range(self.swaps)]
+        for booster in boosters:
+            booster.set_attr(best_iteration=None)
+
+        write_bundle(model_dir, boosters[0], self.features, {}, self.target, state_path=STATE_PATH, keep=self.swaps)
+
+        service = PredictService(self.task, store=CatalogStore.shared(), model_dir=model_dir)
+        records = read_dataset(SAMPLE_PATH).head(50).to_dict("records")
+
+        responses = {}
+        errors = []
+        latencies = []
+        seen = set()
+        stop = threading.Event()
+
+        def client():
+            while not stop.is_set():
+                start = time.perf_counter()
+                try:
+                    active = service.active
+                    result = service.predict_many(records)
+                except Exception as e:
+                    errors.append(repr(e))
+                    continue
+                latencies.append((time.perf_counter() - start) * 1000)
+                seen.add(active.version)
+                key = tuple(np.round(result, 2))
+                responses[key] = responses.get(key, 0) + 1
+
+        def watcher():
+            while not stop.wait(0.05):
+                service.refresh()
+
+        workers = [threading.Thread(target=client) for _ in range(self.threads)]
+        workers.append(threading.Thread(target=watcher))
+        for worker in workers:
+            worker.start()
+
+        published = []
+        for booster in boosters[1:]:
+            time.sleep(0.3)
+            published.append(write_bundle(model_dir, booster, self.features, {}, self.target, state_path=STATE_PATH, keep=self.swaps))
+            # Aynı saniyede yayınlanan versiyonların adları ayrışsın
+            time.sleep(1.0)
+
+        time.sleep(0.3)
+        stop.set()
+        for worker in workers:
+            worker.join()
+
+        # Her cevap yayınlanmış versiyonlardan birinin tam tahminine eşit olmalı
+        X = service.active.encoder.encode_many(records)
+        valid = {
+            tuple(np.round(np.expm1(booster.inplace_predict(X)).astype(float), 2))
+            for booster in boosters
+        }
+        unexpected = sum(count for key, count in responses.items() if key not in valid)
+
+        latencies = np.array(latencies)
+        print(
+            f"\n{self.threads} thread, {len(published)} swap: {len(latencies)} istek, "
+            f"{len(errors)} hata, {unexpected} tutarsız cevap, {len(seen)} versiyon görüldü, "
+            f"son versiyon aktif: {service.version == published[-1]}"
+        )
+        print(
+            f"gecikme p50 {np.percentile(latencies, 50):.2f} ms, "
+            f"p99 {np.percentile(latencies, 99):.2f} ms, max {latencies.max():.2f} ms"
+        )
+
+    def run(self):
+        self.loading()
+        self.hot_swap()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--task", choices=list(TASKS), default="price")
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--swaps", type=int, default=10)
+    args = parser.parse_args()
+
+    ModelHotSwapBenchmark(task=args.task, threads=args.threads, swaps=args.swaps).run()
@@ -0,0 +1,101 @@
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[4]
+sys.path.append(str(BASE_DIR))
+
+from src.app.scripts.ai.multi_target_trainer import MultiTargetTrainer
+from src.app.scripts.ai.xgboost_model_trainer import XGBoostModelTrainer
+from src.app.scripts.dataset.dataset_io import read_dataset, write_dataset
+
+FINAL_PATH = BASE_DIR / "src/app/output/dataset/final/final_dataset.csv"
+
+TARGETS = {"urun_fiyat": "price", "urun_puan": "point"}
+EXCLUDE = ["urun_id", "urun_ad"]
+
+
+class MultiTargetTrainingBenchmark:
+    """
+    Fiyat + puan eğitimi: iki ayrı XGBoostModelTrainer.run (her biri veriyi
+    okur, böler, sketch hesaplar) vs MultiTargetTrainer (tek yükleme, tek
+    sketch, eşzamanlı booster'lar). Modellerin birebir aynı olduğu doğrulanır.
+    """
+
+    def __init__(self, n_rows: int | None = None):
+        self.tmp_dir = Path(tempfile.mkdtemp())
+        self.data_path = FINAL_PATH
+
+        if n_rows:
+            df = read_dataset(FINAL_PATH)
+            df = df.sample(n=n_rows, replace=True, random_state=42).reset_index(drop=True)
+            self.data_path = self.tmp_dir / "final_dataset.csv"
+            write_dataset(df, self.data_path)
+
+    def sequential(self) -> tuple[float, dict]:
+        models = {}
+        start = time.perf_counter()
+
+        for target, name in TARGETS.items():
+            trainer = XGBoostModelTrainer(
+                data_path=self.data_path,
+                output_dir=self.tmp_dir / "sequential" / name,
+                target=target,
+                exclude_from_model=[t for t in TARGETS if t != target] + EXCLUDE,
+            )
+            trainer.run()
+            models[target] = trainer.model
+
+        return time.perf_counter() - start, models
+
+    def joint(self) -> tuple[float, dict, dict]:
+        trainer = MultiTargetTrainer(
+            data_path=self.data_path,
+            targets={target: self.tmp_dir / "joint" / name for target, name in TARGETS.items()},
+            exclude_from_model=EXCLUDE,
+        )
+
+        start = time.perf_counter()
+        timings = trainer.run()
+        elapsed = time.perf_counter() - start
+
+        return elapsed, {t: tr.model for t, tr in trainer.trainers.items()}, timings
+
+    def run(self):
+        # Pipeline çıktıları tabloyu bölmesin
+        with contextlib.redirect_stdout(io.StringIO()):
+            sequential_time, sequential_models = self.sequential()
+            joint_time, joint_models, timings = self.joint()
+
+        print(f"{os.cpu_count()} çekirdek, veri: {self.data_path.name}")
+        print(f"{'mode':<12} {'wall (s)':>9}")
+        print(f"{'sequential':<12} {sequential_time:>9.2f}")
+        print(f"{'joint':<12} {joint_time:>9.2f}")
+        print(
+            f"Kazanç: {sequential_time - joint_time:.2f} s "
+            f"({sequential_time / joint_time:.2f}x)"
+        )
+        print(
+            f"Joint dağılım: hazırlık {timings['prepare']:.2f} s, quantize {timings['quantize']:.2f} s, "
+            f"eğitim {timings['train']:.2f} s, hedef başına {timings['per_target']}"
+        )
+
+        for target in TARGETS:
+            same = (
+                sequential_models[target].get_booster().save_raw("json")
+                == joint_models[target].get_booster().save_raw("json")
+            )
+            print(f"{target}: aynı model = {same}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=None)
+    args = parser.parse_args()
+
+    MultiTargetTrainingBenchmark(n_rows=args.rows).run()
@@ -0,0 +1,96 @@
+import sys
+import time
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[4]
+sys.path.append(str(BASE_DIR))
+
+from src.app.scripts.dataset.dataset_io import read_dataset
+from src.app.scripts.dataset.dataset_processor import ProductDataPreprocessor
+
+STEP3_PATH = BASE_DIR / "src/app/output/dataset/processed/step3_log_targets.csv"
+
+
+class NumericCleaningBenchmark:
+    """
+    step4 numeric cleaning: satır satır apply(extract_numeric) vs
+    extract_numeric_series
+    - parity: step3_log_targets.csv kolonları ve bilinen edge case'ler
+    - benchmark: 1M satırlık sentetik kolonlar
+    """
+
+    EDGE_CASES = [
+        "2.697.900 Puan", " 6.1 İnç ", "1.2.3", "..5", ".5", "1.", "12.0 mm",
+        "abc", "", None, np.nan, pd.NA, 6.1, 5, "1e-05", "٣ GB",
+    ]
+
+    def __init__(self, n_rows: int = 1_000_000, seed: int = 42):
+        self.n_rows = n_rows
+        self.rng = np.random.default_rng(seed)
+        self.df = read_dataset(STEP3_PATH)
+
+    @staticmethod
+    def _row_wise(series: pd.Series) -> pd.Series:
+        return series.apply(ProductDataPreprocessor.extract_numeric)
+
+    def check_parity(self) -> int:
+        columns = {
+            col: self.df[col]
+            for col in ProductDataPreprocessor.NUMERIC_COLUMNS
+            if col in self.df.columns
+        }
+        columns["edge_cases"] = pd.Series(self.EDGE_CASES, dtype=object)
+
+        mismatches = 0
+        for name, series in columns.items():
+            try:
+                pd.testing.assert_series_equal(
+                    self._row_wise(series),
+                    ProductDataPreprocessor.extract_numeric_series(series)
+                )
+            except AssertionError as e:
+                mismatches += 1
+                print(f"❌ {name}: {e}")
+
+        print(f"Parity: {len(columns)} kolon, {mismatches} farklı")
+        return mismatches
+
+    def _synthetic(self) -> dict[str, pd.Series]:
+        antutu = self.df["temel_donanim_antutu_puanı_v10"].dropna()
+
+        return {
+            # Katalogdaki değer dağılımı (düşük kardinalite)
+            "catalog_sample": antutu.sample(
+                self.n_rows, replace=True, random_state=42
+            ).reset_index(drop=True),
+            # Her satır farklı (en kötü durum)
+            "unique_values": pd.Series([
+                f"{n // 1_000_000}.{n // 1000 % 1000:03d}.{n % 1000:03d} Puan"
+                for n in self.rng.integers(0, 3_000_000, self.n_rows)
+            ]),
+        }
+
+    def run(self):
+        self.check_parity()
+
+        print(f"{'data':<16} {'apply (s)':>10} {'vector (s)':>11} {'speedup':>8}")
+        for name, series in self._synthetic().items():
+            start = time.perf_counter()
+            self._row_wise(series)
+            row_wise = time.perf_counter() - start
+
+            start = time.perf_counter()
+            ProductDataPreprocessor.extract_numeric_series(series)
+            vectorized = time.perf_counter() - start
+
+            print(
+                f"{name:<16} {row_wise:>10.3f} {vectorized:>11.3f} "
+                f"{row_wise / vectorized:>7.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    benchmark = NumericCleaningBenchmark()
+    benchmark.run()
@@ -0,0 +1,115 @@
+import argparse
+import sys
+import tempfile
+import time
+import pandas as pd
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[4]
+sys.path.append(str(BASE_DIR))
+
+from src.app.scripts.dataset.dataset_io import read_dataset
+from src.app.scripts.dataset.dataset_processor import ProductDataPreprocessor
+
+STEP3_PATH = BASE_DIR / "src/app/output/dataset/processed/step3_log_targets.csv"
+
+
+class WideProcessor(ProductDataPreprocessor):
+    """
+    Genişletilmiş kolon listeleriyle çalışan, snapshot yazmayan processor.
+    Worker'lara pickle ile referansı gidebilmesi için modül seviyesinde.
+    """
+
+    def save_process_step(self, filename):
+        pass
+
+
+def widen(df: pd.DataFrame, n_rows: int, copies: int) -> tuple[pd.DataFrame, list, list]:
+    """
+    step3 çıktısını n_rows satıra örnekler, numeric ve binary kolonları
+    copies kez çoğaltır
+    """
+    df = df.sample(n=n_rows, replace=True, random_state=42).reset_index(drop=True)
+
+    numeric = [c for c in ProductDataPreprocessor.NUMERIC_COLUMNS if c in df.columns]
+    binary = [c for c in dict.fromkeys(ProductDataPreprocessor.BINARY_COLUMNS) if c in df.columns]
+
+    extra = {}
+    for i in range(1, copies):
+        for col in numeric + binary:
+            extra[f"{col}_{i}"] = df[col]
+
+    wide = pd.concat([df, pd.DataFrame(extra)], axis=1)
+    numeric_columns = numeric + [f"{c}_{i}" for i in range(1, copies) for c in numeric]
+    binary_columns = binary + [f"{c}_{i}" for i in range(1, copies) for c in binary]
+
+    return wide, numeric_columns, binary_columns
+
+
+class ParallelColumnsBenchmark:
+    """
+    step4-6 kolon işleri: seri döngü vs 1/2/4/8 worker'lı process havuzu.
+    Her worker sayısında çıktının seri çalışmayla aynı olduğu doğrulanır.
+    """
+
+    def __init__(self, n_rows: int = 200_000, copies: int = 8, workers=(1, 2, 4, 8)):
+        self.workers = workers
+        self.df, numeric, binary = widen(read_dataset(STEP3_PATH), n_rows, copies)
+
+        WideProcessor.NUMERIC_COLUMNS = numeric
+        WideProcessor.BINARY_COLUMNS = binary
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def _processor(self, workers: int) -> ProductDataPreprocessor:
+        return WideProcessor(
+            input_path="",
+            processed_dir=self.tmp_dir,
+            output_dir=self.tmp_dir,
+            workers=workers,
+        )
+
+    def _measure(self, workers: int) -> tuple[float, pd.DataFrame]:
+        processor = self._processor(workers)
+
+        # Havuz açılışı ölçüme dahil edilmez
+        if workers > 1:
+            processor.df = self.df.head(100).copy()
+            processor.step4_numeric_cleaning()
+
+        processor.df = self.df.copy()
+
+        start = time.perf_counter()
+        processor.step4_numeric_cleaning()
+        processor.step5_binary_mapping()
+        processor.step6_handle_missing()
+        elapsed = time.perf_counter() - start
+
+        processor.close_workers()
+        return elapsed, processor.df
+
+    def run(self):
+        print(f"Veri: {self.df.shape[0]} satır, {self.df.shape[1]} kolon")
+        print(f"{'workers':>8} {'time (s)':>10} {'speedup':>8} {'identical':>10}")
+
+        baseline, expected = self._measure(1)
+        for workers in self.workers:
+            if workers == 1:
+                elapsed, result = baseline, expected
+            else:
+                elapsed, result = self._measure(workers)
+
+            identical = result.equals(expected) and (result.dtypes == expected.dtypes).all()
+            print(
+                f"{workers:>8} {elapsed:>10.3f} "
+                f"{baseline / elapsed:>7.2f}x {str(identical):>10}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--copies", type=int, default=8)
+    args = parser.parse_args()
+
+    benchmark = ParallelColumnsBenchmark(n_rows=args.rows, copies=args.copies)
+    benchmark.run()
@@ -0,0 +1,75 @@
+import sys
+import time
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[4]
+sys.path.append(str(BASE_DIR))
+
+from src.app.scripts.dataset.dataset_io import read_dataset
+from src.app.scripts.predict_service import PredictService, DATA_PATH, TARGET_COLUMNS
+
+
+class PredictLatencyBenchmark:
+    """
+    Tekli tahmin gecikmesi: pandas preprocessing yolu vs compiled encoder yolu
+    """
+
+    def __init__(self, task: str = "price", n_requests: int = 500, warmup: int = 20):
+        self.service = PredictService(task=task)
+        self.n_requests = n_requests
+        self.warmup = warmup
+
+        catalog = read_dataset(DATA_PATH).drop(columns=TARGET_COLUMNS)
+        self.records = catalog.sample(
+            n=n_requests,
+            replace=True,
+            random_state=42
+        ).to_dict(orient="records")
+
+    @staticmethod
+    def _percentiles(latencies: list[float]) -> dict:
+        arr = np.array(latencies) * 1000
+        return {
+            "p50": np.percentile(arr, 50),
+            "p99": np.percentile(arr, 99),
+            "mean": arr.mean()
+        }
+
+    def _measure(self, fn) -> dict:
+        for record in self.records[:self.warmup]:
+            fn(record)
+
+        latencies = []
+        for record in self.records:
+            start = time.perf_counter()
+            fn(record)
+            latencies.append(time.perf_counter() - start)
+
+        return self._percentiles(latencies)
+
+    def run(self):
+        results = {
+            "pandas": self._measure(
+                lambda r: self.service.predict(pd.DataFrame([r]))
+            ),
+            "compiled": self._measure(self.service.predict_record),
+        }
+
+        print(f"{'path':<10} {'p50 (ms)':>10} {'p99 (ms)':>10} {'mean (ms)':>10}")
+        for name, stats in results.items():
+            print(
+                f"{name:<10} {stats['p50']:>10.3f} "
+                f"{stats['p99']:>10.3f} {stats['mean']:>10.3f}"
+            )
+
+        speedup = results["pandas"]["p50"] / results["compiled"]["p50"]
+        print(f"p50 speedup: {speedup:.1f}x")
+
+        return results
+
+
+if __name__ == "__main__":
+    benchmark = PredictLatencyBenchmark(task="price")
+    benchmark.run()
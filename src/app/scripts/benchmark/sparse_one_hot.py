@@ -0,0 +1,105 @@
+import argparse
+import sys
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[4]
+sys.path.append(str(BASE_DIR))
+
+from src.app.scripts.dataset.dataset_io import memory_mb, read_dataset
+from src.app.scripts.dataset.dataset_processor import ProductDataPreprocessor
+
+STEP6_PATH = BASE_DIR / "src/app/output/dataset/processed/step6_missing_handled.csv"
+
+
+class SparseOneHotBenchmark:
+    """
+    Kategorik spec sayısı arttıkça step7 + eğitim: dense vs sparse encoding.
+    step6 çıktısına 20 kategorili sentetik kolonlar eklenir; dense tablo
+    belleği kolon sayısıyla, CSR belleği non-zero sayısıyla büyür.
+    """
+
+    def __init__(self, n_rows: int = 20_000, extra_columns=(0, 50, 200, 800), rounds: int = 50):
+        self.extra_columns = extra_columns
+        self.rounds = rounds
+        self.tmp_dir = tempfile.mkdtemp()
+
+        base = read_dataset(STEP6_PATH)
+        self.base = base.sample(n=n_rows, replace=True, random_state=42).reset_index(drop=True)
+
+    def _frame(self, n_extra: int) -> pd.DataFrame:
+        rng = np.random.default_rng(42)
+        extra = {
+            f"spec_{i}": rng.choice([f"v{j}" for j in range(20)], size=len(self.base))
+            for i in range(n_extra)
+        }
+        return pd.concat([self.base, pd.DataFrame(extra, dtype=object)], axis=1)
+
+    def _measure(self, df: pd.DataFrame, encoding: str) -> dict:
+        processor = ProductDataPreprocessor(
+            input_path="",
+            processed_dir=self.tmp_dir,
+            output_dir=self.tmp_dir,
+            snapshots="none",
+            encoding=encoding,
+        )
+        processor.save_process_step = lambda filename: None
+        processor.df = df.copy()
+
+        start = time.perf_counter()
+        processor.step7_one_hot()
+        matrix, columns, labels = processor.to_sparse(processor.df)
+        encode_time = time.perf_counter() - start
+
+        X = matrix if encoding == "sparse" else matrix.toarray()
+        frame_mb = memory_mb(processor.df)
+        matrix_mb = (
+            (matrix.data.nbytes + matrix.indices.nbytes + matrix.indptr.nbytes) / 1024 ** 2
+            if encoding == "sparse" else X.nbytes / 1024 ** 2
+        )
+
+        model = xgb.XGBRegressor(n_estimators=self.rounds, max_depth=6, tree_method="hist", random_state=42)
+        start = time.perf_counter()
+        model.fit(X, labels["urun_fiyat"])
+        train_time = time.perf_counter() - start
+
+        return {
+            "columns": len(columns),
+            "nnz": matrix.nnz,
+            "frame_mb": frame_mb,
+            "matrix_mb": matrix_mb,
+            "encode": encode_time,
+            "train": train_time,
+            "pred": model.predict(X[:100]),
+        }
+
+    def run(self):
+        print(
+            f"{'extra':>6} {'encoding':>8} {'cols':>6} {'nnz':>10} {'frame MB':>9} "
+            f"{'matrix MB':>10} {'step7 (s)':>10} {'train (s)':>10} {'same pred':>10}"
+        )
+
+        for n_extra in self.extra_columns:
+            df = self._frame(n_extra)
+            results = {encoding: self._measure(df, encoding) for encoding in ("dense", "sparse")}
+            same = np.allclose(results["dense"]["pred"], results["sparse"]["pred"])
+
+            for encoding, r in results.items():
+                print(
+                    f"{n_extra:>6} {encoding:>8} {r['columns']:>6} {r['nnz']:>10} "
+                    f"{r['frame_mb']:>9.1f} {r['matrix_mb']:>10.1f} "
+                    f"{r['encode']:>10.2f} {r['train']:>10.2f} {str(same):>10}"
+                )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--rounds", type=int, default=50)
+    args = parser.parse_args()
+
+    SparseOneHotBenchmark(n_rows=args.rows, rounds=args.rounds).run()
@@ -0,0 +1,129 @@
+import ast
+import inspect
+import sys
+import tempfile
+import textwrap
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[4]
+sys.path.append(str(BASE_DIR))
+
+from src.app.scripts.dataset.dataset_processor import ProductDataPreprocessor
+
+RAW_PATH = BASE_DIR / "src/app/output/dataset/raw/raw_dataset.csv"
+
+
+def _edited(*args, **kwargs):
+    # Yardımcının düzenlenmiş hali: kaynak kodu orijinalinden farklı
+    raise AssertionError("çağrılmamalı")
+
+
+class StageCacheCheck:
+    """
+    Adım cache anahtarlarının kontrolü: her adımın (dolaylı olarak) çağırdığı
+    yardımcı metodlar kaynaktan bulunur; biri değiştirildiğinde o adımın ve
+    sonraki tüm adımların anahtarı değişmeli, önceki adımlarınki aynı kalmalı.
+    """
+
+    # Çıktıyı etkilemeyen (snapshot, executor) ya da yalnızca predict modunda
+    # çalışan yardımcılar; cache yalnızca train modunda kullanılır
+    IGNORED = {
+        "save_process_step", "_write_snapshot", "_column_executor",
+        "_apply_missing_state", "_apply_one_hot_state",
+    }
+
+    def __init__(self):
+        self.tmp_dir = Path(tempfile.mkdtemp())
+
+    @staticmethod
+    def _is_helper(name: str) -> bool:
+        try:
+            value = inspect.getattr_static(ProductDataPreprocessor, name)
+        except AttributeError:
+            return False
+        return inspect.isfunction(value) or isinstance(value, (staticmethod, classmethod))
+
+    def helpers(self, method: str) -> set[str]:
+        """
+        method'un self./cls./ProductDataPreprocessor. üzerinden eriştiği
+        yardımcılar, onların eriştikleri de dahil
+        """
+        found = set()
+        pending = [method]
+
+        while pending:
+            value = inspect.getattr_static(ProductDataPreprocessor, pending.pop())
+            func = value.__func__ if isinstance(value, (staticmethod, classmethod)) else value
+            tree = ast.parse(textwrap.dedent(inspect.getsource(func)))
+
+            for node in ast.walk(tree):
+                if (
+                    isinstance(node, ast.Attribute)
+                    and isinstance(node.value, ast.Name)
+                    and node.value.id in ("self", "cls", "ProductDataPreprocessor")
+                    and node.attr not in self.IGNORED
+                    and node.attr not in found
+                    and self._is_helper(node.attr)
+                ):
+                    found.add(node.attr)
+                    pending.append(node.attr)
+
+        found.discard(method)
+        return found
+
+    def _keys(self, cls) -> list[str]:
+        processor = cls(
+            input_path=str(RAW_PATH),
+            processed_dir=str(self.tmp_dir / "processed"),
+            output_dir=str(self.tmp_dir / "final"),
+        )
+        return processor._stage_keys()
+
+    def _edited_keys(self, name: str) -> list[str]:
+        original = inspect.getattr_static(ProductDataPreprocessor, name)
+        if isinstance(original, staticmethod):
+            replacement = staticmethod(_edited)
+        elif isinstance(original, classmethod):
+            replacement = classmethod(_edited)
+        else:
+            replacement = _edited
+
+        edited = type("EditedPreprocessor", (ProductDataPreprocessor,), {name: replacement})
+        return self._keys(edited)
+
+    def run(self) -> bool:
+        baseline = self._keys(ProductDataPreprocessor)
+        failures = []
+
+        for i, (method, _, dependencies) in enumerate(ProductDataPreprocessor.STAGES):
+            helpers = self.helpers(method)
+
+            missing = sorted(helpers - set(dependencies))
+            if missing:
+                failures.append(f"{method}: bağımlılıklarda eksik {missing}")
+
+            for name in sorted(helpers | {method}):
+                keys = self._edited_keys(name)
+
+                if keys[:i] != baseline[:i]:
+                    failures.append(f"{name} düzenlendi: {method} öncesi adımlar geçersizleşti")
+
+                stale = [
+                    stage for (stage, _, _), old, new
+                    in zip(ProductDataPreprocessor.STAGES[i:], baseline[i:], keys[i:])
+                    if old == new
+                ]
+                if stale:
+                    failures.append(f"{name} düzenlendi: {stale} cache'ten okunur (stale)")
+
+            print(f"{method:<24} {', '.join(sorted(helpers)) or '-'}")
+
+        for failure in failures:
+            print("HATA:", failure)
+        print("Cache anahtarları tutarlı" if not failures else f"{len(failures)} hata")
+
+        return not failures
+
+
+if __name__ == "__main__":
+    sys.exit(0 if StageCacheCheck().run() else 1)
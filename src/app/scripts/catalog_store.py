@@ -0,0 +1,94 @@
+import hashlib
+import json
+import threading
+from pathlib import Path
+
+from .dataset.dataset_io import compact_dtypes, read_dataset
+from .dataset.dataset_processor import ProductDataPreprocessor
+from .product_index import ProductCatalog
+from .similarity_index import SimilarityIndex
+
+BASE_DIR = Path(__file__).resolve().parents[3]
+MODEL_DIR = BASE_DIR / "src/app/output/model"
+DATA_PATH = BASE_DIR / "src/app/output/dataset/processed/step4_numeric_cleaned.csv"
+STATE_PATH = (
+    BASE_DIR / "src/app/output/dataset/final" / ProductDataPreprocessor.STATE_FILENAME
+)
+FINAL_DATA_PATH = BASE_DIR / "src/app/output/dataset/final/final_dataset.csv"
+SIMILARITY_INDEX_DIR = MODEL_DIR / "similarity"
+
+
+class CatalogStore:
+    """
+    API sürecindeki tüm task'ların paylaştığı, tek sefer yüklenen ürün tablosu:
+    - df: kompakt kolonlu katalog (string kolonlar category, numericler float32)
+    - products: JSON-safe kayıtlar ve en yakın ürün indexleri
+    - state: preprocessor_state.json
+    - similarity: feature listesi başına BallTree index'i
+    """
+
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(
+        self,
+        data_path: Path = DATA_PATH,
+        state_path: Path = STATE_PATH,
+        final_data_path: Path = FINAL_DATA_PATH,
+        similarity_index_dir: Path = SIMILARITY_INDEX_DIR,
+    ):
+        self.data_path = Path(data_path)
+        self.state_path = Path(state_path)
+        self.final_data_path = Path(final_data_path)
+        self.similarity_index_dir = Path(similarity_index_dir)
+
+        self._lock = threading.Lock()
+
+        self.load()
+
+    @classmethod
+    def shared(cls) -> "CatalogStore":
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    # =====================================
+    # LOAD
+    # =====================================
+
+    def load(self):
+        df = read_dataset(self.data_path)
+
+        # Kayıtlar ham değerlerden üretilir, sonra tablo kompakt hale gelir
+        self.products = ProductCatalog(df)
+        self.df = compact_dtypes(df, exclude=ProductCatalog.LOG_COLUMNS)
+
+        with open(self.state_path, "r", encoding="utf-8") as f:
+            self.state = json.load(f)
+
+        self._similarity = {}
+
+    # =====================================
+    # SIMILARITY
+    # =====================================
+
+    def similarity_index(self, features: list[str]) -> SimilarityIndex:
+        """
+        Aynı feature listesini kullanan task'lar aynı index'i paylaşır
+        """
+        key = tuple(features)
+
+        with self._lock:
+            if key not in self._similarity:
+                digest = hashlib.sha256(
+                    json.dumps(features).encode("utf-8")
+                ).hexdigest()[:12]
+
+                self._similarity[key] = SimilarityIndex.load_or_build(
+                    self.similarity_index_dir / f"similarity_index_{digest}.joblib",
+                    self.final_data_path,
+                    features
+                )
+
+            return self._similarity[key]
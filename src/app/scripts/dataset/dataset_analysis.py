@@ -1,8 +1,14 @@
+import sys
 import pandas as pd
 import numpy as np
 from pathlib import Path
 from datetime import datetime
 
+BASE_DIR = Path(__file__).resolve().parents[4]
+sys.path.append(str(BASE_DIR))
+
+from src.app.scripts.dataset.dataset_io import read_dataset
+
 
 class DatasetAnalyzer:
     """
@@ -108,12 +114,12 @@ class DatasetAnalyzer:
     def run(self):
 
         # RAW
-        raw_df = pd.read_csv(self.raw_path)
+        raw_df = read_dataset(self.raw_path)
         raw_report = self._analyze(raw_df, "Raw")
         self._save_report(raw_report, "raw_dataset_analysis.txt")
 
         # FINAL
-        final_df = pd.read_csv(self.final_path)
+        final_df = read_dataset(self.final_path)
         final_report = self._analyze(final_df, "Final")
         self._save_report(final_report, "final_dataset_analysis.txt")
 
@@ -1,11 +1,218 @@
 import cloudscraper
 from bs4 import BeautifulSoup
+from lxml import etree
 import pandas as pd
 import time
 import random
 import base64
+import csv
+import hashlib
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urljoin
 from pathlib import Path
+from typing import Iterator
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket rate limiter.
+    Tüm worker'lar için global olarak saniyede en fazla `rate` istek,
+    en fazla `capacity` kadar ani (burst) istek.
+    """
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(
+                    self.capacity,
+                    self.tokens + (now - self.updated) * self.rate
+                )
+                self.updated = now
+
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+
+                wait = (1 - self.tokens) / self.rate
+
+            time.sleep(wait)
+
+
+class HttpCache:
+    """
+    URL bazlı kalıcı response cache'i.
+    Her URL için gövde (<key>.body) ve meta (<key>.json: etag, last_modified,
+    sha256, encoding, fetched_at) saklanır; tekrar isteklerde ETag /
+    Last-Modified ile koşullu GET yapılır.
+    """
+
+    def __init__(self, cache_dir: str | Path, max_age: float | None = None):
+        """
+        max_age: saniye; bu süreden yeni kayıtlar için hiç istek atılmaz
+        (None → her seferinde koşullu GET ile doğrulanır)
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_age = max_age
+
+    # =====================================
+    # HELPERS
+    # =====================================
+
+    @staticmethod
+    def _key(url: str) -> str:
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    def _paths(self, url: str) -> tuple[Path, Path]:
+        key = self._key(url)
+        return self.cache_dir / f"{key}.body", self.cache_dir / f"{key}.json"
+
+    @staticmethod
+    def _atomic_write(path: Path, data: bytes):
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    # =====================================
+    # READ
+    # =====================================
+
+    def meta(self, url: str) -> dict | None:
+        body_path, meta_path = self._paths(url)
+        if not meta_path.exists() or not body_path.exists():
+            return None
+
+        with open(meta_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def is_fresh(self, meta: dict | None) -> bool:
+        return (
+            meta is not None
+            and self.max_age is not None
+            and time.time() - meta["fetched_at"] < self.max_age
+        )
+
+    def conditional_headers(self, meta: dict | None) -> dict:
+        headers = {}
+        if meta:
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+        return headers
+
+    def body(self, url: str) -> bytes:
+        body_path, _ = self._paths(url)
+        return body_path.read_bytes()
+
+    def text(self, url: str, meta: dict) -> str:
+        return self.body(url).decode(meta["encoding"] or "utf-8", errors="replace")
+
+    # =====================================
+    # WRITE
+    # =====================================
+
+    def store(self, url: str, response) -> dict:
+        body_path, meta_path = self._paths(url)
+
+        meta = {
+            "url": url,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "sha256": hashlib.sha256(response.content).hexdigest(),
+            "encoding": response.encoding or response.apparent_encoding,
+            "fetched_at": time.time(),
+        }
+
+        self._atomic_write(body_path, response.content)
+        self._atomic_write(
+            meta_path,
+            json.dumps(meta, ensure_ascii=False).encode("utf-8")
+        )
+
+        return meta
+
+    def touch(self, url: str, meta: dict) -> dict:
+        """
+        304 sonrası kaydın doğrulanma zamanını günceller
+        """
+        _, meta_path = self._paths(url)
+        meta = {**meta, "fetched_at": time.time()}
+        self._atomic_write(
+            meta_path,
+            json.dumps(meta, ensure_ascii=False).encode("utf-8")
+        )
+        return meta
+
+
+class JsonlSink:
+    """
+    Parse edilen ürünleri geldiği anda JSON Lines dosyasına ekleyen akış.
+    Her satır yazıldığı anda flush edilir; dosya scraping sürerken de
+    okunabilir. Geniş kolon birleşimi sonradan (columns / to_csv) hesaplanır.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self._file = None
+
+    def __enter__(self) -> "JsonlSink":
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "w", encoding="utf-8")
+        return self
+
+    def __exit__(self, *exc):
+        self._file.close()
+        self._file = None
+
+    def write(self, row: dict):
+        self._file.write(json.dumps(row, ensure_ascii=False) + "\n")
+        self._file.flush()
+
+    @staticmethod
+    def read(path: str | Path) -> Iterator[dict]:
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+    @classmethod
+    def columns(cls, path: str | Path) -> list[str]:
+        # pd.DataFrame(list_of_dicts) ile aynı sıra: ilk görülme sırası
+        columns = {}
+        for row in cls.read(path):
+            columns.update(dict.fromkeys(row))
+        return list(columns)
+
+    @classmethod
+    def to_csv(cls, path: str | Path, output_csv: str | Path) -> tuple[int, int]:
+        """
+        Akışı DataFrame kurmadan, iki geçişte geniş CSV'ye çevirir.
+        Çıktı pd.DataFrame(rows).to_csv(index=False) ile aynıdır.
+        """
+        columns = cls.columns(path)
+        count = 0
+
+        with open(output_csv, "w", encoding="utf-8-sig", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=columns, lineterminator=os.linesep)
+            writer.writeheader()
+            for row in cls.read(path):
+                writer.writerow(row)
+                count += 1
+
+        return count, len(columns)
 
 
 class EpeyPhoneScraper:
@@ -14,8 +221,57 @@ class EpeyPhoneScraper:
     - Popüler ürünleri çeker
     - Ürün detaylarını parse eder
     - CSV olarak kaydeder
+
+    workers > 1 olduğunda eşzamanlı mod: detay sayfaları worker havuzunda
+    çekilir, resimler ayrı havuzda indirilir, ürün başı sleep yerine global
+    token bucket (requests_per_second) kullanılır. Sonuç sırası korunur.
+
+    cache_dir verildiğinde artımlı mod: detay sayfaları HttpCache ile koşullu
+    çekilir, parse edilen satırlar checkpoint.jsonl'e yazılır. Tekrar
+    çalıştırmada sayfası değişmemiş ürünler yeniden parse edilmez, içerik
+    hash'i tutan resimler yeniden indirilmez. Sıralı modda ürün başı sleep
+    yalnızca ağdan gövde indirildiğinde yapılır; taze cache kaydı ve 304
+    cevabı beklemeden geçer.
+
+    stream_path verildiğinde run() ürünleri bellekte biriktirmez: her satır
+    parse edildiği anda JsonlSink ile diske eklenir, CSV sonunda akıştan üretilir.
+    ProductDataPreprocessor bu .jsonl dosyasını doğrudan okuyabilir.
+
+    parser="lxml" detay sayfalarını BeautifulSoup ağacı kurmadan, ham byte'lar
+    üzerinde lxml etree/XPath ile parse eder; çıktı "bs4" ile birebir aynıdır.
     """
 
+    PARSERS = ("bs4", "lxml")
+
+    # Kolon adı normalizasyonu: tek geçişte karakter dönüşümü
+    COLUMN_NAME_TABLE = str.maketrans({
+        " ": "_",
+        "/": "_",
+        "(": None,
+        ")": None,
+        "%": "yuzde",
+        "-": "_",
+    })
+
+    # BeautifulSoup get_text'in dışarıda bıraktığı string container'lar
+    _TEXT = etree.XPath(
+        ".//text()[not(ancestor::script or ancestor::style or ancestor::template"
+        " or ancestor::rt or ancestor::rp)]"
+    )
+    _BIG_IMAGE = etree.XPath(
+        "//div[contains(concat(' ', normalize-space(@class), ' '), ' buyuk ')]//img"
+    )
+    _GROUPS = etree.XPath("//div[@id='ozellikler']//div[@id='grup']")
+    _GROUP_TITLE = etree.XPath(".//h3//span")
+    _GROUP_ROWS = etree.XPath(
+        ".//ul[contains(concat(' ', normalize-space(@class), ' '), ' grup ')]//li"
+    )
+    _ROW_KEY = etree.XPath(".//strong")
+    _ROW_VALUE = etree.XPath(
+        ".//span[contains(concat(' ', normalize-space(@class), ' '), ' cell ')]"
+    )
+    _ROW_LINKS = etree.XPath(".//a")
+
     def __init__(
         self,
         base_url: str = "https://www.epey.com",
@@ -23,18 +279,54 @@ class EpeyPhoneScraper:
         output_csv: str | Path = "src/app/output/dataset/raw/raw_dataset.csv",
         min_delay: float = 1.2,
         max_delay: float = 3.0,
-        image_dir: str | Path = "src/app/output/image"
+        image_dir: str | Path = "src/app/output/image",
+        workers: int = 1,
+        image_workers: int = 4,
+        requests_per_second: float = 2.0,
+        cache_dir: str | Path | None = "src/app/output/dataset/cache",
+        cache_max_age: float | None = None,
+        parser: str = "bs4",
+        stream_path: str | Path | None = None
     ):
+        if parser not in self.PARSERS:
+            raise ValueError(f"Unknown parser: {parser}")
+
         self.base_url = base_url
         self.list_base = list_base
         self.output_csv = Path(output_csv)
+        self.stream_path = Path(stream_path) if stream_path else None
         self.min_delay = min_delay
         self.max_delay = max_delay
 
         self.image_dir = Path(image_dir).resolve()
         self.image_dir.mkdir(parents=True, exist_ok=True)
 
+        self.parser = parser
+        self.workers = workers
+        self.image_workers = image_workers
+        self.rate_limiter = (
+            TokenBucket(requests_per_second) if workers > 1 else None
+        )
+
         self.scraper = self._create_scraper()
+        self._local = threading.local()
+
+        # Artımlı scraping: response cache + satır checkpoint + resim manifest
+        self.http_cache = None
+        self.checkpoint_path = None
+        self.checkpoint = {}
+        self._checkpoint_lock = threading.Lock()
+
+        if cache_dir is not None:
+            self.http_cache = HttpCache(Path(cache_dir) / "http", max_age=cache_max_age)
+            self.checkpoint_path = Path(cache_dir) / "checkpoint.jsonl"
+            self.checkpoint = self._load_checkpoint()
+            # Yarım kalan satır atılır; yeni satırlar temiz dosyaya eklenir
+            self._compact_checkpoint()
+
+        self.image_manifest_path = self.image_dir / "image_manifest.json"
+        self.image_manifest = self._load_image_manifest()
+        self._image_lock = threading.Lock()
 
     # =====================================
     # SCRAPER SETUP
@@ -49,12 +341,29 @@ class EpeyPhoneScraper:
             }
         )
 
+    def _session(self):
+        # Eşzamanlı modda her thread kendi oturumunu kullanır
+        if self.workers <= 1:
+            return self.scraper
+
+        scraper = getattr(self._local, "scraper", None)
+        if scraper is None:
+            scraper = self._local.scraper = self._create_scraper()
+        return scraper
+
+    def _get(self, url: str, **kwargs):
+        if self.rate_limiter:
+            self.rate_limiter.acquire()
+        return self._session().get(url, **kwargs)
+
     # =====================================
     # UTILITIES
     # =====================================
 
     def _sleep(self):
-        time.sleep(random.uniform(self.min_delay, self.max_delay))
+        # Eşzamanlı modda bekleme token bucket ile yapılır
+        if self.rate_limiter is None:
+            time.sleep(random.uniform(self.min_delay, self.max_delay))
 
     def _build_sort_url(self, sort_value: str) -> str:
         payload = f'N;_s:{len(sort_value)}:"{sort_value}";'
@@ -74,7 +383,7 @@ class EpeyPhoneScraper:
             page_url = sort_url if page == 1 else f"{sort_url}{page}/"
             print(f"📄 Sayfa: {page_url}")
 
-            resp = self.scraper.get(
+            resp = self._get(
                 page_url,
                 headers={"Referer": self.list_base},
                 timeout=30
@@ -133,20 +442,125 @@ class EpeyPhoneScraper:
     # PRODUCT DETAIL
     # =====================================
 
-    def get_product_detail(self, product_url: str, product_id: int) -> dict:
-        resp = self.scraper.get(
+    def get_product_detail(self, product_url: str, product_id: int, image_pool=None) -> tuple[dict, bool]:
+        """
+        (detay, ağdan gövde indirildi mi) döner. Taze cache kaydı ve 304
+        cevabı indirme sayılmaz; sıralı mod yalnızca indirmeden sonra bekler.
+        """
+        html, encoding, page_hash, fetched = self._fetch_detail_html(product_url)
+
+        # Sayfa içeriği checkpoint'tekiyle aynıysa parse atlanır
+        cached = self.checkpoint.get(product_url)
+        if cached and page_hash and cached["page_sha256"] == page_hash:
+            data, image_url = cached["detail"], cached["image_url"]
+        else:
+            data, image_url = self.parse_product_detail(html, encoding)
+            if page_hash:
+                self._save_checkpoint_row(product_url, page_hash, data, image_url)
+
+        if image_url:
+            if image_pool is not None:
+                image_pool.submit(self._download_image, image_url, product_id)
+            else:
+                fetched = self._download_image(image_url, product_id) or fetched
+
+        return data, fetched
+
+    def _fetch_detail_html(self, product_url: str) -> tuple[bytes, str | None, str | None, bool]:
+        """
+        (ham gövde, encoding, içerik sha256'sı, ağdan indirildi mi) döner;
+        cache yoksa hash None. Gövde decode edilmez: lxml byte'ları doğrudan
+        parse eder.
+        """
+        headers = {"Referer": self.list_base}
+
+        if self.http_cache is None:
+            resp = self._get(product_url, headers=headers, timeout=30)
+            resp.raise_for_status()
+            return resp.content, resp.encoding or resp.apparent_encoding, None, True
+
+        meta = self.http_cache.meta(product_url)
+        if self.http_cache.is_fresh(meta):
+            return self.http_cache.body(product_url), meta["encoding"], meta["sha256"], False
+
+        resp = self._get(
             product_url,
-            headers={"Referer": self.list_base},
+            headers={**headers, **self.http_cache.conditional_headers(meta)},
             timeout=30
         )
+
+        if resp.status_code == 304 and meta:
+            meta = self.http_cache.touch(product_url, meta)
+            return self.http_cache.body(product_url), meta["encoding"], meta["sha256"], False
+
         resp.raise_for_status()
+        meta = self.http_cache.store(product_url, resp)
+        return resp.content, meta["encoding"], meta["sha256"], True
+
+    # =====================================
+    # CHECKPOINT
+    # =====================================
 
-        soup = BeautifulSoup(resp.text, "lxml")
+    def _load_checkpoint(self) -> dict:
+        checkpoint = {}
+        if self.checkpoint_path.exists():
+            # Yarım satır çok byte'lı bir karakterin ortasında kesilmiş olabilir
+            with open(self.checkpoint_path, "r", encoding="utf-8", errors="replace") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    try:
+                        row = json.loads(line)
+                    except json.JSONDecodeError:
+                        # Öldürülen çalıştırmanın yarım yazılmış son satırı;
+                        # o ürün tekrar parse edilir
+                        continue
+                    checkpoint[row["urun_url"]] = row
+        return checkpoint
+
+    def _save_checkpoint_row(self, product_url: str, page_hash: str, detail: dict, image_url: str | None):
+        row = {
+            "urun_url": product_url,
+            "page_sha256": page_hash,
+            "image_url": image_url,
+            "detail": detail
+        }
 
+        # Her parse edilen satır hemen diske eklenir; yarıda kalan çalıştırma
+        # kaldığı yerden devam eder
+        with self._checkpoint_lock:
+            self.checkpoint[product_url] = row
+            with open(self.checkpoint_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(row, ensure_ascii=False) + "\n")
+
+    def _compact_checkpoint(self):
+        if self.checkpoint_path is None:
+            return
+
+        with self._checkpoint_lock:
+            tmp_path = self.checkpoint_path.with_suffix(".jsonl.tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                for row in self.checkpoint.values():
+                    f.write(json.dumps(row, ensure_ascii=False) + "\n")
+            os.replace(tmp_path, self.checkpoint_path)
+
+    def parse_product_detail(self, html: str | bytes, encoding: str | None = None) -> tuple[dict, str | None]:
+        """
+        Detay sayfasını parse eder: (özellikler, büyük resim url'i)
+        html ham gövde (bytes) ise encoding ile çözülür; None → utf-8
+        """
+        if self.parser == "lxml":
+            return self._parse_product_detail_lxml(html, encoding)
+
+        if isinstance(html, bytes):
+            html = html.decode(encoding or "utf-8", errors="replace")
+
+        soup = BeautifulSoup(html, "lxml")
+
+        image_url = None
         big_image = soup.select_one("div.buyuk img")
         if big_image and big_image.get("src"):
             image_url = big_image["src"]
-            self._download_image(image_url, product_id)
 
         data = {}
 
@@ -163,7 +577,7 @@ class EpeyPhoneScraper:
                     key, value = parsed
                     data[key] = value
 
-        return data
+        return data, image_url
 
     def _parse_detail_row(self, li, group_name: str):
         key_el = li.select_one("strong")
@@ -182,59 +596,191 @@ class EpeyPhoneScraper:
         else:
             value = val_el.get_text(strip=True)
 
-        col_name = f"{group_name}_{key}".lower()
-        col_name = (
-            col_name.replace(" ", "_")
-            .replace("/", "_")
-            .replace("(", "")
-            .replace(")", "")
-            .replace("%", "yuzde")
-            .replace("-", "_")
-        )
+        return self._column_name(group_name, key), value
 
-        return col_name, value
+    @classmethod
+    def _column_name(cls, group_name: str, key: str) -> str:
+        return f"{group_name}_{key}".lower().translate(cls.COLUMN_NAME_TABLE)
 
-    def _download_image(self, image_url: str, product_id: int):
-        try:
-            response = self.scraper.get(image_url, timeout=30)
-            response.raise_for_status()
+    @classmethod
+    def _text(cls, element) -> str:
+        # BeautifulSoup get_text(strip=True) karşılığı
+        return "".join(text.strip() for text in cls._TEXT(element))
+
+    def _parse_product_detail_lxml(self, html: str | bytes, encoding: str | None = None) -> tuple[dict, str | None]:
+        if isinstance(html, str):
+            html, encoding = html.encode("utf-8"), "utf-8"
+
+        root = etree.fromstring(html, etree.HTMLParser(encoding=encoding or "utf-8"))
+        if root is None:
+            return {}, None
 
+        image_url = None
+        big_image = self._BIG_IMAGE(root)
+        if big_image and big_image[0].get("src"):
+            image_url = big_image[0].get("src")
+
+        data = {}
+
+        for group in self._GROUPS(root):
+            group_title = self._GROUP_TITLE(group)
+            group_name = (
+                self._text(group_title[0]).lower()
+                if group_title else "genel"
+            )
+
+            for li in self._GROUP_ROWS(group):
+                key_el = self._ROW_KEY(li)
+                val_el = self._ROW_VALUE(li)
+
+                if not key_el or not val_el:
+                    continue
+
+                key = self._text(key_el[0])
+
+                links = self._ROW_LINKS(val_el[0])
+                if links:
+                    value = " | ".join(
+                        dict.fromkeys(self._text(a) for a in links)
+                    )
+                else:
+                    value = self._text(val_el[0])
+
+                data[self._column_name(group_name, key)] = value
+
+        return data, image_url
+
+    def _load_image_manifest(self) -> dict:
+        if self.image_manifest_path.exists():
+            with open(self.image_manifest_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        return {}
+
+    def _save_image_manifest(self):
+        with self._image_lock:
+            tmp_path = self.image_manifest_path.with_suffix(".json.tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self.image_manifest, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.image_manifest_path)
+
+    def _image_is_current(self, image_path: Path, image_url: str, product_id: int) -> bool:
+        entry = self.image_manifest.get(str(product_id))
+        if not entry or entry["url"] != image_url or not image_path.exists():
+            return False
+        return hashlib.sha256(image_path.read_bytes()).hexdigest() == entry["sha256"]
+
+    def _download_image(self, image_url: str, product_id: int) -> bool:
+        """
+        Resim ağdan indirildiyse True döner
+        """
+        try:
             image_path = self.image_dir / f"{product_id}.jpg"
 
+            # Aynı url'den indirilmiş ve hash'i tutan resim tekrar indirilmez
+            if self._image_is_current(image_path, image_url, product_id):
+                return False
+
+            response = self._get(image_url, timeout=30)
+            response.raise_for_status()
+
             with open(image_path, "wb") as f:
                 f.write(response.content)
 
+            with self._image_lock:
+                self.image_manifest[str(product_id)] = {
+                    "url": image_url,
+                    "sha256": hashlib.sha256(response.content).hexdigest()
+                }
+
+            return True
+
         except Exception as e:
             print(f"⚠️ Resim indirilemedi ({product_id}):", e)
+            # İstek atılmış olabilir; bekleme atlanmaz
+            return True
 
     # =====================================
     # FULL SCRAPE PIPELINE
     # =====================================
 
-    def scrape(self, limit: int = 500) -> pd.DataFrame:
+    def iter_rows(self, limit: int = 500) -> Iterator[dict]:
+        """
+        Ürün satırlarını (urun_id ile) sırayla, parse edildikçe üretir
+        """
         print("🚀 Popüler telefonlar alınıyor...")
         products = self.get_popular_products(limit=limit)
         print(f"✅ {len(products)} ürün bulundu")
 
-        all_data = []
+        try:
+            if self.workers > 1:
+                rows = self._iter_concurrent(products)
+            else:
+                rows = self._iter_sequential(products)
+
+            for urun_id, row in enumerate(rows, start=1):
+                yield {"urun_id": urun_id, **row}
+        finally:
+            self._save_image_manifest()
+            self._compact_checkpoint()
+
+    def scrape(self, limit: int = 500) -> pd.DataFrame:
+        return pd.DataFrame(list(self.iter_rows(limit=limit)))
+
+    def scrape_to_stream(self, limit: int = 500) -> int:
+        count = 0
 
+        with JsonlSink(self.stream_path) as sink:
+            for row in self.iter_rows(limit=limit):
+                sink.write(row)
+                count += 1
+
+        print(f"💾 Akış hazır: {self.stream_path} ({count} ürün)")
+        return count
+
+    def _iter_sequential(self, products: list[dict]) -> Iterator[dict]:
         for i, p in enumerate(products, start=1):
             print(f"[{i}/{len(products)}] {p['urun_ad']}")
 
             try:
-                detail = self.get_product_detail(
+                detail, fetched = self.get_product_detail(
                     p["urun_url"],
                     product_id=i
                 )
-                merged = {**p, **detail}
-                all_data.append(merged)
-                self._sleep()
+                yield {**p, **detail}
+                # Cache'ten / 304 ile gelen ürün için sunucuya yük binmez
+                if fetched:
+                    self._sleep()
             except Exception as e:
                 print("❌ Hata:", p["urun_url"], e)
 
-        df = pd.DataFrame(all_data)
-        df.insert(0, "urun_id", range(1, len(df) + 1))
-        return df
+    def _iter_concurrent(self, products: list[dict]) -> Iterator[dict]:
+        # Resim indirme, sayfa parse işinden ayrı havuzda ilerler
+        with ThreadPoolExecutor(max_workers=self.image_workers) as image_pool:
+
+            def fetch(product_id: int, product: dict) -> dict:
+                detail, _ = self.get_product_detail(
+                    product["urun_url"],
+                    product_id=product_id,
+                    image_pool=image_pool
+                )
+                return {**product, **detail}
+
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                futures = [
+                    pool.submit(fetch, i, p)
+                    for i, p in enumerate(products, start=1)
+                ]
+
+                # Sonuçlar ürün sırasıyla üretilir
+                for i, (p, future) in enumerate(zip(products, futures), start=1):
+                    try:
+                        row = future.result()
+                    except Exception as e:
+                        print("❌ Hata:", p["urun_url"], e)
+                        continue
+
+                    print(f"[{i}/{len(products)}] {p['urun_ad']}")
+                    yield row
 
     def save(self, df: pd.DataFrame):
         self.output_csv.parent.mkdir(parents=True, exist_ok=True)
@@ -252,9 +798,20 @@ class EpeyPhoneScraper:
     # ENTRY POINT
     # =====================================
 
+    def save_stream(self):
+        self.output_csv.parent.mkdir(parents=True, exist_ok=True)
+        count, n_columns = JsonlSink.to_csv(self.stream_path, self.output_csv)
+
+        print(f"🎉 CSV hazır: {self.output_csv}")
+        print(f"📊 Ürün: {count}, Kolon: {n_columns}")
+
     def run(self, limit: int = 500):
-        df = self.scrape(limit=limit)
-        self.save(df)
+        if self.stream_path:
+            self.scrape_to_stream(limit=limit)
+            self.save_stream()
+        else:
+            df = self.scrape(limit=limit)
+            self.save(df)
         print("Scraping tamamlandı.")
 
 if __name__ == "__main__":
@@ -0,0 +1,296 @@
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from scipy import sparse
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+except ImportError:  # arrow depolama opsiyonel
+    pa = None
+    feather = None
+
+
+STORAGE_FORMATS = ("csv", "arrow")
+ARROW_SUFFIX = ".arrow"
+SPARSE_SUFFIX = ".npz"
+
+
+def check_storage(storage: str) -> None:
+    """
+    Bilinmeyen storage ya da pyarrow olmadan "arrow" için yazım
+    başlamadan hata verir
+    """
+    if storage not in STORAGE_FORMATS:
+        raise ValueError(f"Unknown storage: {storage}")
+    if storage == "arrow" and feather is None:
+        raise ImportError("Arrow depolama için pyarrow gerekli")
+
+
+def arrow_path(path: str | Path) -> Path:
+    return Path(path).with_suffix(ARROW_SUFFIX)
+
+
+def resolve_dataset_path(path: str | Path) -> Path:
+    """
+    Okunacak asıl dosya: aynı isimli .arrow varsa ve CSV'den eski değilse o,
+    yoksa CSV. Okuyucular CSV yolunu vermeye devam eder.
+    """
+    path = Path(path)
+    columnar = arrow_path(path)
+
+    if feather is not None and columnar.exists():
+        if not path.exists() or columnar.stat().st_mtime >= path.stat().st_mtime:
+            return columnar
+
+    return path
+
+
+def read_dataset(path: str | Path, columns: list[str] | None = None) -> pd.DataFrame:
+    """
+    Pipeline çıktısını okur. Arrow IPC dosyaları CSV gibi ayrıştırılmaz,
+    dtype'lar (bool one-hot kolonlar dahil) yazıldığı gibi geri gelir.
+    memory-map yalnızca okuma tamponunu kaldırır: to_pandas kolonları yine
+    heap'e kopyalar (zero-copy frame'ler salt okunur, pipeline adımları
+    kolonlara yazar). Bellek kazancı için columns ile yalnızca gereken
+    kolonlar okunmalı.
+    """
+    resolved = resolve_dataset_path(path)
+
+    if resolved.suffix == ARROW_SUFFIX:
+        if feather is None:
+            raise ImportError("Arrow dataset okumak için pyarrow gerekli")
+        table = feather.read_table(resolved, columns=columns, memory_map=True)
+        return table.to_pandas()
+
+    return pd.read_csv(resolved, usecols=columns)
+
+
+def write_dataset(df: pd.DataFrame, path: str | Path, storage: str = "csv") -> Path:
+    """
+    storage="arrow": CSV yerine sıkıştırmasız Arrow IPC (Feather v2) yazar
+    """
+    check_storage(storage)
+
+    if storage == "arrow":
+        target = arrow_path(path)
+
+        # Arrow sparse pandas kolonlarını desteklemez
+        sparse_columns = {
+            col: df[col].dtype.subtype
+            for col in df.columns
+            if isinstance(df[col].dtype, pd.SparseDtype)
+        }
+        if sparse_columns:
+            df = df.astype(sparse_columns)
+
+        feather.write_feather(
+            df.reset_index(drop=True),
+            target,
+            compression="uncompressed"
+        )
+        return target
+
+    df.to_csv(path, index=False)
+    return Path(path)
+
+
+def compact_dtypes(
+    df: pd.DataFrame,
+    binary_columns: list[str] | tuple = (),
+    exclude: list[str] | tuple = (),
+    categorize: bool = True
+) -> pd.DataFrame:
+    """
+    Bellek dostu dtype'lar:
+    - bool (one-hot) kolonlar olduğu gibi kalır
+    - binary_columns içindeki ve integer, eksiksiz 0/1 kolonlar uint8 (CSV'den
+      okunan binary kolonlar integer gelir)
+    - diğer float kolonlar float32
+    - categorize=True ise string kolonlar category
+    exclude'daki kolonlara (hedefler, id) dokunulmaz.
+    """
+    dtypes = {}
+
+    for col in df.columns:
+        if col in exclude:
+            continue
+
+        series = df[col]
+
+        if pd.api.types.is_bool_dtype(series):
+            continue
+
+        if pd.api.types.is_numeric_dtype(series):
+            binary = col in binary_columns or pd.api.types.is_integer_dtype(series)
+            if binary and series.notna().all() and series.isin((0, 1)).all():
+                dtypes[col] = "uint8"
+            elif pd.api.types.is_float_dtype(series):
+                dtypes[col] = "float32"
+        elif categorize:
+            dtypes[col] = "category"
+
+    return df.astype(dtypes) if dtypes else df
+
+
+def memory_mb(df: pd.DataFrame) -> float:
+    return df.memory_usage(deep=True).sum() / 1024 ** 2
+
+
+def sparse_path(path: str | Path) -> Path:
+    return Path(path).with_suffix(SPARSE_SUFFIX)
+
+
+def frame_to_csr(df: pd.DataFrame, sparse_columns: list[str]) -> tuple[sparse.csr_matrix, list[str]]:
+    """
+    Numeric / bool kolonları float32 CSR matrise çevirir; string kolonlar
+    alınmaz. sparse_columns'ta (one-hot) yalnızca sıfırdan farklı değerler
+    saklanır; diğer kolonların sıfırları da açıkça saklanır, çünkü XGBoost
+    saklanmayan girdiyi eksik değer sayar.
+    """
+    columns = [
+        col for col in df.columns
+        if pd.api.types.is_numeric_dtype(df[col]) or pd.api.types.is_bool_dtype(df[col])
+    ]
+    implicit = set(sparse_columns)
+
+    rows, cols, data = [], [], []
+    for j, col in enumerate(columns):
+        series = df[col]
+
+        if col in implicit and isinstance(series.dtype, pd.SparseDtype):
+            # Sparse kolon yoğunlaştırılmadan okunur
+            positions = series.array.sp_index.indices
+            values = series.array.sp_values.astype(np.float32)
+        else:
+            values = np.asarray(series, dtype=np.float32)
+            positions = np.arange(len(values))
+
+        if col in implicit:
+            nonzero = values != 0
+            positions, values = positions[nonzero], values[nonzero]
+
+        rows.append(positions)
+        cols.append(np.full(len(positions), j))
+        data.append(values)
+
+    matrix = sparse.csr_matrix(
+        (
+            np.concatenate(data) if data else np.empty(0, dtype=np.float32),
+            (
+                np.concatenate(rows) if rows else np.empty(0, dtype=np.int64),
+                np.concatenate(cols) if cols else np.empty(0, dtype=np.int64),
+            )
+        ),
+        shape=(len(df), len(columns))
+    )
+
+    return matrix, columns
+
+
+def dense_to_csr(X: np.ndarray, sparse_mask: np.ndarray) -> sparse.csr_matrix:
+    """
+    Encoder'ın yoğun satırlarını eğitimdeki sparse düzene çevirir:
+    sparse_mask kolonlarındaki sıfırlar saklanmaz (eksik), diğerleri saklanır
+    """
+    rows, cols = np.nonzero((X != 0) | ~sparse_mask)
+    return sparse.csr_matrix((X[rows, cols], (rows, cols)), shape=X.shape)
+
+
+def write_sparse_dataset(
+    path: str | Path,
+    matrix: sparse.csr_matrix,
+    columns: list[str],
+    sparse_columns: list[str],
+    labels: dict[str, np.ndarray]
+) -> Path:
+    """
+    CSR matris + kolon indexi tek .npz dosyasına yazılır. labels: hedef / id
+    kolonları, matrise girmeden orijinal dtype'larıyla saklanır.
+    """
+    target = sparse_path(path)
+    matrix = matrix.tocsr()
+
+    np.savez(
+        target,
+        data=matrix.data,
+        indices=matrix.indices,
+        indptr=matrix.indptr,
+        shape=np.array(matrix.shape),
+        columns=np.array(columns, dtype=str),
+        sparse_columns=np.array(sparse_columns, dtype=str),
+        **{f"label_{name}": values for name, values in labels.items()}
+    )
+    return target
+
+
+def read_sparse_dataset(path: str | Path) -> dict:
+    """
+    write_sparse_dataset çıktısı: {"matrix", "columns", "sparse_columns", "labels"}
+    """
+    with np.load(sparse_path(path), allow_pickle=False) as npz:
+        matrix = sparse.csr_matrix(
+            (npz["data"], npz["indices"], npz["indptr"]),
+            shape=tuple(npz["shape"])
+        )
+
+        return {
+            "matrix": matrix,
+            "columns": npz["columns"].tolist(),
+            "sparse_columns": npz["sparse_columns"].tolist(),
+            "labels": {
+                key[len("label_"):]: npz[key]
+                for key in npz.files
+                if key.startswith("label_")
+            },
+        }
+
+
+class ChunkedDatasetWriter:
+    """
+    Çıktıyı chunk chunk write_dataset ile aynı formatta yazar:
+    CSV'de ilk chunk header ile, sonrakiler append; arrow'da her chunk
+    ilk chunk'ın şemasıyla Arrow IPC dosyasına record batch olarak eklenir.
+    """
+
+    def __init__(self, path: str | Path, storage: str = "csv"):
+        check_storage(storage)
+
+        self.path = arrow_path(path) if storage == "arrow" else Path(path)
+        self.storage = storage
+        self.rows = 0
+
+        self._started = False
+        self._writer = None
+        self._schema = None
+
+    def write(self, df: pd.DataFrame) -> None:
+        if self.storage == "arrow":
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            if self._writer is None:
+                self._schema = table.schema
+                self._writer = pa.ipc.new_file(self.path, self._schema)
+            else:
+                table = table.cast(self._schema)
+            self._writer.write_table(table)
+        else:
+            df.to_csv(
+                self.path,
+                index=False,
+                mode="a" if self._started else "w",
+                header=not self._started
+            )
+
+        self._started = True
+        self.rows += len(df)
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def __enter__(self) -> "ChunkedDatasetWriter":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -2,24 +2,201 @@
 # FULL DATA PREPROCESSING PIPELINE (CLASS VERSION)
 # ============================================================
 
+import copy
+import hashlib
+import inspect
+import itertools
+import json
+import marshal
+import os
+import sys
+import time
 import pandas as pd
 import numpy as np
 import re
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
+from scipy import sparse
+from typing import Iterator
+
+BASE_DIR = Path(__file__).resolve().parents[4]
+sys.path.append(str(BASE_DIR))
+
+from src.app.scripts.dataset.dataset_io import (
+    ChunkedDatasetWriter,
+    check_storage,
+    compact_dtypes,
+    frame_to_csr,
+    memory_mb,
+    read_dataset,
+    write_dataset,
+    write_sparse_dataset,
+)
+from src.app.scripts.dataset.parallel_columns import ParallelColumnExecutor
+from src.app.scripts.dataset.streaming_stats import CategoryCounter, StreamingQuantile
 
 class ProductDataPreprocessor:
 
+    NUMERIC_COLUMNS = [
+        "ekran_ekran_boyutu",
+        "batarya_batarya_kapasitesi_tipik",
+        "batarya_hızlı_şarj_gücü_maks.",
+        "kamera_kamera_çözünürlüğü",
+        "kamera_ön_kamera_çözünürlüğü",
+        "temel_donanim_cpu_çekirdeği",
+        "temel_donanim_cpu_üretim_teknolojisi",
+        "temel_donanim_antutu_puanı_v10",
+        "temel_donanim_bellek_ram",
+        "temel_donanim_dahili_depolama",
+        "tasarim_kalınlık",
+        "tasarim_ağırlık",
+        "ekran_ekran_yenileme_hızı",
+        "kamera_video_fps_değeri"
+    ]
+
+    BINARY_COLUMNS = [
+        "batarya_hızlı_şarj",
+        "batarya_kablosuz_şarj",
+        "kamera_optik_görüntü_sabitleyici_ois",
+        "ağ_bağlantilari_5g",
+        'ağ_bağlantilari_5g',
+        'ağ_bağlantilari_4.5g_desteği',
+        'ağ_bağlantilari_4g',
+        'ağ_bağlantilari_2g',
+        'ağ_bağlantilari_3g',
+        "kablosuz_bağlantilar_nfc",
+        "özelli̇kler_suya_dayanıklılık"
+    ]
+
+    BINARY_MAP = {"var": 1, "yok": 0}
+
+    INCLUDE_COLUMNS = [
+        'urun_id',
+        'urun_ad',
+        'urun_fiyat',
+        'urun_puan',
+        'ekran_ekran_boyutu',
+        'ekran_ekran_teknolojisi',
+        'ekran_ekran_çözünürlüğü_standardı',
+        'ekran_ekran_yenileme_hızı',
+        'batarya_batarya_kapasitesi_tipik',
+        'batarya_hızlı_şarj',
+        'batarya_hızlı_şarj_gücü_maks.',
+        'batarya_kablosuz_şarj',
+        'kamera_kamera_çözünürlüğü',
+        'kamera_optik_görüntü_sabitleyici_ois',
+        'kamera_video_kayıt_çözünürlüğü',
+        'kamera_video_fps_değeri',
+        'kamera_ön_kamera_çözünürlüğü',
+        'temel_donanim_cpu_çekirdeği',
+        'temel_donanim_cpu_üretim_teknolojisi',
+        'temel_donanim_antutu_puanı_v10',
+        'temel_donanim_bellek_ram',
+        'temel_donanim_dahili_depolama',
+        'tasarim_kalınlık',
+        'tasarim_ağırlık',
+        'tasarim_gövde_malzemesi_kapak',
+        'ağ_bağlantilari_5g',
+        'ağ_bağlantilari_4.5g_desteği',
+        'ağ_bağlantilari_4g',
+        'ağ_bağlantilari_2g',
+        'ağ_bağlantilari_3g',
+        'kablosuz_bağlantilar_bluetooth_versiyonu',
+        'kablosuz_bağlantilar_nfc',
+        'i̇şleti̇m_si̇stemi̇_i̇şletim_sistemi',
+        'özelli̇kler_suya_dayanıklılık'
+    ]
+
+    TARGET_COLUMNS = ["urun_id", "urun_ad", "urun_fiyat", "urun_puan"]
+
+    STATE_FILENAME = "preprocessor_state.json"
+
+    # Ara adım snapshot politikası: "all", "final" (step8), "none" ya da
+    # adım listesi (ör. ["step0", "step7"]). Bu dosyalar her zaman yazılır:
+    # step4 → PredictService / CatalogStore, final_dataset → trainer
+    SNAPSHOT_POLICIES = ("all", "final", "none")
+    MANDATORY_SNAPSHOTS = ("step4_numeric_cleaned.csv",)
+
+    # "sparse": one-hot kolonlar sparse tutulur, final matris ayrıca CSR
+    # (final_dataset.npz) olarak yazılır; trainer bunu sparse DMatrix'e verir
+    ENCODINGS = ("dense", "sparse")
+
+    NUMBER_PATTERN = re.compile(r"(\d+(?:\.\d+)?)")
+
+    # Cache'lenebilir adımlar: (metod, snapshot dosyası, sonucu etkileyen
+    # yardımcı metod / sabitler). Adım anahtarı = önceki adımın anahtarı +
+    # bu adımın kaynak kodu ve bağımlılıklarının hash'i; ilk adımda girdi
+    # dosyasının hash'i.
+    STAGES = [
+        ("step0_load", "step0_raw_dataset.csv", ("read_jsonl", "_coerce_jsonl_frame")),
+        ("step1_keep_columns", "step1_keep_selected_columns.csv", ("INCLUDE_COLUMNS",)),
+        ("step2_drop_null_target", "step2_drop_null_target.csv", ()),
+        ("step3_log_transform", "step3_log_targets.csv", ()),
+        ("step4_numeric_cleaning", "step4_numeric_cleaned.csv", (
+            "clean_numeric_column", "extract_numeric_series",
+            "NUMERIC_COLUMNS", "NUMBER_PATTERN",
+        )),
+        ("step5_binary_mapping", "step5_binary_encoded.csv", (
+            "map_binary_series", "BINARY_COLUMNS", "BINARY_MAP", "NUMERIC_COLUMNS",
+        )),
+        ("step6_handle_missing", "step6_missing_handled.csv", ("fill_median_series",)),
+        ("step7_one_hot", "step7_onehot_encoded.csv", ("encoding",)),
+    ]
+
     def __init__(self,
                  input_path: str,
                  processed_dir: str,
                  output_dir: str,
-                 mode: str = "train"):
+                 mode: str = "train",
+                 state_path: str | None = None,
+                 storage: str = "csv",
+                 snapshots: str | list[str] = "all",
+                 cache_dir: str | None = None,
+                 workers: int = 1,
+                 encoding: str = "dense"):
+
+        # pyarrow eksikse ilk snapshot'ı beklemeden hata verir
+        check_storage(storage)
+        if encoding not in self.ENCODINGS:
+            raise ValueError(f"Unknown encoding: {encoding}")
 
         self.input_path = input_path
         self.processed_dir = Path(processed_dir)
         self.output_dir = Path(output_dir)
         self.mode = mode
 
+        # "arrow": ara ve final çıktılar CSV yerine Arrow IPC olarak yazılır
+        self.storage = storage
+
+        if isinstance(snapshots, str) and snapshots not in self.SNAPSHOT_POLICIES:
+            raise ValueError(f"Unknown snapshot policy: {snapshots}")
+        self.snapshots = snapshots
+
+        # Snapshot'lar arka planda yazılır; sıradaki adım beklemeden başlar
+        self._snapshot_pool = None
+        self._snapshot_futures = []
+
+        # Adım cache'i (train modunda run() kullanır); None → kapalı
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+
+        # run_chunked sırasında adımlar chunk başına çalışır, snapshot yazmaz
+        self._chunked = False
+
+        # workers > 1: step4-6'daki kolon bazlı işler process havuzunda
+        self.workers = workers
+        self._executor = None
+
+        self.encoding = encoding
+
+        # Fit edilen preprocessing durumu (medianlar, binary map, one-hot sözlüğü)
+        self.state_path = (
+            Path(state_path) if state_path
+            else self.output_dir / self.STATE_FILENAME
+        )
+        self.state = {}
+
         self.processed_dir.mkdir(parents=True, exist_ok=True)
         self.output_dir.mkdir(parents=True, exist_ok=True)
 
@@ -46,23 +223,174 @@ class ProductDataPreprocessor:
 
         return np.nan
 
+    @classmethod
+    def extract_numeric_series(cls, series: pd.Series) -> pd.Series:
+        """
+        extract_numeric'in vektörel karşılığı.
+        Kolon factorize edilir; her benzersiz değer str metodlarıyla bir kez
+        parse edilir ve sonuç kodlar üzerinden satırlara dağıtılır.
+        """
+        codes, uniques = pd.factorize(series)
+
+        text = pd.Series(uniques, dtype=object).map(str).str.strip()
+
+        # "2.697.900" gibi binlik ayraçlı değerlerde noktalar silinir
+        dotted = text.str.count(r"\.") > 1
+        text = text.where(~dotted, text.str.replace(".", "", regex=False))
+
+        parsed = (
+            text.str.extract(cls.NUMBER_PATTERN, expand=False)
+            .astype(np.float64)
+            .to_numpy()
+        )
+
+        # Eksik değerlerin kodu -1 → sondaki NaN
+        parsed = np.append(parsed, np.nan)
+
+        return pd.Series(parsed[codes], index=series.index, name=series.name)
+
     def clean_numeric_column(self, column):
-        self.df[column] = self.df[column].apply(self.extract_numeric)
+        self.df[column] = self.extract_numeric_series(self.df[column])
+
+    @staticmethod
+    def map_binary_series(series: pd.Series, binary_map: dict, repeat: int = 1) -> pd.Series:
+        # BINARY_COLUMNS'ta tekrar eden kolon seri döngüde iki kez map'lenir;
+        # paralel yolda aynı sonuç için repeat kullanılır
+        for _ in range(repeat):
+            series = (
+                series
+                .astype(str)
+                .str.strip()
+                .str.lower()
+                .map(binary_map)
+            )
+        return series
+
+    @staticmethod
+    def fill_median_series(series: pd.Series) -> tuple[pd.Series, float]:
+        median = float(series.median())
+        return series.fillna(median), median
+
+    def _column_executor(self) -> ParallelColumnExecutor:
+        if self._executor is None:
+            self._executor = ParallelColumnExecutor(self.workers)
+        return self._executor
+
+    def close_workers(self):
+        if self._executor is not None:
+            self._executor.close()
+            self._executor = None
+
+    @staticmethod
+    def read_jsonl(path) -> pd.DataFrame:
+        """
+        Scraper'ın JsonlSink ile yazdığı akışı okur. Kolonlar ilk görülme
+        sırasıyla birleşir; tipler read_csv ile aynı kurala göre çıkarılır
+        (boş → NaN, tüm değerleri sayı olan kolon → numeric).
+        """
+        with open(path, "r", encoding="utf-8") as f:
+            df = pd.DataFrame([json.loads(line) for line in f if line.strip()])
+
+        return ProductDataPreprocessor._coerce_jsonl_frame(df)
+
+    @staticmethod
+    def _coerce_jsonl_frame(df: pd.DataFrame, dtypes: dict | None = None) -> pd.DataFrame:
+        """
+        dtypes verilmezse kolon tipi değerlerden çıkarılır; verilirse
+        (chunk modunda) tüm chunk'lar için belirlenen tip uygulanır
+        """
+        for col in df.columns:
+            values = df[col].replace("", np.nan)
+
+            if dtypes is None:
+                numeric = pd.to_numeric(values, errors="coerce")
+                if numeric.notna().sum() == values.notna().sum():
+                    values = numeric
+            elif dtypes[col] != "str":
+                values = pd.to_numeric(values).astype(dtypes[col])
+
+            df[col] = values
+
+        return df
+
+    def _wants_snapshot(self, filename):
+        if filename in self.MANDATORY_SNAPSHOTS or self.snapshots == "all":
+            return True
+        if self.snapshots == "final":
+            return filename.startswith("step8_")
+        if self.snapshots == "none":
+            return False
+        return any(
+            filename == step or filename.startswith(f"{step}_")
+            for step in self.snapshots
+        )
+
+    def _write_snapshot(self, path):
+        # Önceki snapshot'lardan biri yazılamadıysa sıradaki kuyruğa girmez
+        self.check_snapshots()
+
+        if self._snapshot_pool is None:
+            self._snapshot_pool = ThreadPoolExecutor(max_workers=1)
+
+        # pandas copy-on-write: sığ kopya, sonraki adımların değişikliklerinden
+        # etkilenmez ve veri kopyalamaz
+        future = self._snapshot_pool.submit(
+            write_dataset, self.df.copy(deep=False), path, self.storage
+        )
+        future.add_done_callback(partial(self._report_snapshot, path))
+        self._snapshot_futures.append(future)
+
+    @staticmethod
+    def _report_snapshot(path, future):
+        # Hata yazım anında görünür, wait_for_snapshots beklenmez
+        if future.exception() is not None:
+            print(f"Snapshot yazılamadı: {path}: {future.exception()!r}")
+
+    def check_snapshots(self):
+        """
+        Tamamlanmış snapshot yazımlarından hata vereni yükseltir; devam
+        edenleri beklemez
+        """
+        pending = []
+        for future in self._snapshot_futures:
+            if future.done():
+                future.result()
+            else:
+                pending.append(future)
+        self._snapshot_futures = pending
+
+    def wait_for_snapshots(self):
+        """
+        Bekleyen snapshot yazımlarını tamamlar; yazım hatası varsa yükseltir
+        """
+        futures, self._snapshot_futures = self._snapshot_futures, []
+        try:
+            for future in futures:
+                future.result()
+        finally:
+            if self._snapshot_pool is not None:
+                self._snapshot_pool.shutdown()
+                self._snapshot_pool = None
 
     def save_process_step(self, filename):
-        if self.mode == "train":
-            self.df.to_csv(self.processed_dir / filename, index=False)
+        if self._chunked:
+            return
+        if self.mode == "train" and self._wants_snapshot(filename):
+            self._write_snapshot(self.processed_dir / filename)
 
     def save_final_step(self, filename):
         if self.mode == "train":
-            self.df.to_csv(self.output_dir / filename, index=False)
+            self._write_snapshot(self.output_dir / filename)
 
     # ========================================================
     # STEP 0 — LOAD
     # ========================================================
 
     def step0_load(self):
-        self.df = pd.read_csv(self.input_path)
+        if str(self.input_path).endswith(".jsonl"):
+            self.df = self.read_jsonl(self.input_path)
+        else:
+            self.df = read_dataset(self.input_path)
         self.save_process_step("step0_raw_dataset.csv")
         
     # ========================================================
@@ -71,44 +399,7 @@ class ProductDataPreprocessor:
 
     def step1_keep_columns(self):
 
-        include_columns = [
-            'urun_id',
-            'urun_ad',
-            'urun_fiyat',
-            'urun_puan',
-            'ekran_ekran_boyutu',
-            'ekran_ekran_teknolojisi',
-            'ekran_ekran_çözünürlüğü_standardı',
-            'ekran_ekran_yenileme_hızı',
-            'batarya_batarya_kapasitesi_tipik',
-            'batarya_hızlı_şarj',
-            'batarya_hızlı_şarj_gücü_maks.',
-            'batarya_kablosuz_şarj',
-            'kamera_kamera_çözünürlüğü',
-            'kamera_optik_görüntü_sabitleyici_ois',
-            'kamera_video_kayıt_çözünürlüğü',
-            'kamera_video_fps_değeri',
-            'kamera_ön_kamera_çözünürlüğü',
-            'temel_donanim_cpu_çekirdeği',
-            'temel_donanim_cpu_üretim_teknolojisi',
-            'temel_donanim_antutu_puanı_v10',
-            'temel_donanim_bellek_ram',
-            'temel_donanim_dahili_depolama',
-            'tasarim_kalınlık',
-            'tasarim_ağırlık',
-            'tasarim_gövde_malzemesi_kapak',
-            'ağ_bağlantilari_5g',
-            'ağ_bağlantilari_4.5g_desteği',
-            'ağ_bağlantilari_4g',
-            'ağ_bağlantilari_2g',
-            'ağ_bağlantilari_3g',
-            'kablosuz_bağlantilar_bluetooth_versiyonu',
-            'kablosuz_bağlantilar_nfc',
-            'i̇şleti̇m_si̇stemi̇_i̇şletim_sistemi',
-            'özelli̇kler_suya_dayanıklılık'
-        ]
-
-        existing_include = [col for col in include_columns if col in self.df.columns]
+        existing_include = [col for col in self.INCLUDE_COLUMNS if col in self.df.columns]
         self.df = self.df[existing_include].copy()
 
         self.save_process_step("step1_keep_selected_columns.csv")
@@ -140,25 +431,17 @@ class ProductDataPreprocessor:
 
     def step4_numeric_cleaning(self):
 
-        numeric_columns = [
-            "ekran_ekran_boyutu",
-            "batarya_batarya_kapasitesi_tipik",
-            "batarya_hızlı_şarj_gücü_maks.",
-            "kamera_kamera_çözünürlüğü",
-            "kamera_ön_kamera_çözünürlüğü",
-            "temel_donanim_cpu_çekirdeği",
-            "temel_donanim_cpu_üretim_teknolojisi",
-            "temel_donanim_antutu_puanı_v10",
-            "temel_donanim_bellek_ram",
-            "temel_donanim_dahili_depolama",
-            "tasarim_kalınlık",
-            "tasarim_ağırlık",
-            "ekran_ekran_yenileme_hızı",
-            "kamera_video_fps_değeri"
-        ]
-
-        for col in numeric_columns:
-            if col in self.df.columns:
+        columns = [col for col in self.NUMERIC_COLUMNS if col in self.df.columns]
+
+        if self.workers > 1:
+            results = self._column_executor().map(
+                self.df,
+                {col: self.extract_numeric_series for col in columns}
+            )
+            for col, (values, _) in results.items():
+                self.df[col] = values
+        else:
+            for col in columns:
                 self.clean_numeric_column(col)
 
         self.save_process_step("step4_numeric_cleaned.csv")
@@ -169,29 +452,40 @@ class ProductDataPreprocessor:
 
     def step5_binary_mapping(self):
 
-        self.binary_columns = [
-            "batarya_hızlı_şarj",
-            "batarya_kablosuz_şarj",
-            "kamera_optik_görüntü_sabitleyici_ois",
-            "ağ_bağlantilari_5g",
-            'ağ_bağlantilari_5g',
-            'ağ_bağlantilari_4.5g_desteği',
-            'ağ_bağlantilari_4g',
-            'ağ_bağlantilari_2g',
-            'ağ_bağlantilari_3g',
-            "kablosuz_bağlantilar_nfc",
-            "özelli̇kler_suya_dayanıklılık"
-        ]
+        if self.mode == "train":
+            self.binary_columns = self.BINARY_COLUMNS
+            binary_map = self.BINARY_MAP
+        else:
+            self.binary_columns = self.state["binary_columns"]
+            binary_map = self.state["binary_map"]
+
+        if self.workers > 1:
+            repeats = Counter(
+                col for col in self.binary_columns if col in self.df.columns
+            )
+            results = self._column_executor().map(
+                self.df,
+                {
+                    col: partial(self.map_binary_series, binary_map=binary_map, repeat=count)
+                    for col, count in repeats.items()
+                }
+            )
+            for col, (values, _) in results.items():
+                self.df[col] = values
+        else:
+            for col in self.binary_columns:
+                if col in self.df.columns:
+                    self.df[col] = self.map_binary_series(self.df[col], binary_map)
 
-        for col in self.binary_columns:
-            if col in self.df.columns:
-                self.df[col] = (
-                    self.df[col]
-                    .astype(str)
-                    .str.strip()
-                    .str.lower()
-                    .map({"var": 1, "yok": 0})
-                )
+        if self.mode == "train":
+            self.state["numeric_columns"] = [
+                col for col in self.NUMERIC_COLUMNS if col in self.df.columns
+            ]
+            self.state["binary_columns"] = [
+                col for col in dict.fromkeys(self.binary_columns)
+                if col in self.df.columns
+            ]
+            self.state["binary_map"] = self.BINARY_MAP
 
         self.save_process_step("step5_binary_encoded.csv")
 
@@ -203,6 +497,10 @@ class ProductDataPreprocessor:
 
         self.df.replace(r'^\s*$', np.nan, regex=True, inplace=True)
 
+        if self.mode != "train":
+            self._apply_missing_state()
+            return
+
         # Binary → 0
         for col in self.binary_columns:
             if col in self.df.columns:
@@ -211,9 +509,25 @@ class ProductDataPreprocessor:
         # Numeric → median
         numeric_cols = self.df.select_dtypes(include=[np.number]).columns.tolist()
 
-        for col in numeric_cols:
-            if col not in self.binary_columns:
-                self.df[col] = self.df[col].fillna(self.df[col].median())
+        median_cols = [col for col in numeric_cols if col not in self.binary_columns]
+
+        results = {}
+        if self.workers > 1:
+            results = self._column_executor().map(
+                self.df,
+                {
+                    col: self.fill_median_series
+                    for col in median_cols
+                    if pd.api.types.is_float_dtype(self.df[col])
+                }
+            )
+
+        medians = {}
+        for col in median_cols:
+            if col in results:
+                self.df[col], medians[col] = results[col]
+            else:
+                self.df[col], medians[col] = self.fill_median_series(self.df[col])
 
         # Categorical → Unknown
         categorical_cols = self.df.select_dtypes(include=["object"]).columns.tolist()
@@ -221,14 +535,39 @@ class ProductDataPreprocessor:
         for col in categorical_cols:
             self.df[col] = self.df[col].fillna("Unknown")
 
+        self.state["medians"] = medians
+        self.state["categorical_columns"] = categorical_cols
+
         self.save_process_step("step6_missing_handled.csv")
 
+    def _apply_missing_state(self):
+        # Eğitimde hesaplanan medianlar kullanılır; eksik kolonlar da eklenir
+        for col in self.binary_columns:
+            if col in self.df.columns:
+                self.df[col] = self.df[col].fillna(0)
+
+        for col, median in self.state["medians"].items():
+            if col in self.df.columns:
+                self.df[col] = pd.to_numeric(self.df[col], errors="coerce").fillna(median)
+            elif col not in self.TARGET_COLUMNS:
+                self.df[col] = median
+
+        for col in self.state["categorical_columns"]:
+            if col in self.df.columns:
+                self.df[col] = self.df[col].astype(object).fillna("Unknown")
+            else:
+                self.df[col] = "Unknown"
+
     # ========================================================
     # STEP 7 — ONE HOT ENCODING
     # ========================================================
 
     def step7_one_hot(self):
 
+        if self.mode != "train":
+            self._apply_one_hot_state()
+            return
+
         categorical_cols = self.df.select_dtypes(include=["object"]).columns.tolist()
 
         low_card_cols = [
@@ -236,43 +575,483 @@ class ProductDataPreprocessor:
             if self.df[col].nunique() <= 20
         ]
 
+        # get_dummies kategorileri sıralar ve drop_first ilkini düşürür
+        one_hot = {}
+        for col in low_card_cols:
+            categories = sorted(self.df[col].dropna().astype(str).unique().tolist())
+            one_hot[col] = {
+                "categories": categories,
+                "dropped": categories[0] if categories else None
+            }
+
         self.df = pd.get_dummies(
             self.df,
             columns=low_card_cols,
-            drop_first=True
+            drop_first=True,
+            sparse=self.encoding == "sparse"
         )
 
+        self.state["one_hot"] = one_hot
+        self.state["columns"] = list(self.df.columns)
+
         self.save_process_step("step7_onehot_encoded.csv")
 
+    def one_hot_columns(self) -> list[str]:
+        return [
+            f"{col}_{category}"
+            for col, vocab in self.state["one_hot"].items()
+            for category in vocab["categories"]
+            if category != vocab["dropped"]
+        ]
+
+    def _apply_one_hot_state(self):
+        dummies = {}
+
+        for col, vocab in self.state["one_hot"].items():
+            if col not in self.df.columns:
+                continue
+
+            values = self.df[col].astype(str)
+            for category in vocab["categories"]:
+                if category != vocab["dropped"]:
+                    dummies[f"{col}_{category}"] = (values == category).to_numpy()
+
+        self.df = pd.concat(
+            [
+                self.df.drop(columns=list(self.state["one_hot"]), errors="ignore"),
+                pd.DataFrame(dummies, index=self.df.index)
+            ],
+            axis=1
+        )
+
     # ========================================================
     # STEP 8 — FINAL SAVE
     # ========================================================
 
+    def compact_final(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Arrow çıktısı için dtype sıkıştırma: binary kolonlar uint8,
+        numericler float32; hedefler, id ve ürün adı olduğu gibi kalır.
+        CSV metin olduğundan okuyucular yüklerken compact_dtypes kullanır.
+        """
+        if self.storage != "arrow":
+            return df
+        return compact_dtypes(
+            df,
+            binary_columns=self.binary_columns,
+            exclude=self.TARGET_COLUMNS,
+            categorize=False
+        )
+
+    def to_sparse(self, df: pd.DataFrame) -> tuple:
+        """
+        Final tabloyu (CSR matris, kolonlar, labels) olarak döner; hedef ve id
+        kolonları matrise girmez, labels olarak ayrı tutulur
+        """
+        matrix, columns = frame_to_csr(
+            df.drop(columns=self.TARGET_COLUMNS, errors="ignore"),
+            self.one_hot_columns()
+        )
+        labels = {
+            col: df[col].to_numpy()
+            for col in self.TARGET_COLUMNS
+            if col in df.columns and pd.api.types.is_numeric_dtype(df[col])
+        }
+        return matrix, columns, labels
+
+    def save_sparse_final(self, matrix, columns: list[str], labels: dict):
+        path = write_sparse_dataset(
+            self.output_dir / "final_dataset.csv",
+            matrix,
+            columns,
+            self.one_hot_columns(),
+            labels
+        )
+        print(f"Sparse final: {path.name} {matrix.shape}, nnz={matrix.nnz}")
+
     def step8_finalize(self):
+        before = memory_mb(self.df)
+        self.df = self.compact_final(self.df)
+        print(f"Memory: {before:.2f} MB → {memory_mb(self.df):.2f} MB")
+
+        if self.encoding == "sparse" and self.mode == "train":
+            self.save_sparse_final(*self.to_sparse(self.df))
+
         self.save_process_step("step8_final_dataset.csv")
         self.save_final_step("final_dataset.csv")
+        self.save_state()
+        self.wait_for_snapshots()
         print("Final Shape:", self.df.shape)
-        print("Missing values left:", self.df.isnull().sum().sum())
+        # Kolon bazlı: sparse + dense karışık tabloda satır reduksiyonu çalışmaz
+        print("Missing values left:", sum(int(self.df[col].isna().sum()) for col in self.df.columns))
+
+    # ========================================================
+    # FITTED STATE
+    # ========================================================
+
+    def save_state(self):
+        if self.mode == "train":
+            with open(self.state_path, "w", encoding="utf-8") as f:
+                json.dump(self.state, f, ensure_ascii=False, indent=2)
+
+    def load_state(self):
+        # Predict modunda tek sefer yüklenir, her istekte tekrar okunmaz
+        if not self.state:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                self.state = json.load(f)
+        return self.state
+
+    # ========================================================
+    # STEP CACHE
+    # ========================================================
+
+    @staticmethod
+    def _file_hash(path) -> str:
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def _stage_fingerprint(self, method: str, dependencies: tuple) -> str:
+        digest = hashlib.sha256()
+
+        for name in (method, *dependencies):
+            # Instance ayarları (ör. encoding) da bağımlılık olabilir
+            value = inspect.getattr_static(self, name)
+            if isinstance(value, (staticmethod, classmethod)):
+                value = value.__func__
+            if callable(value) and not isinstance(value, re.Pattern):
+                try:
+                    digest.update(inspect.getsource(value).encode("utf-8"))
+                except OSError:
+                    # Kaynağı olmayan (ör. interaktif tanımlı) metodlar
+                    digest.update(marshal.dumps(value.__code__))
+            else:
+                digest.update(repr(value).encode("utf-8"))
+
+        return digest.hexdigest()
+
+    def _stage_keys(self) -> list[str]:
+        key = self._file_hash(self.input_path)
+        keys = []
+
+        for method, _, dependencies in self.STAGES:
+            key = hashlib.sha256(
+                (key + self._stage_fingerprint(method, dependencies)).encode("utf-8")
+            ).hexdigest()
+            keys.append(key)
+
+        return keys
+
+    def _stage_cache_path(self, method: str, key: str) -> Path:
+        return self.cache_dir / f"{method}_{key[:16]}.pkl"
+
+    def _save_stage(self, method: str, key: str):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self._stage_cache_path(method, key)
+
+        # Adım başına yalnızca son sürüm tutulur
+        for old in self.cache_dir.glob(f"{method}_*.pkl"):
+            if old != path:
+                old.unlink()
+
+        tmp_path = path.with_suffix(".tmp")
+        pd.to_pickle(
+            {
+                "df": self.df,
+                "state": copy.deepcopy(self.state),
+                "binary_columns": getattr(self, "binary_columns", None),
+            },
+            tmp_path
+        )
+        os.replace(tmp_path, path)
+
+    def _load_stage(self, method: str, key: str):
+        payload = pd.read_pickle(self._stage_cache_path(method, key))
+
+        self.df = payload["df"]
+        self.state = payload["state"]
+        if payload["binary_columns"] is not None:
+            self.binary_columns = payload["binary_columns"]
 
     # ========================================================
     # RUN ALL
     # ========================================================
 
     def run(self):
+        """
+        Tüm adımları çalıştırır. cache_dir verilmişse ilk geçersiz adıma kadar
+        olan adımlar atlanır; son geçerli adımın çıktısı cache'ten yüklenir.
+        """
+        keys = (
+            self._stage_keys() if self.cache_dir
+            else [None] * len(self.STAGES)
+        )
+
+        first_miss = len(self.STAGES)
+        for i, ((method, _, _), key) in enumerate(zip(self.STAGES, keys)):
+            if key is None or not self._stage_cache_path(method, key).exists():
+                first_miss = i
+                break
+
+        try:
+            for i, ((method, snapshot, _), key) in enumerate(zip(self.STAGES, keys)):
+                self.check_snapshots()
+                start = time.perf_counter()
+
+                if i < first_miss:
+                    # Zorunlu snapshot'lar cache'ten de yeniden yazılır
+                    if snapshot in self.MANDATORY_SNAPSHOTS or i == first_miss - 1:
+                        self._load_stage(method, key)
+                    if snapshot in self.MANDATORY_SNAPSHOTS:
+                        self.save_process_step(snapshot)
+                    status = "hit"
+                else:
+                    getattr(self, method)()
+                    if key is not None:
+                        self._save_stage(method, key)
+                    status = "miss" if key is not None else "run"
+
+                print(f"{method:<24} {status:<5} {(time.perf_counter() - start) * 1000:>9.1f} ms")
+
+            start = time.perf_counter()
+            self.step8_finalize()
+            print(f"{'step8_finalize':<24} {'run':<5} {(time.perf_counter() - start) * 1000:>9.1f} ms")
+        finally:
+            # Bir adım hata verse de havuzlar kapanır, bekleyen snapshot'lar toplanır
+            self.close_workers()
+            self.wait_for_snapshots()
+
+        print("Tüm adımlar tamamlandı.")
 
-        self.step0_load()
+    # ========================================================
+    # CHUNKED (OUT-OF-CORE) MODE
+    # ========================================================
+
+    @staticmethod
+    def _merge_kind(current: str | None, dtype) -> str:
+        """
+        Chunk'larda görülen dtype'ları read_csv'nin tüm dosyada çıkaracağı
+        tipe birleştirir: int + float → float, diğer karışımlar → str
+        """
+        if pd.api.types.is_bool_dtype(dtype):
+            kind = "bool"
+        elif pd.api.types.is_integer_dtype(dtype):
+            kind = "int64"
+        elif pd.api.types.is_float_dtype(dtype):
+            kind = "float64"
+        else:
+            kind = "str"
+
+        if current is None or current == kind:
+            return kind
+        if {current, kind} == {"int64", "float64"}:
+            return "float64"
+        return "str"
+
+    def _iter_raw_chunks(
+        self,
+        chunk_size: int,
+        columns: list[str] | None = None,
+        dtypes: dict | None = None,
+    ) -> Iterator[pd.DataFrame]:
+        path = str(self.input_path)
+
+        if not path.endswith(".jsonl"):
+            yield from pd.read_csv(
+                path,
+                usecols=columns,
+                dtype=dtypes,
+                chunksize=chunk_size
+            )
+            return
+
+        with open(path, "r", encoding="utf-8") as f:
+            while True:
+                lines = list(itertools.islice(f, chunk_size))
+                if not lines:
+                    break
+
+                chunk = pd.DataFrame([json.loads(line) for line in lines if line.strip()])
+                if columns is not None:
+                    chunk = chunk.reindex(columns=columns)
+                yield self._coerce_jsonl_frame(chunk, dtypes)
+
+    def _scan_schema(self, chunk_size: int) -> tuple[list[str], dict]:
+        """
+        Pass 0: step1'in tutacağı kolonlar ve tüm dosya için ortak dtype'ları
+        """
+        path = str(self.input_path)
+
+        if not path.endswith(".jsonl"):
+            header = pd.read_csv(path, nrows=0).columns
+            columns = [col for col in header if col in self.INCLUDE_COLUMNS]
+        else:
+            columns = None
+
+        kinds = {}
+        seen_in = {}
+        n_chunks = 0
+
+        for chunk in self._iter_raw_chunks(chunk_size, columns):
+            n_chunks += 1
+            for col in chunk.columns:
+                if col in self.INCLUDE_COLUMNS:
+                    kinds[col] = self._merge_kind(kinds.get(col), chunk[col].dtype)
+                    seen_in[col] = seen_in.get(col, 0) + 1
+
+        # JSONL'de bazı chunk'larda hiç geçmeyen kolon o satırlarda NaN olur
+        for col, count in seen_in.items():
+            if count < n_chunks:
+                kinds[col] = self._merge_kind(kinds[col], np.float64)
+
+        return columns or list(kinds), kinds
+
+    def _run_chunk_steps(self, chunk: pd.DataFrame, step4_writer=None):
+        self.df = chunk
         self.step1_keep_columns()
         self.step2_drop_null_target()
         self.step3_log_transform()
         self.step4_numeric_cleaning()
+
+        if step4_writer is not None:
+            step4_writer.write(self.df)
+
         self.step5_binary_mapping()
-        self.step6_handle_missing()
-        self.step7_one_hot()
-        self.step8_finalize()
 
+    def _collect_statistics(self, chunk_size: int, columns: list[str], dtypes: dict) -> dict:
+        """
+        Pass 1: step6 medianları (streaming quantile) ve step7 kategori
+        sözlükleri; state step5-7'deki tam mod ile aynı sırayla doldurulur
+        """
+        kinds = {}
+        quantiles = {}
+        categories = {}
+
+        for chunk in self._iter_raw_chunks(chunk_size, columns, dtypes):
+            self._run_chunk_steps(chunk)
+            self.df.replace(r'^\s*$', np.nan, regex=True, inplace=True)
+
+            for col in self.df.columns:
+                kinds[col] = self._merge_kind(kinds.get(col), self.df[col].dtype)
+
+                if kinds[col] in ("int64", "float64"):
+                    if col not in self.binary_columns:
+                        quantiles.setdefault(col, StreamingQuantile()).update(
+                            self.df[col].to_numpy(dtype=np.float64)
+                        )
+                elif kinds[col] == "str":
+                    categories.setdefault(col, CategoryCounter()).update(
+                        self.df[col].fillna("Unknown").unique()
+                    )
+
+        # STEP 6
+        medians = {
+            col: quantiles[col].median() if col in quantiles else float("nan")
+            for col, kind in kinds.items()
+            if kind in ("int64", "float64") and col not in self.binary_columns
+        }
+        categorical_cols = [col for col, kind in kinds.items() if kind == "str"]
+
+        self.state["medians"] = medians
+        self.state["categorical_columns"] = categorical_cols
+
+        # STEP 7
+        one_hot = {}
+        for col in categorical_cols:
+            vocab = categories[col].categories()
+            if vocab is not None:
+                one_hot[col] = {
+                    "categories": vocab,
+                    "dropped": vocab[0] if vocab else None
+                }
+
+        self.state["one_hot"] = one_hot
+        self.state["columns"] = [
+            col for col in kinds if col not in one_hot
+        ] + self.one_hot_columns()
+
+        return kinds
+
+    def run_chunked(self, chunk_size: int = 100_000):
+        """
+        RAM'e sığmayan kataloglar için iki geçişli mod:
+        1) chunk'lar üzerinden medianlar ve kategori sözlükleri toplanır
+        2) her chunk bu istatistiklerle dönüştürülüp step4 ve final çıktısına
+           eklenir
+        Bellek chunk_size ile sınırlıdır; ara adım snapshot'ları yazılmaz.
+        """
+        if self.mode != "train":
+            raise ValueError("run_chunked sadece train modunda kullanılabilir")
+
+        self._chunked = True
+        try:
+            columns, dtypes = self._scan_schema(chunk_size)
+            kinds = self._collect_statistics(chunk_size, columns, dtypes)
+
+            step4_writer = ChunkedDatasetWriter(
+                self.processed_dir / "step4_numeric_cleaned.csv", self.storage
+            )
+            final_writer = ChunkedDatasetWriter(
+                self.output_dir / "final_dataset.csv", self.storage
+            )
+            sparse_parts = []
+
+            with step4_writer, final_writer:
+                for chunk in self._iter_raw_chunks(chunk_size, columns, dtypes):
+                    self._run_chunk_steps(chunk, step4_writer)
+
+                    # Chunk'ta NaN olmayan kolonlar tüm dosyadaki tipe çekilir
+                    for col, kind in kinds.items():
+                        if kind != "str" and self.df[col].dtype != kind:
+                            self.df[col] = self.df[col].astype(kind)
+
+                    # STEP 6
+                    self.df.replace(r'^\s*$', np.nan, regex=True, inplace=True)
+
+                    for col in self.binary_columns:
+                        if col in self.df.columns:
+                            self.df[col] = self.df[col].fillna(0)
+
+                    for col, median in self.state["medians"].items():
+                        self.df[col] = self.df[col].fillna(median)
+
+                    for col in self.state["categorical_columns"]:
+                        self.df[col] = self.df[col].fillna("Unknown")
+
+                    # STEP 7
+                    self._apply_one_hot_state()
+                    self.df = self.df[self.state["columns"]]
+
+                    final_writer.write(self.compact_final(self.df))
+
+                    if self.encoding == "sparse":
+                        sparse_parts.append(self.to_sparse(self.df))
+        finally:
+            self._chunked = False
+            self.close_workers()
+
+        if sparse_parts:
+            self.save_sparse_final(
+                sparse.vstack([matrix for matrix, _, _ in sparse_parts], format="csr"),
+                sparse_parts[0][1],
+                {
+                    col: np.concatenate([labels[col] for _, _, labels in sparse_parts])
+                    for col in sparse_parts[0][2]
+                }
+            )
+
+        self.save_state()
+        print("Final Shape:", (final_writer.rows, len(self.state["columns"])))
         print("Tüm adımlar tamamlandı.")
 
     def transform_for_prediction(self, input_df: pd.DataFrame):
+        """
+        Eğitimde kaydedilen preprocessor_state.json ile dönüştürür;
+        istek başına median / kategori istatistiği hesaplanmaz.
+        """
+        self.load_state()
         self.df = input_df.copy()
 
         # STEP 4
@@ -295,6 +1074,7 @@ if __name__ == "__main__":
         input_path="src/app/output/dataset/raw/raw_dataset.csv",
         processed_dir="src/app/output/dataset/processed",
         output_dir="src/app/output/dataset/final",
+        cache_dir="src/app/output/dataset/cache/steps",
     )
 
     processor.run()
@@ -0,0 +1,150 @@
+import hashlib
+import mimetypes
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+
+class EpeyFixtureServer:
+    """
+    Kaydedilmiş epey sayfalarını yerelde sunan HTTP stand-in.
+    - URL path'i fixture dizinindeki dosyaya eşlenir ("/" ile bitenler index.html)
+    - HTML içindeki gerçek site adresleri sunucunun kendi adresine çevrilir,
+      böylece scraper hiçbir isteği dışarı göndermez
+    - delay=(min, max): her cevap rastgele gecikir, sayfalar sırayla bitmez
+    - her cevap içerik hash'inden bir ETag taşır; eşleşen If-None-Match 304 döner
+    - requests: (başlangıç, bitiş, path) kayıtları; rate limit ve eşzamanlılık
+      kontrolü için (time.monotonic)
+
+    Kullanım:
+        with EpeyFixtureServer("src/app/scripts/benchmark/fixtures/epey") as base_url:
+            scraper = EpeyPhoneScraper(
+                base_url=base_url,
+                list_base=f"{base_url}/akilli-telefonlar",
+                workers=4,
+            )
+    """
+
+    def __init__(
+        self,
+        fixture_dir: str | Path,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        rewrite_hosts: tuple[str, ...] = (
+            "https://www.epey.com",
+            "https://cdn.epey.com",
+        ),
+        delay: tuple[float, float] = (0.0, 0.0),
+    ):
+        self.fixture_dir = Path(fixture_dir).resolve()
+        self.host = host
+        self.port = port
+        self.rewrite_hosts = rewrite_hosts
+        self.delay = delay
+
+        self.requests = []
+        self._requests_lock = threading.Lock()
+
+        self._httpd = None
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self._httpd.server_address[1]}"
+
+    def _resolve(self, url_path: str) -> Path | None:
+        relative = url_path.split("?", 1)[0].lstrip("/")
+        if not relative or relative.endswith("/"):
+            relative += "index.html"
+
+        path = (self.fixture_dir / relative).resolve()
+        if self.fixture_dir not in path.parents or not path.is_file():
+            return None
+        return path
+
+    def _build_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+
+            def do_GET(self):
+                start = time.monotonic()
+                try:
+                    self._respond()
+                except (BrokenPipeError, ConnectionResetError):
+                    # İstemci cevabı beklemeden kapandı (ör. öldürülen scraper)
+                    pass
+                finally:
+                    with server._requests_lock:
+                        server.requests.append((start, time.monotonic(), self.path))
+
+            def _respond(self):
+                if server.delay[1] > 0:
+                    time.sleep(random.uniform(*server.delay))
+
+                path = server._resolve(self.path)
+
+                if path is None:
+                    self.send_error(404)
+                    return
+
+                body = path.read_bytes()
+                content_type = mimetypes.guess_type(path.name)[0] or "text/html"
+
+                if content_type == "text/html":
+                    text = body.decode("utf-8")
+                    for host in server.rewrite_hosts:
+                        text = text.replace(host, server.base_url)
+                    body = text.encode("utf-8")
+                    content_type = "text/html; charset=utf-8"
+
+                etag = f'"{hashlib.sha256(body).hexdigest()[:16]}"'
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.end_headers()
+                    return
+
+                self.send_response(200)
+                self.send_header("ETag", etag)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self) -> str:
+        self._httpd = ThreadingHTTPServer((self.host, self.port), self._build_handler())
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self.base_url
+
+    def stop(self):
+        if self._httpd:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+
+    def __enter__(self) -> str:
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+if __name__ == "__main__":
+    import sys
+
+    # python fixture_server.py <fixture_dir> [port]
+    fixture_server = EpeyFixtureServer(
+        sys.argv[1],
+        port=int(sys.argv[2]) if len(sys.argv) > 2 else 8000
+    )
+    print(f"Fixture server: {fixture_server.start()}")
+    fixture_server._thread.join()
@@ -0,0 +1,189 @@
+import multiprocessing
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+
+# String kolonlar tek bir UTF-8 buffer'ında bu ayraçla birleştirilir
+SEPARATOR = "\x00"
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    # spawn edilen worker'lar ana sürecin resource_tracker'ını paylaşır;
+    # segmentleri ana süreç unlink eder
+    return shared_memory.SharedMemory(name=name)
+
+
+def _run_column(fn, spec: dict, out_spec: dict) -> tuple[str, object]:
+    """
+    Worker: kolonu paylaşılan bellekten okur, fn'i uygular, sonucu çıktı
+    bloğundaki kendi satırına yazar. Dönüş: (sonuç dtype'ı, fn'in ek çıktısı)
+    """
+    segments = [_attach(spec["name"])]
+    n_rows = spec["n_rows"]
+
+    if spec["mask"] is None:
+        values = np.ndarray((n_rows,), dtype=np.float64, buffer=segments[0].buf)
+        series = pd.Series(values.copy(), name=spec["column"])
+    else:
+        segments.append(_attach(spec["mask"]))
+        mask = np.ndarray((n_rows,), dtype=np.bool_, buffer=segments[1].buf)
+
+        text = bytes(segments[0].buf[:spec["nbytes"]]).decode("utf-8")
+        objects = np.array(text.split(SEPARATOR), dtype=object)
+        objects[mask] = np.nan
+        # Seri yoldaki girdiyle aynı dtype
+        series = pd.Series(objects, dtype="str", name=spec["column"])
+
+    result = fn(series)
+    extra = None
+    if isinstance(result, tuple):
+        result, extra = result
+
+    out_shm = _attach(out_spec["name"])
+    out = np.ndarray(out_spec["shape"], dtype=np.float64, buffer=out_shm.buf)
+    out[out_spec["row"]] = result.to_numpy(dtype=np.float64)
+
+    dtype = str(result.dtype)
+
+    del out
+    if spec["mask"] is None:
+        del values
+    else:
+        del mask
+    for shm in (*segments, out_shm):
+        shm.close()
+
+    return dtype, extra
+
+
+class ParallelColumnExecutor:
+    """
+    Kolon bazlı bağımsız işleri (numeric parse, Var/Yok map, median fill)
+    process havuzunda çalıştırır.
+    - Girdi kolonları shared memory'ye bir kez yazılır (string kolonlar ayraçla
+      birleştirilmiş UTF-8 + NaN maskesi, float kolonlar float64)
+    - Worker'lar sonucu ortak (kolon × satır) float64 bloğuna yazar; sonuçlar
+      pickle ile taşınmaz, ana süreçte bloktan tek kopya ile alınır
+    """
+
+    def __init__(self, workers: int):
+        self.workers = workers
+        self._pool = None
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # spawn: arka plan snapshot thread'i varken fork güvenli değil
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._pool
+
+    @staticmethod
+    def _share(data: bytes | np.ndarray) -> shared_memory.SharedMemory:
+        view = memoryview(data).cast("B")
+        shm = shared_memory.SharedMemory(create=True, size=max(len(view), 1))
+        shm.buf[:len(view)] = view
+        return shm
+
+    def _share_column(self, series: pd.Series) -> tuple[dict, list] | None:
+        """
+        Kolonu shared memory'ye yazar. String olmayan ya da ayraç içeren
+        değerli kolonlar paylaşılamaz (None), ana süreçte çalıştırılır.
+        """
+        spec = {"column": series.name, "n_rows": len(series), "mask": None}
+
+        if pd.api.types.is_float_dtype(series.dtype):
+            segments = [self._share(series.to_numpy(dtype=np.float64))]
+        else:
+            mask = series.isna().to_numpy()
+            try:
+                text = SEPARATOR.join(series.astype(object).where(~mask, "").tolist())
+            except TypeError:
+                return None
+            if text.count(SEPARATOR) != max(len(series) - 1, 0):
+                return None
+
+            data = text.encode("utf-8")
+            segments = [self._share(data), self._share(mask)]
+            spec["nbytes"] = len(data)
+            spec["mask"] = segments[1].name
+
+        spec["name"] = segments[0].name
+        return spec, segments
+
+    def map(self, df: pd.DataFrame, tasks: dict) -> dict[str, tuple[np.ndarray, object]]:
+        """
+        tasks: {kolon: fn}; fn(Series) → Series ya da (Series, ek çıktı).
+        Her kolon için {kolon: (sonuç dizisi, ek çıktı)} döner.
+        """
+        if not tasks:
+            return {}
+
+        columns = list(tasks)
+
+        shape = (len(columns), len(df))
+        out_shm = shared_memory.SharedMemory(
+            create=True,
+            size=max(int(np.prod(shape)) * 8, 1)
+        )
+        segments = [out_shm]
+
+        try:
+            pool = self._get_pool()
+            futures = {}
+            local = {}
+
+            for row, col in enumerate(columns):
+                shared = self._share_column(df[col])
+                if shared is None:
+                    local[col] = tasks[col]
+                    continue
+
+                spec, column_segments = shared
+                segments.extend(column_segments)
+                futures[col] = pool.submit(
+                    _run_column,
+                    tasks[col],
+                    spec,
+                    {"name": out_shm.name, "shape": shape, "row": row}
+                )
+
+            # Paylaşılamayan kolonlar worker'lar çalışırken ana süreçte
+            local_results = {}
+            for col, fn in local.items():
+                result = fn(df[col])
+                local_results[col] = result if isinstance(result, tuple) else (result, None)
+
+            outputs = {col: future.result() for col, future in futures.items()}
+
+            # Paylaşılan bloktan tek kopya; segmentler kapatılabilir
+            block = np.array(
+                np.ndarray(shape, dtype=np.float64, buffer=out_shm.buf)
+            )
+        finally:
+            for shm in segments:
+                shm.close()
+                shm.unlink()
+
+        results = {}
+        for row, col in enumerate(columns):
+            if col in local_results:
+                series, extra = local_results[col]
+                results[col] = (series.to_numpy(), extra)
+                continue
+
+            dtype, extra = outputs[col]
+            values = block[row]
+            if values.dtype != dtype:
+                values = values.astype(dtype)
+            results[col] = (values, extra)
+
+        return results
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
@@ -0,0 +1,112 @@
+import numpy as np
+
+
+class StreamingQuantile:
+    """
+    Chunk'lar üzerinde artımlı median / quantile.
+    Farklı değer sayısı max_bins'i geçene kadar değer → adet sayımı tutulur ve
+    sonuç pandas median'ı ile birebir aynıdır. Geçildiğinde sayım, eşit ağırlıklı
+    max_bins // 2 merkeze sıkıştırılır (histogram sketch); bellek satır sayısından
+    bağımsız kalır, rank hatası en fazla n / (max_bins // 2) olur.
+    """
+
+    def __init__(self, max_bins: int = 10_000):
+        self.max_bins = max_bins
+        self.counts = {}
+        self.n = 0
+        self.exact = True
+
+    def update(self, values) -> None:
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+
+        if not len(values):
+            return
+
+        uniques, counts = np.unique(values, return_counts=True)
+        for value, count in zip(uniques.tolist(), counts.tolist()):
+            self.counts[value] = self.counts.get(value, 0) + count
+
+        self.n += len(values)
+
+        if len(self.counts) > self.max_bins:
+            self._compact()
+
+    def _compact(self) -> None:
+        values = np.array(sorted(self.counts), dtype=np.float64)
+        counts = np.array([self.counts[v] for v in values], dtype=np.float64)
+
+        # Kümülatif adede göre eşit ağırlıklı gruplar; merkez = ağırlıklı ortalama
+        n_bins = self.max_bins // 2
+        groups = np.minimum(
+            (np.cumsum(counts) - counts) * n_bins // counts.sum(),
+            n_bins - 1
+        ).astype(np.int64)
+
+        weights = np.bincount(groups, weights=counts)
+        centers = np.bincount(groups, weights=values * counts)
+
+        mask = weights > 0
+        self.counts = dict(zip(
+            (centers[mask] / weights[mask]).tolist(),
+            weights[mask].astype(np.int64).tolist()
+        ))
+        self.exact = False
+
+    def _value_at(self, rank: int, values: np.ndarray, cumulative: np.ndarray) -> float:
+        return float(values[np.searchsorted(cumulative, rank, side="right")])
+
+    def quantile(self, q: float) -> float:
+        """
+        pandas / numpy "linear" interpolasyonu ile q. quantile
+        """
+        if self.n == 0:
+            return float("nan")
+
+        values = np.array(sorted(self.counts), dtype=np.float64)
+        cumulative = np.cumsum([self.counts[v] for v in values])
+
+        position = q * (self.n - 1)
+        lower = int(np.floor(position))
+        upper = int(np.ceil(position))
+
+        low = self._value_at(lower, values, cumulative)
+        if upper == lower:
+            return low
+
+        high = self._value_at(upper, values, cumulative)
+
+        # Series.median iki orta değerin ortalamasını alır
+        if q == 0.5:
+            return float(np.mean([low, high]))
+        return low + (high - low) * (position - lower)
+
+    def median(self) -> float:
+        return self.quantile(0.5)
+
+
+class CategoryCounter:
+    """
+    Kolon başına farklı değerler; max_categories'i geçen kolon yüksek
+    kardinaliteli sayılır ve değerleri tutulmaz.
+    """
+
+    def __init__(self, max_categories: int = 20):
+        self.max_categories = max_categories
+        self.values = set()
+        self.overflow = False
+
+    def update(self, values) -> None:
+        if self.overflow:
+            return
+
+        self.values.update(values)
+
+        if len(self.values) > self.max_categories:
+            self.values = set()
+            self.overflow = True
+
+    def categories(self) -> list[str] | None:
+        if self.overflow:
+            return None
+        return sorted(str(value) for value in self.values)
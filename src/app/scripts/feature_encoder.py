@@ -0,0 +1,181 @@
+import numpy as np
+
+from .dataset.dataset_processor import ProductDataPreprocessor
+
+
+class CompiledFeatureEncoder:
+    """
+    Pandas'sız inference encoder'ı.
+    model_features.json ve preprocessor_state.json'dan servis açılışında bir kez derlenir,
+    JSON dict'i doğrudan model feature sırasındaki float32 satıra çevirir:
+    - numeric: sayı parse + median fallback
+    - binary: Var/Yok → 1/0 (eksik → 0)
+    - one-hot: kategori → slot index (eksik → Unknown slotu)
+    """
+
+    def __init__(
+        self,
+        model_features: list[str],
+        numeric_slots: dict[str, tuple[int, float, bool]],
+        binary_slots: dict[str, int],
+        onehot_slots: dict[str, dict[str, int]],
+        binary_map: dict[str, int],
+    ):
+        self.model_features = model_features
+        self.numeric_slots = numeric_slots
+        self.binary_slots = binary_slots
+        self.onehot_slots = onehot_slots
+        self.binary_map = binary_map
+
+        self.unknown_slots = {
+            col: slots["Unknown"]
+            for col, slots in onehot_slots.items()
+            if "Unknown" in slots
+        }
+
+        # Tüm feature'lar eksik olduğunda üretilecek satır
+        self.template = np.zeros(len(model_features), dtype=np.float32)
+
+        for idx, median, _ in numeric_slots.values():
+            self.template[idx] = median
+
+        for idx in self.unknown_slots.values():
+            self.template[idx] = 1.0
+
+    # =====================================
+    # BUILD
+    # =====================================
+
+    @classmethod
+    def from_state(
+        cls,
+        model_features: list[str],
+        state: dict,
+    ) -> "CompiledFeatureEncoder":
+        """
+        state: ProductDataPreprocessor'ın kaydettiği preprocessor_state.json
+        """
+        feature_index = {name: idx for idx, name in enumerate(model_features)}
+        cleaned_columns = set(state["numeric_columns"])
+
+        numeric_slots = {
+            col: (feature_index[col], median, col in cleaned_columns)
+            for col, median in state["medians"].items()
+            if col in feature_index
+        }
+
+        binary_slots = {
+            col: feature_index[col]
+            for col in state["binary_columns"]
+            if col in feature_index
+        }
+
+        # Eğitimde drop edilen kategori ve sözlük dışı değerler tüm sıfırlar
+        onehot_slots = {}
+        for col, vocab in state["one_hot"].items():
+            onehot_slots[col] = {
+                category: feature_index[f"{col}_{category}"]
+                for category in vocab["categories"]
+                if f"{col}_{category}" in feature_index
+            }
+
+        return cls(
+            model_features,
+            numeric_slots,
+            binary_slots,
+            onehot_slots,
+            state["binary_map"]
+        )
+
+    # =====================================
+    # HELPERS
+    # =====================================
+
+    @staticmethod
+    def _is_missing(value) -> bool:
+        if value is None:
+            return True
+        if isinstance(value, float):
+            return value != value
+        if isinstance(value, str):
+            return not value.strip()
+        return False
+
+    def _parse_numeric(self, value, cleaned: bool) -> float:
+        if cleaned:
+            return ProductDataPreprocessor.extract_numeric(value)
+
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return np.nan
+
+    def _fill(self, row: np.ndarray, record: dict) -> None:
+        for key, value in record.items():
+            if key in self.numeric_slots:
+                idx, median, cleaned = self.numeric_slots[key]
+                parsed = (
+                    np.nan if self._is_missing(value)
+                    else self._parse_numeric(value, cleaned)
+                )
+                row[idx] = median if parsed != parsed else parsed
+
+            elif key in self.binary_slots:
+                flag = str(value).strip().lower()
+                row[self.binary_slots[key]] = self.binary_map.get(flag, 0)
+
+            elif key in self.onehot_slots:
+                category = (
+                    "Unknown" if self._is_missing(value) else str(value)
+                )
+                if key in self.unknown_slots:
+                    row[self.unknown_slots[key]] = 0.0
+
+                idx = self.onehot_slots[key].get(category)
+                if idx is not None:
+                    row[idx] = 1.0
+
+    def weight_vector(self, weights: dict[str, float]) -> np.ndarray:
+        """
+        Input alanı → ağırlık eşlemesini feature başına vektöre çevirir.
+        Kategorik bir alanın ağırlığı tüm one-hot kolonlarına uygulanır.
+        """
+        vector = np.ones(len(self.model_features), dtype=np.float64)
+        feature_index = {name: idx for idx, name in enumerate(self.model_features)}
+
+        for name, weight in weights.items():
+            try:
+                weight = float(weight)
+            except (TypeError, ValueError, OverflowError):
+                raise ValueError(f"Weight for {name} must be a number")
+            if not np.isfinite(weight):
+                raise ValueError(f"Weight for {name} must be finite")
+            if weight < 0:
+                raise ValueError(f"Negative weight for {name}")
+
+            if name in self.onehot_slots:
+                for idx in self.onehot_slots[name].values():
+                    vector[idx] = weight
+            elif name in feature_index:
+                vector[feature_index[name]] = weight
+            else:
+                raise ValueError(f"Unknown feature: {name}")
+
+        return vector
+
+    # =====================================
+    # ENCODE
+    # =====================================
+
+    def encode(self, record: dict) -> np.ndarray:
+        row = self.template.copy()
+        self._fill(row, record)
+        return row.reshape(1, -1)
+
+    def encode_many(self, records: list[dict]) -> np.ndarray:
+        matrix = np.tile(self.template, (len(records), 1))
+
+        for i, record in enumerate(records):
+            self._fill(matrix[i], record)
+
+        return matrix
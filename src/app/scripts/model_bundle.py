@@ -0,0 +1,231 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+import xgboost as xgb
+
+# Bundle düzeni (task model klasörü altında):
+#   versions/<versiyon>/model.ubj, model_features.json, [sparse_features.json],
+#                       [preprocessor_state.json], metrics.json, manifest.json
+#   CURRENT             yayındaki versiyonun adı
+BUNDLE_FORMAT = 1
+VERSIONS_DIR = "versions"
+CURRENT_FILE = "CURRENT"
+MANIFEST_FILE = "manifest.json"
+MODEL_FILE = "model.ubj"
+FEATURES_FILE = "model_features.json"
+SPARSE_FEATURES_FILE = "sparse_features.json"
+STATE_FILE = "preprocessor_state.json"
+METRICS_FILE = "metrics.json"
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    # Okuyucular ya eski ya yeni içeriği görür, yarım dosya görmez
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(tmp, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def current_version(model_dir: Path) -> str | None:
+    path = Path(model_dir) / CURRENT_FILE
+    if not path.exists():
+        return None
+    return path.read_text(encoding="utf-8").strip() or None
+
+
+def list_versions(model_dir: Path) -> list[str]:
+    """
+    versions/ altındaki tamamlanmış versiyonlar, eskiden yeniye (adlar
+    zaman damgasıyla başlar; staging klasörleri hariç)
+    """
+    versions_dir = Path(model_dir) / VERSIONS_DIR
+    if not versions_dir.exists():
+        return []
+    return sorted(
+        path.name for path in versions_dir.iterdir()
+        if path.is_dir() and not path.name.startswith(".")
+    )
+
+
+def write_bundle(
+    model_dir: Path,
+    booster: xgb.Booster,
+    features: list[str],
+    metrics: dict,
+    target: str,
+    sparse_features: list[str] | None = None,
+    state_path: Path | None = None,
+    keep: int = 5,
+) -> str:
+    """
+    Yeni versiyonu staging klasöründe yazar, manifest'e checksum'ları ekler,
+    klasörü tek rename ile versions/ altına taşır ve CURRENT'ı atomik olarak
+    günceller. Son keep versiyon saklanır. Versiyon adını döner.
+    """
+    model_dir = Path(model_dir)
+    versions_dir = model_dir / VERSIONS_DIR
+    versions_dir.mkdir(parents=True, exist_ok=True)
+
+    files = {
+        MODEL_FILE: bytes(booster.save_raw("ubj")),
+        FEATURES_FILE: json.dumps(features).encode("utf-8"),
+        METRICS_FILE: json.dumps(metrics, indent=2, default=float).encode("utf-8"),
+    }
+    if sparse_features is not None:
+        files[SPARSE_FEATURES_FILE] = json.dumps(sparse_features).encode("utf-8")
+    if state_path is not None and Path(state_path).exists():
+        files[STATE_FILE] = Path(state_path).read_bytes()
+
+    checksums = {name: _sha256(data) for name, data in files.items()}
+    created_at = datetime.now()
+    version = f"{created_at:%Y%m%dT%H%M%S}-{checksums[MODEL_FILE][:8]}"
+
+    best_iteration = booster.attr("best_iteration")
+    manifest = {
+        "format": BUNDLE_FORMAT,
+        "version": version,
+        "target": target,
+        "created_at": created_at.isoformat(),
+        "xgboost_version": xgb.__version__,
+        "best_iteration": int(best_iteration) if best_iteration is not None else None,
+        "num_boosted_rounds": booster.num_boosted_rounds(),
+        "files": checksums,
+    }
+
+    staging = Path(tempfile.mkdtemp(prefix=".staging-", dir=versions_dir))
+    try:
+        for name, data in files.items():
+            (staging / name).write_bytes(data)
+        # Manifest en son: manifest'i olan klasör tamdır
+        (staging / MANIFEST_FILE).write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+
+        target_dir = versions_dir / version
+        if target_dir.exists():
+            # Aynı saniyede aynı model: içerik birebir aynı
+            shutil.rmtree(staging)
+        else:
+            os.replace(staging, target_dir)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+    _atomic_write(model_dir / CURRENT_FILE, version.encode("utf-8"))
+    _prune(model_dir, keep, version)
+
+    return version
+
+
+def _prune(model_dir: Path, keep: int, current: str) -> None:
+    for version in list_versions(model_dir)[:-keep]:
+        if version != current:
+            shutil.rmtree(model_dir / VERSIONS_DIR / version, ignore_errors=True)
+
+
+class ModelBundle:
+    """
+    Diskteki bir model versiyonu. Booster pickle yerine native
+    Booster.load_model ile UBJSON'dan yüklenir; her dosya manifest'teki
+    checksum ile doğrulanır, doğrulanan byte'lar kullanılır.
+    """
+
+    def __init__(
+        self,
+        version: str,
+        booster: xgb.Booster,
+        features: list[str],
+        sparse_features: list[str] | None = None,
+        state: dict | None = None,
+        metrics: dict | None = None,
+        manifest: dict | None = None,
+    ):
+        self.version = version
+        self.booster = booster
+        self.features = features
+        self.sparse_features = sparse_features
+        self.state = state
+        self.metrics = metrics or {}
+        self.manifest = manifest or {}
+
+    @property
+    def iteration_range(self) -> tuple[int, int]:
+        best_iteration = self.manifest.get("best_iteration")
+        if best_iteration is None:
+            best_iteration = self.booster.attr("best_iteration")
+        return (0, int(best_iteration) + 1) if best_iteration is not None else (0, 0)
+
+    @classmethod
+    def load(cls, model_dir: Path, version: str | None = None) -> "ModelBundle":
+        model_dir = Path(model_dir)
+        version = version or current_version(model_dir)
+        if version is None:
+            raise FileNotFoundError(f"{model_dir} altında yayınlanmış model versiyonu yok")
+
+        path = model_dir / VERSIONS_DIR / version
+        with open(path / MANIFEST_FILE, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+
+        if manifest.get("format") != BUNDLE_FORMAT:
+            raise ValueError(f"Desteklenmeyen bundle formatı: {manifest.get('format')}")
+        if MODEL_FILE not in manifest.get("files", {}):
+            raise ValueError(f"Eksik bundle: {version}")
+
+        files = {}
+        for name, checksum in manifest["files"].items():
+            data = (path / name).read_bytes()
+            if _sha256(data) != checksum:
+                raise ValueError(f"Checksum uyuşmuyor: {version}/{name}")
+            files[name] = data
+
+        booster = xgb.Booster()
+        booster.load_model(bytearray(files[MODEL_FILE]))
+
+        def load_json(name):
+            return json.loads(files[name]) if name in files else None
+
+        return cls(
+            version=version,
+            booster=booster,
+            features=load_json(FEATURES_FILE),
+            sparse_features=load_json(SPARSE_FEATURES_FILE),
+            state=load_json(STATE_FILE),
+            metrics=load_json(METRICS_FILE),
+            manifest=manifest,
+        )
+
+    @classmethod
+    def from_legacy(cls, model_dir: Path, target: str) -> "ModelBundle":
+        """
+        Bundle'dan önceki artifact'ler: xgboost_<target>_model.json (native),
+        model_features.json ve varsa sparse_features.json
+        """
+        model_dir = Path(model_dir)
+
+        booster = xgb.Booster()
+        booster.load_model(model_dir / f"xgboost_{target}_model.json")
+
+        with open(model_dir / FEATURES_FILE, "r", encoding="utf-8") as f:
+            features = json.load(f)
+
+        sparse_features = None
+        if (model_dir / SPARSE_FEATURES_FILE).exists():
+            with open(model_dir / SPARSE_FEATURES_FILE, "r", encoding="utf-8") as f:
+                sparse_features = json.load(f)
+
+        return cls("legacy", booster, features, sparse_features)
+
+    @classmethod
+    def load_latest(cls, model_dir: Path, target: str) -> "ModelBundle":
+        if current_version(model_dir) is None:
+            return cls.from_legacy(model_dir, target)
+        return cls.load(model_dir)
@@ -0,0 +1,105 @@
+import threading
+
+from .catalog_store import CatalogStore
+from .predict_service import PredictService, TASKS
+
+
+class ModelRegistry:
+    """
+    API sürecindeki task servislerinin kaydı.
+    Katalog tek sefer yüklenir ve tüm task'lar arasında paylaşılır;
+    her task'ın servisi ve booster'ı ilk kullanımda oluşturulur.
+    watch() yeni yayınlanan model versiyonlarını arka planda hot-swap eder.
+    """
+
+    def __init__(self, store: CatalogStore | None = None):
+        self.store = store or CatalogStore.shared()
+        self._services = {}
+        self._lock = threading.Lock()
+        self._watcher = None
+        self._stop = threading.Event()
+
+    @property
+    def tasks(self) -> list[str]:
+        return list(TASKS)
+
+    def get_service(self, task: str) -> PredictService:
+        service = self._services.get(task)
+
+        if service is None:
+            with self._lock:
+                if task not in self._services:
+                    self._services[task] = PredictService(task, store=self.store)
+                service = self._services[task]
+
+        return service
+
+    def warmup(self):
+        """
+        Tüm task servislerini, booster'ları ve similarity index'lerini yükler.
+        Pre-fork sunucuda master süreçte çağrılır; worker'lar bu belleği
+        copy-on-write olarak paylaşır.
+        """
+        for task in self.tasks:
+            service = self.get_service(task)
+            service.active
+            service.similarity
+
+    def set_nthread(self, nthread: int):
+        for task in self.tasks:
+            self.get_service(task).set_nthread(nthread)
+
+    def versions(self) -> dict[str, str]:
+        return {task: self.get_service(task).version for task in self.tasks}
+
+    def refresh(self) -> dict[str, str]:
+        """
+        CURRENT'ı değişen task'ların yeni versiyonunu yükleyip değiştirir.
+        Yüklenemeyen (eksik / checksum'ı tutmayan) versiyonda eski model
+        hizmete devam eder. Değişen task'lar için {task: versiyon} döner.
+        """
+        swapped = {}
+
+        for task in self.tasks:
+            service = self.get_service(task)
+            try:
+                if service.refresh():
+                    swapped[task] = service.version
+            except (OSError, ValueError) as e:
+                print(f"{task} modeli yüklenemedi, {service.version} ile devam: {e}")
+
+        if swapped:
+            print(f"Model versiyonları değişti: {swapped}")
+
+        return swapped
+
+    def watch(self, interval: float = 10.0) -> None:
+        """
+        interval saniyede bir refresh çağıran daemon thread. Pre-fork sunucuda
+        thread'ler fork'a taşınmadığından her worker'da ayrı başlatılır.
+        """
+        if self._watcher is not None and self._watcher.is_alive():
+            return
+
+        def loop():
+            while not self._stop.wait(interval):
+                self.refresh()
+
+        self._stop.clear()
+        self._watcher = threading.Thread(target=loop, name="model-watcher", daemon=True)
+        self._watcher.start()
+
+    def stop_watching(self) -> None:
+        self._stop.set()
+        if self._watcher is not None:
+            self._watcher.join()
+            self._watcher = None
+
+    def reload(self):
+        """
+        Kataloğu yeniden yükler ve oluşturulmuş servisleri yeniler
+        """
+        with self._lock:
+            self.store.load()
+            for service in self._services.values():
+                service.reload()
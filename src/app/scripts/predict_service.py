@@ -1,58 +1,224 @@
+import hashlib
 import json
-import os
-import joblib
+import threading
 import numpy as np
 import pandas as pd
 from pathlib import Path
 
 from .dataset.dataset_processor import ProductDataPreprocessor
+from .feature_encoder import CompiledFeatureEncoder
+from .catalog_store import CatalogStore, MODEL_DIR, DATA_PATH
+from .dataset.dataset_io import dense_to_csr
+from .model_bundle import ModelBundle, current_version, list_versions
+
+TARGET_COLUMNS = ProductDataPreprocessor.TARGET_COLUMNS
+
+# Task tanımları: yeni bir hedef (ör. batarya ömrü) için buraya bir kayıt
+# eklemek yeterli; katalog tüm task'lar arasında paylaşılır.
+TASKS = {
+    "price": {
+        "target": "urun_fiyat",
+        "model_dir": MODEL_DIR / "price",
+        "log_transformed": True,
+    },
+    "point": {
+        "target": "urun_puan",
+        "model_dir": MODEL_DIR / "point",
+        "log_transformed": False,
+    },
+}
+
+class ServingModel:
+    """
+    Bir model versiyonunun tahmin için gerektirdiği her şey: booster, feature
+    sırası, sparse maskesi, preprocessor ve encoder. Hot-swap tek referans
+    ataması olduğundan bir istek başından sonuna aynı versiyonu kullanır.
+    """
+
+    def __init__(self, bundle: ModelBundle, store: CatalogStore):
+        self.version = bundle.version
+        self.booster = bundle.booster
+        self.iteration_range = bundle.iteration_range
+        self.model_features = bundle.features
+
+        # Sparse eğitilmiş model: bu feature'ların sıfırları eksik değer olarak
+        # verilmeli (eğitimde CSR'da saklanmadılar)
+        self.sparse_mask = None
+        if bundle.sparse_features is not None:
+            sparse_features = set(bundle.sparse_features)
+            self.sparse_mask = np.array(
+                [name in sparse_features for name in self.model_features]
+            )
+
+        # Bundle kendi preprocessing state'ini taşır; eski artifact'lerde katalogunki
+        state = bundle.state or store.state
+
+        self.processor = ProductDataPreprocessor(
+            input_path="",
+            processed_dir="",
+            output_dir="",
+            mode="predict",
+            state_path=store.state_path
+        )
+        self.processor.state = state
+
+        # Pandas'sız hızlı yol: encoder + native booster
+        self.encoder = CompiledFeatureEncoder.from_state(self.model_features, state)
 
-BASE_DIR = Path(__file__).resolve().parents[3]
-MODEL_DIR = BASE_DIR / "src/app/output/model"
-DATA_PATH = os.path.join(
-    BASE_DIR,
-    "src/app/output/dataset/processed/step4_numeric_cleaned.csv"
-)
 
 class PredictService:
 
-    def __init__(self, task: str):
+    def __init__(self, task: str, store: CatalogStore | None = None, model_dir: Path | None = None):
         """
-        task: "price" veya "point"
+        task: TASKS içindeki anahtar ("price", "point", ...)
+        store: paylaşılan katalog (verilmezse süreç genelindeki ortak store)
+        model_dir: verilmezse TASKS'taki klasör
         """
 
+        if task not in TASKS:
+            raise ValueError(f"task must be one of {list(TASKS)}")
+
         self.task = task
+        self.store = store or CatalogStore.shared()
+
+        spec = TASKS[task]
+        self.target = spec["target"]
+        self.model_dir = Path(model_dir or spec["model_dir"])
+        self.log_transformed = spec["log_transformed"]
+
+        self._model_lock = threading.Lock()
+        self.nthread = None
+
+        self._load_artifacts()
+
+    # =====================================
+    # LOAD / RELOAD
+    # =====================================
+
+    def _load_artifacts(self):
+        # Katalog, en yakın ürün indexleri ve preprocessing state paylaşılır
+        self.df = self.store.df
+        self.catalog = self.store.products
 
-        if task == "price":
-            model_path = MODEL_DIR / "price/xgboost_urun_fiyat_model.pkl"
-            features_path = MODEL_DIR / "price/model_features.json"
-            self.log_transformed = True
+        # Model versiyonu ilk kullanımda yüklenir
+        self._active = None
 
-        elif task == "point":
-            model_path = MODEL_DIR / "point/xgboost_urun_puan_model.pkl"
-            features_path = MODEL_DIR / "point/model_features.json"
-            self.log_transformed = False
+        # get_features çıktısı bu veri/model versiyonu için bir kez üretilir
+        self._features_payload = None
 
+    def _load_version(self, version: str | None = None) -> ServingModel:
+        if version is None:
+            bundle = ModelBundle.load_latest(self.model_dir, self.target)
         else:
-            raise ValueError("task must be 'price' or 'point'")
+            bundle = ModelBundle.load(self.model_dir, version)
 
-        self.df = pd.read_csv(DATA_PATH)
-        self.model = joblib.load(model_path)
+        if self.nthread is not None:
+            bundle.booster.set_param("nthread", self.nthread)
 
-        with open(features_path, "r", encoding="utf-8") as f:
-            self.model_features = json.load(f)
+        return ServingModel(bundle, self.store)
 
-        self.processor = ProductDataPreprocessor(
-            input_path="",
-            processed_dir="",
-            output_dir="",
-            mode="predict"
-        )
+    def _load_current(self) -> ServingModel:
+        """
+        CURRENT'taki versiyonu yükler. Bozuk / eksik bundle'da versions/
+        altında checksum'ı doğrulanan en yeni versiyona düşülür; hiçbiri
+        yüklenemezse ilk hata yükselir.
+        """
+        version = current_version(self.model_dir)
+        if version is None:
+            return self._load_version()
+
+        try:
+            return self._load_version(version)
+        except (OSError, ValueError) as e:
+            error = e
+
+        for fallback in reversed(list_versions(self.model_dir)):
+            if fallback == version:
+                continue
+            try:
+                active = self._load_version(fallback)
+            except (OSError, ValueError):
+                continue
+            print(f"{self.task} modeli {version} yüklenemedi ({error}), {fallback} kullanılıyor")
+            return active
+
+        raise error
+
+    @property
+    def active(self) -> ServingModel:
+        active = self._active
+        if active is None:
+            with self._model_lock:
+                if self._active is None:
+                    self._active = self._load_current()
+                active = self._active
+
+        return active
+
+    @property
+    def version(self) -> str:
+        return self.active.version
+
+    @property
+    def model_features(self) -> list[str]:
+        return self.active.model_features
+
+    def set_nthread(self, nthread: int):
+        """
+        Booster'ın kullanacağı thread sayısı (çok worker'lı sunucuda
+        çekirdeklerin aşırı paylaşılmaması için)
+        """
+        self.nthread = nthread
+        if self._active is not None:
+            self._active.booster.set_param("nthread", nthread)
+
+    @property
+    def similarity(self):
+        # Tüm feature uzayında benzer ürün araması (BallTree)
+        return self.store.similarity_index(self.model_features)
+
+    def refresh(self) -> bool:
+        """
+        CURRENT yeni bir versiyonu gösteriyorsa onu yükler ve aktif modeli
+        atomik olarak değiştirir. Yükleme (checksum dahil) lock altında ama
+        tahmin yolunun dışında yapılır; süren istekler eski versiyonla biter.
+        Bozuk / eksik bundle hata fırlatır, aktif model değişmez. Henüz
+        yüklenmemiş servis atlanır; ilk kullanımda CURRENT zaten yüklenir.
+        """
+        version = current_version(self.model_dir)
+        active = self._active
+        if active is None or version is None or active.version == version:
+            return False
+
+        with self._model_lock:
+            if self._active is None or self._active.version == version:
+                return False
+            self._active = self._load_version(version)
+
+        return True
+
+    def reload(self):
+        """
+        Model artifact'larını yeniden yükler ve store'daki güncel kataloğu
+        alır; cache'ler sıfırlanır. Katalog ModelRegistry.reload ile yenilenir.
+        """
+        self._load_artifacts()
 
     # =====================================
     # PREDICT
     # =====================================
 
+    @staticmethod
+    def _unique_strings(series: pd.Series) -> list[str]:
+        values = series.dropna().unique()
+
+        # float32 büyük değerleri üstel yazar; en kısa gösterim float'a
+        # çevrilince float64 kataloğun çıktısıyla aynı olur
+        if series.dtype == np.float32:
+            return sorted({str(float(str(value))) for value in values})
+
+        return sorted({str(value) for value in values})
+
     def get_features(self):
         features = list(self.df.columns)
         
@@ -116,7 +282,7 @@ class PredictService:
             for cat, prefix in prefix_map.items():
                 if field.startswith(prefix):
                     clean_name = field[len(prefix):]
-                    unique_values = sorted(self.df[field].dropna().astype(str).unique().tolist())
+                    unique_values = self._unique_strings(self.df[field])
                     categories[cat].append({
                         "name": field,
                         "label": clean_name,
@@ -126,7 +292,7 @@ class PredictService:
                     matched = True
                     break
             if not matched:
-                unique_values = sorted(self.df[field].dropna().astype(str).unique().tolist())
+                unique_values = self._unique_strings(self.df[field])
                 categories["Diğer"].append({
                     "name": field,
                     "label": field,
@@ -139,34 +305,96 @@ class PredictService:
 
         return categories
 
-    def predict(self, input_df: pd.DataFrame) -> float:
+    def get_features_payload(self) -> tuple[bytes, str]:
+        """
+        /get_features response'u: önceden serialize edilmiş JSON ve ETag.
+        reload() ile yeni veri yüklenene kadar tekrar hesaplanmaz.
+        """
+        payload = self._features_payload
+
+        if payload is None:
+            body = json.dumps(
+                {"categories": self.get_features()},
+                sort_keys=True
+            ).encode("utf-8")
+            etag = hashlib.sha256(body).hexdigest()[:32]
+
+            payload = self._features_payload = (body, etag)
 
-        X_processed = self.processor.transform_for_prediction(input_df)
+        return payload
+
+    def _predict_frame(self, input_df: pd.DataFrame) -> np.ndarray:
+        active = self.active
+
+        X_processed = active.processor.transform_for_prediction(input_df)
 
         X_processed = X_processed.reindex(
-            columns=self.model_features,
+            columns=active.model_features,
             fill_value=0
         )
 
-        raw_pred = self.model.predict(X_processed)[0]
+        return self._predict_matrix(active, X_processed.to_numpy(dtype=np.float32))
 
-        result = float(np.expm1(raw_pred))
+    @staticmethod
+    def _predict_matrix(active: ServingModel, X: np.ndarray) -> np.ndarray:
+        if active.sparse_mask is not None:
+            X = dense_to_csr(X, active.sparse_mask)
 
-        return result
+        raw_preds = active.booster.inplace_predict(
+            X,
+            iteration_range=active.iteration_range
+        )
+        return np.expm1(raw_preds)
 
-    def get_closest_products(self, column, target_value, top_n=10):
-        df_copy = self.df.copy()
+    def predict(self, input_df: pd.DataFrame) -> float:
+        """
+        Pandas preprocessing yolu (referans). API predict_record kullanır.
+        """
+        return float(self._predict_frame(input_df)[0])
+
+    def predict_record(self, record: dict) -> float:
+        active = self.active
+        X = active.encoder.encode(record)
+        return float(self._predict_matrix(active, X)[0])
+
+    def predict_many(self, records: list[dict]) -> list[float]:
+        """
+        N kaydı tek matrise encode eder ve modeli tek sefer çağırır.
+        Sonuçlar giriş sırasıyla döner.
+        """
+        if not records:
+            return []
 
-        df_copy["urun_fiyat"] = np.expm1(df_copy["urun_fiyat"])
-        df_copy["urun_puan"]  = np.expm1(df_copy["urun_puan"])
+        active = self.active
+        X = active.encoder.encode_many(records)
 
-        df_copy["distance"] = (df_copy[column] - target_value).abs()
+        return self._predict_matrix(active, X).astype(float).tolist()
 
-        closest = df_copy.sort_values("distance").head(top_n)
+    def get_closest_products(self, column, target_value, top_n=10):
+        return self.catalog.closest_records(column, target_value, top_n)
+
+    def get_closest_payloads(self, column, target_value, top_n=10) -> list[str]:
+        """
+        get_closest_products ile aynı kayıtlar, JSON string olarak (response'a
+        tekrar serialize edilmeden eklenir)
+        """
+        return self.catalog.closest_payloads(column, target_value, top_n)
+
+    def find_similar(self, input_data: dict, k: int = 10, weights: dict | None = None) -> list[dict]:
+        """
+        input_data'ya tüm model feature'ları üzerinde en benzer k ürün.
+        weights: {"alan_adi": ağırlık}, verilmeyen alanlar 1 kabul edilir.
+        """
+        active = self.active
+        row = active.encoder.encode(input_data)[0]
+        weight_vector = active.encoder.weight_vector(weights) if weights else None
 
-        result_df = closest.drop(columns=["distance"])
+        similarity = self.store.similarity_index(active.model_features)
+        distances, urun_ids = similarity.query(row, k, weight_vector)
 
-        # 🔥 JSON-safe hale getir
-        result_df = result_df.replace([np.nan, np.inf, -np.inf], None)
+        results = []
+        for distance, urun_id in zip(distances, urun_ids):
+            record = self.catalog.records[self.catalog.position_by_id[urun_id]]
+            results.append({**record, "distance": round(float(distance), 4)})
 
-        return result_df.to_dict(orient="records")
\ No newline at end of file
+        return results
@@ -0,0 +1,123 @@
+import json
+import math
+import numpy as np
+import pandas as pd
+
+
+def to_json_safe_records(df: pd.DataFrame) -> list[dict]:
+    """
+    DataFrame satırlarını JSON-safe dict listesine çevirir (NaN / inf → None)
+    """
+    records = df.to_dict(orient="records")
+
+    for record in records:
+        for key, value in record.items():
+            if isinstance(value, float) and not math.isfinite(value):
+                record[key] = None
+
+    return records
+
+
+class SortedProductIndex:
+    """
+    Tek bir kolon üzerinde en yakın ürün araması.
+    Servis açılışında değerler bir kez sıralanır; sorgu searchsorted ile
+    konumu bulup iki yöne genişleyerek k komşuyu O(log n + k) sürede toplar.
+    """
+
+    def __init__(self, values: np.ndarray):
+        values = np.asarray(values, dtype=np.float64)
+
+        order = np.argsort(values, kind="stable")
+        order = order[~np.isnan(values[order])]
+
+        self.positions = order
+        self.sorted_values = values[order]
+
+    def nearest(self, target: float, k: int = 10) -> list[int]:
+        """
+        target'a en yakın k kaydın catalog satır pozisyonlarını döner
+        """
+        values = self.sorted_values
+        n = len(values)
+        k = min(k, n)
+
+        right = int(np.searchsorted(values, target))
+        left = right - 1
+
+        # Mesafeye göre artan sırada toplanır; k. kayıtla eşit mesafedekiler de
+        # alınır ki eşitlikte satır sırası (stable sort) korunsun
+        candidates = []
+        while left >= 0 or right < n:
+            if left < 0:
+                take_left = False
+            elif right >= n:
+                take_left = True
+            else:
+                take_left = target - values[left] <= values[right] - target
+
+            if take_left:
+                distance, position = target - values[left], self.positions[left]
+                left -= 1
+            else:
+                distance, position = values[right] - target, self.positions[right]
+                right += 1
+
+            if len(candidates) >= k and distance > candidates[-1][0]:
+                break
+
+            candidates.append((distance, int(position)))
+
+        candidates.sort()
+        return [position for _, position in candidates[:k]]
+
+
+class ProductCatalog:
+    """
+    Ürün tablosunun JSON-safe kayıtları ve önceden serialize edilmiş
+    payload'ları. Response oluştururken sadece cache'teki payload'lar toplanır.
+    """
+
+    LOG_COLUMNS = ["urun_fiyat", "urun_puan"]
+
+    def __init__(self, df: pd.DataFrame):
+        display_df = df.copy()
+
+        for col in self.LOG_COLUMNS:
+            if col in display_df.columns:
+                display_df[col] = np.expm1(display_df[col])
+
+        self.records = to_json_safe_records(display_df)
+        self.position_by_id = (
+            {urun_id: pos for pos, urun_id in enumerate(display_df["urun_id"])}
+            if "urun_id" in display_df.columns else {}
+        )
+        self.payloads = [
+            json.dumps(record, sort_keys=True)
+            for record in self.records
+        ]
+
+        self._values = {
+            col: display_df[col].to_numpy(dtype=np.float64)
+            for col in display_df.columns
+            if pd.api.types.is_numeric_dtype(display_df[col])
+        }
+        self._indexes = {}
+
+        # Hedef kolonların indexleri açılışta hazırlanır
+        for col in self.LOG_COLUMNS:
+            if col in self._values:
+                self.index_for(col)
+
+    def index_for(self, column: str) -> SortedProductIndex:
+        if column not in self._indexes:
+            self._indexes[column] = SortedProductIndex(self._values[column])
+        return self._indexes[column]
+
+    def closest_records(self, column: str, target_value: float, top_n: int = 10) -> list[dict]:
+        positions = self.index_for(column).nearest(target_value, top_n)
+        return [self.records[pos] for pos in positions]
+
+    def closest_payloads(self, column: str, target_value: float, top_n: int = 10) -> list[str]:
+        positions = self.index_for(column).nearest(target_value, top_n)
+        return [self.payloads[pos] for pos in positions]
@@ -0,0 +1,174 @@
+import hashlib
+import joblib
+import numpy as np
+from pathlib import Path
+from sklearn.neighbors import BallTree
+
+from .dataset.dataset_io import read_dataset, resolve_dataset_path
+
+
+class SimilarityIndex:
+    """
+    Tüm model feature'ları üzerinde "bu spec'e en benzer telefonlar" araması.
+    final_dataset üzerindeki standardize matris ile BallTree kurulur, diske
+    kaydedilir ve sorgular ağaç üzerinden alt-doğrusal sürede yapılır.
+    Ağırlıklı sorgular da aynı ağaç üzerinden yapılır; istek başına ağaç
+    kurulmaz, paylaşılan değişken durum yoktur.
+    """
+
+    VERSION = 1
+    LEAF_SIZE = 40
+
+    def __init__(
+        self,
+        features: list[str],
+        mean: np.ndarray,
+        scale: np.ndarray,
+        urun_ids: np.ndarray,
+        tree: BallTree,
+        fingerprint: str,
+    ):
+        self.features = features
+        self.mean = mean
+        self.scale = scale
+        self.urun_ids = urun_ids
+        self.tree = tree
+        self.fingerprint = fingerprint
+
+    # =====================================
+    # BUILD / PERSIST
+    # =====================================
+
+    @staticmethod
+    def file_fingerprint(path: Path) -> str:
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    @classmethod
+    def build(cls, data_path: Path, features: list[str]) -> "SimilarityIndex":
+        df = read_dataset(data_path)
+
+        X = df.reindex(columns=features, fill_value=0).to_numpy(dtype=np.float64)
+        X = np.nan_to_num(X)
+
+        mean = X.mean(axis=0)
+        scale = X.std(axis=0)
+        scale[scale == 0] = 1.0
+
+        matrix = (X - mean) / scale
+        tree = BallTree(matrix, leaf_size=cls.LEAF_SIZE)
+
+        return cls(
+            features=features,
+            mean=mean,
+            scale=scale,
+            urun_ids=df["urun_id"].to_numpy(),
+            tree=tree,
+            fingerprint=cls.file_fingerprint(resolve_dataset_path(data_path)),
+        )
+
+    def save(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        joblib.dump(
+            {
+                "version": self.VERSION,
+                "features": self.features,
+                "mean": self.mean,
+                "scale": self.scale,
+                "urun_ids": self.urun_ids,
+                "tree": self.tree,
+                "fingerprint": self.fingerprint,
+            },
+            path
+        )
+
+    @classmethod
+    def load_or_build(
+        cls,
+        index_path: Path,
+        data_path: Path,
+        features: list[str],
+    ) -> "SimilarityIndex":
+        """
+        Kayıtlı index veri ve feature listesiyle uyumluysa yüklenir,
+        değilse yeniden kurulup kaydedilir.
+        """
+        fingerprint = cls.file_fingerprint(resolve_dataset_path(data_path))
+
+        if index_path.exists():
+            payload = joblib.load(index_path)
+            if (
+                payload.get("version") == cls.VERSION
+                and payload["features"] == features
+                and payload["fingerprint"] == fingerprint
+            ):
+                payload.pop("version")
+                return cls(**payload)
+
+        index = cls.build(data_path, features)
+        index.save(index_path)
+        print(f"Similarity index kaydedildi: {index_path}")
+        return index
+
+    # =====================================
+    # QUERY
+    # =====================================
+
+    def _weighted_query(
+        self,
+        query: np.ndarray,
+        k: int,
+        weights: np.ndarray,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Ağırlıklı öklid (minkowski p=2, w=weights) ile tam k-NN. Her x için
+        d_w(x, q) >= sqrt(min w) * d(x, q): ağırlıksız ağaçta bulunan k
+        komşunun en büyük ağırlıklı mesafesi R ise, ağırlıklı k komşunun hepsi
+        ağaçta R / sqrt(min w) yarıçapındadır. Sıfır ağırlıkta sınır yoktur,
+        tüm satırlar taranır.
+        """
+        def weighted_distance(rows):
+            return np.sqrt(np.square(rows - query) @ weights)
+
+        # BallTree standardize matrisi kendi içinde tutar
+        matrix = np.asarray(self.tree.get_arrays()[0])
+
+        w_min = weights.min()
+        if w_min > 0:
+            _, seed = self.tree.query(query, k=k)
+            radius = weighted_distance(matrix[seed[0]]).max() / np.sqrt(w_min)
+            # Yuvarlama hatası sınırdaki satırı dışarıda bırakmasın
+            candidates = self.tree.query_radius(query, r=radius * (1 + 1e-9))[0]
+            distances = weighted_distance(matrix[candidates])
+        else:
+            candidates = np.arange(len(matrix))
+            distances = weighted_distance(matrix)
+
+        order = np.lexsort((candidates, distances))[:k]
+
+        return distances[order], candidates[order]
+
+    def query(
+        self,
+        row: np.ndarray,
+        k: int = 10,
+        weights: np.ndarray | None = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        row: model feature sırasında tek satır (ham, standardize edilmemiş)
+        weights: feature başına ağırlık (None → hepsi 1)
+        Dönüş: (mesafeler, urun_id'ler)
+        """
+        k = min(k, len(self.urun_ids))
+        query = (np.asarray(row, dtype=np.float64).reshape(1, -1) - self.mean) / self.scale
+
+        if weights is None:
+            distances, positions = self.tree.query(query, k=k)
+            return distances[0], self.urun_ids[positions[0]]
+
+        distances, positions = self._weighted_query(query, k, np.asarray(weights, dtype=np.float64))
+
+        return distances, self.urun_ids[positions]